@@ -0,0 +1,77 @@
+"""
+    Measures the time from importing the parser to the first completed `validate()` call, in a fresh
+    interpreter per run so import and table-loading costs are not hidden by caching.
+
+    Usage: python -m benchmarks.bench_startup [--runs N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+IMPORT = "from src.function_solver.core.expression_parser import ExpressionParser\n"
+
+SCENARIOS = {
+    # Tables generated at runtime, one parser per widget (the pre-packaged-tables behaviour)
+    'runtime tables': (
+        "parsers = [ExpressionParser(prebuilt=False) for _ in range(2)]\n"
+        "parsers[0].validate('x^2 + log(x)')\n"
+    ),
+    # Packaged tables loaded in optimized mode through the shared factory
+    'prebuilt tables': (
+        "parsers = [ExpressionParser.shared() for _ in range(2)]\n"
+        "parsers[0].validate('x^2 + log(x)')\n"
+    ),
+}
+
+TIMER = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "{imports}"
+    "imported = time.perf_counter()\n"
+    "{body}"
+    "print(imported - start, time.perf_counter() - imported)\n"
+)
+
+
+def time_scenario(body: str, runs: int) -> dict:
+    """
+        Runs a scenario in `runs` fresh interpreters.
+
+        :param body: The code to time, executed right after the parser module is imported.
+        :param runs: The number of interpreters to start.
+        :return: The median import time, first-validate time and total, in seconds.
+    """
+    import_times, validate_times = [], []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', TIMER.format(imports=IMPORT, body=body)],
+                                cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+        import_time, validate_time = map(float, output.strip().splitlines()[-1].split())
+        import_times.append(import_time)
+        validate_times.append(validate_time)
+    return {
+        'import_s': statistics.median(import_times),
+        'first_validate_s': statistics.median(validate_times),
+        'total_s': statistics.median(i + v for i, v in zip(import_times, validate_times)),
+    }
+
+
+def main(argv=None) -> dict:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--runs', type=int, default=10, help='fresh interpreters per scenario')
+    args = arg_parser.parse_args(argv)
+
+    results = {}
+    for name, body in SCENARIOS.items():
+        results[name] = time_scenario(body, args.runs)
+        print(f"{name:<16} import {results[name]['import_s'] * 1000:7.2f} ms   "
+              f"first validate {results[name]['first_validate_s'] * 1000:7.2f} ms   "
+              f"total {results[name]['total_s'] * 1000:7.2f} ms")
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,383 @@
+"""
+    Times the lexer, parser, solver, plot range selection, parallel dense sampling and a headless plot over the
+    expression corpus (`benchmarks/corpus.py`), and the import and window startup times in fresh interpreters.
+    Writes the results as JSON and compares them against a stored baseline.
+
+    Usage: python -m benchmarks.bench_suite [--output results.json] [--baseline baseline.json] [--threshold 0.25]
+                                            [--select PATTERN] [--quick]
+
+    Save a run with `--output` on a known-good commit and pass that file as `--baseline` later: the run then
+    fails (exit status 1) when any benchmark's median got slower than the baseline by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from benchmarks.corpus import CORPUS, Case
+
+SCHEMA_VERSION = 1
+DEFAULT_THRESHOLD = 0.25  # Relative slowdown of the median that counts as a regression
+NOISE_FLOOR = 5e-6  # Seconds; medians below this are too noisy to flag
+DENSE_SAMPLES = 1_000_000  # Grid points of the parallel sampling benchmarks (a tenth with --quick)
+PROCESS_COUNTS = sorted({1, 2, 4, os.cpu_count() or 1})  # Worker counts the parallel sampling is timed with
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Code timed in a fresh interpreter for each startup benchmark, from the first import to the end
+STARTUP = {
+    'import_parser': "from src.function_solver.core.expression_parser import ExpressionParser\n",
+    'import_solver': "from src.function_solver.core.solver import Solver\n",
+    'import_gui': "import src.function_solver.gui.app\n",
+    'import_sympy': "import sympy\n",
+    # Until the window has been painted once
+    'window_shown': (
+        "from PySide2.QtWidgets import QApplication\n"
+        "from src.function_solver.gui.app import FunctionSolverWindow\n"
+        "app = QApplication([])\n"
+        "window = FunctionSolverWindow(warm_up=False)\n"
+        "window.show()\n"
+        "window.repaint()\n"
+    ),
+    # Until the deferred startup work has built the plot canvas
+    'window_ready': (
+        "from PySide2.QtWidgets import QApplication\n"
+        "from src.function_solver.gui.app import FunctionSolverWindow\n"
+        "app = QApplication([])\n"
+        "window = FunctionSolverWindow(warm_up=False)\n"
+        "window.show()\n"
+        "while window.plot_widget._canvas is None:\n"
+        "    app.processEvents()\n"
+    ),
+}
+HEAVY_MODULES = ('sympy', 'matplotlib')  # Reported per startup benchmark when they were imported
+
+STARTUP_TIMER = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "{body}"
+    "elapsed = time.perf_counter() - start\n"
+    "import sys\n"
+    "print(elapsed, ','.join(name for name in {heavy!r} if name in sys.modules))\n"
+)
+
+
+class Benchmark(NamedTuple):
+    """
+        One timed operation.
+
+        Attributes:
+            name (str): The result key, `<group>/<case>`.
+            run (Callable[[], Any]): The operation; its return value is passed to `describe`.
+            describe (Optional[Callable[[Any], Dict]]): Extracts extra fields for the result (e.g., the solve status).
+            setup (Optional[Callable[[], None]]): Runs before every call, outside the timing (e.g., clears a cache).
+            self_timed (bool): Whether `run` measures itself and returns `(seconds, value)`, e.g. for work done in
+                               a subprocess, whose start-up must not be counted.
+    """
+    name: str
+    run: Callable[[], Any]
+    describe: Optional[Callable[[Any], Dict[str, Any]]] = None
+    setup: Optional[Callable[[], None]] = None
+    self_timed: bool = False
+
+
+def measure(benchmark: Benchmark,
+            repeats: int,
+            min_time: float,
+            budget: float
+            ) -> Dict[str, Any]:
+    """
+        Times a benchmark. The first call is timed on its own (`first_s`, which includes cold caches), then each
+        repeat runs the operation enough times in a row to last at least `min_time`, so fast operations are not
+        dominated by timer resolution. Repeats stop early once `budget` seconds were spent, after at least one.
+
+        :return: The per-call `median_s`, `min_s` and `first_s`, with the `repeats` and `loops` used.
+    """
+    if benchmark.setup:
+        benchmark.setup()
+    start = time.perf_counter()
+    value = benchmark.run()
+    first = time.perf_counter() - start
+    if benchmark.self_timed:
+        first, value = value
+
+    loops = 1
+    if benchmark.setup is None and not benchmark.self_timed and first < min_time:
+        loops = max(int(min_time / max(first, 1e-7)), 1)
+
+    times: List[float] = []
+    started = time.perf_counter()
+    while len(times) < repeats and (not times or time.perf_counter() - started < budget):
+        if benchmark.setup:
+            benchmark.setup()
+        if benchmark.self_timed:
+            times.append(benchmark.run()[0])
+            continue
+        start = time.perf_counter()
+        for _ in range(loops):
+            benchmark.run()
+        times.append((time.perf_counter() - start) / loops)
+
+    result = {
+        'median_s': statistics.median(times),
+        'min_s': min(times),
+        'first_s': first,
+        'repeats': len(times),
+        'loops': loops,
+    }
+    if benchmark.describe:
+        result.update(benchmark.describe(value))
+    return result
+
+
+def core_benchmarks(cases: List[Case], solve_timeout: float) -> Iterator[Benchmark]:
+    """Yields the lexer, parser, solver and plot range benchmarks of every case."""
+    from src.function_solver.core.expression_lexer import ExpressionLexer
+    from src.function_solver.core.expression_parser import ExpressionParser
+    from src.function_solver.core.solver import Solver
+    from src.function_solver.utils.math_utils import MathUtils
+
+    lexer = ExpressionLexer()
+    parser = ExpressionParser.shared()
+
+    def solve_status(result) -> Dict[str, Any]:
+        return {'status': result.status, 'method': result.method, 'solutions': len(result.solutions)}
+
+    for case in cases:
+        text, partner = case.expression, case.partner
+        yield Benchmark(f"lexer.tokenize/{case.name}", lambda text=text: lexer.tokenize(text))
+        yield Benchmark(f"parser.validate/{case.name}", lambda text=text: parser.validate(text))
+        yield Benchmark(f"solver.solve[auto]/{case.name}",
+                        lambda text=text, partner=partner: Solver.solve_detailed(
+                            text, partner, Solver.AUTO, timeout=solve_timeout),
+                        solve_status)
+        yield Benchmark(f"solver.solve[numeric]/{case.name}",
+                        lambda text=text, partner=partner: Solver.solve_detailed(text, partner, Solver.NUMERIC),
+                        solve_status)
+        yield Benchmark(f"solver.evaluate/{case.name}", lambda text=text: Solver.evaluate(text, 1.5))
+
+        solutions = Solver.solve(text, partner, Solver.NUMERIC)
+        yield Benchmark(f"math_utils.plot_range/{case.name}",
+                        lambda solutions=solutions: MathUtils.get_plot_range(
+                            MathUtils.find_solution_center(solutions), solutions))
+
+
+def sampling_benchmarks(cases: List[Case], samples: int) -> Iterator[Benchmark]:
+    """
+        Yields dense uniform sampling of the pathological cases with `ParallelSampler`, once per worker count in
+        `PROCESS_COUNTS`, each count with its own pool whose workers are started by the first (untimed) call.
+        `add_speedups` then reports the speedup of each count over a single process.
+    """
+    import atexit
+    from src.function_solver.core.parallel_sampler import ParallelSampler
+    from src.function_solver.core.solver_pool import SolverPool
+
+    pools: Dict[int, SolverPool] = {}
+
+    def run(text: str, processes: int):
+        if processes not in pools:
+            pools[processes] = SolverPool(processes)
+            atexit.register(pools[processes].shutdown)
+        return ParallelSampler.sample(text, (-10, 10), samples, processes, pools[processes])
+
+    for case in cases:
+        if case.tier != 'pathological':
+            continue
+        for processes in PROCESS_COUNTS:
+            yield Benchmark(f"sampler.parallel[{processes}]/{case.name}",
+                            lambda text=case.expression, processes=processes: run(text, processes),
+                            lambda curve: {'samples': curve.evaluations})
+
+
+def add_speedups(results: Dict[str, Dict[str, Any]]) -> None:
+    """Adds to every parallel sampling result its `speedup` over the single-process run of the same case."""
+    for name, result in results.items():
+        match = re.match(r'sampler\.parallel\[\d+\]/(.+)$', name)
+        single = results.get(f"sampler.parallel[1]/{match.group(1)}") if match else None
+        if single is not None and result['median_s'] > 0:
+            result['speedup'] = single['median_s'] / result['median_s']
+
+
+def startup_benchmarks() -> Iterator[Benchmark]:
+    """
+        Yields the import and window startup benchmarks, each timed inside a fresh interpreter so module caching
+        does not hide the cost. Each result also lists which of `HEAVY_MODULES` got imported.
+    """
+    def run(body: str) -> Tuple[float, List[str]]:
+        env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+        output = subprocess.run([sys.executable, '-c', STARTUP_TIMER.format(body=body, heavy=HEAVY_MODULES)],
+                                cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True).stdout
+        elapsed, loaded = (output.strip().splitlines()[-1].split(' ') + [''])[:2]
+        return float(elapsed), [name for name in loaded.split(',') if name]
+
+    for name, body in STARTUP.items():
+        yield Benchmark(f"startup/{name}", lambda body=body: run(body), lambda loaded: {'loaded': loaded},
+                        self_timed=True)
+
+
+def plot_benchmarks(cases: List[Case]) -> Iterator[Benchmark]:
+    """
+        Yields headless `PlotterWidget.plot_functions` runs (offscreen Qt, Agg rendering): solving, sampling and
+        drawing, from the request to the drawn canvas. The sample tiles are cleared before every run.
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    from PySide2.QtCore import QEventLoop
+    from PySide2.QtWidgets import QApplication
+    from src.function_solver.core.tiled_sampler import TiledSampler
+    from src.function_solver.gui.components.plotter import PlotterWidget
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    widget = PlotterWidget()
+    widget.resize(1000, 700)
+
+    def plot(functions: Tuple[str, ...]) -> int:
+        widget.plot_functions(*functions)
+        while widget.jobs:
+            app.processEvents(QEventLoop.AllEvents, 5)
+            time.sleep(0.0005)
+        return len(widget.ax.lines)
+
+    for case in cases:
+        functions = (case.expression, case.partner)
+        yield Benchmark(f"plotter.plot_functions/{case.name}",
+                        lambda functions=functions: plot(functions),
+                        lambda lines: {'lines': lines},
+                        TiledSampler.shared().clear)
+
+
+def run_suite(select: Optional[str] = None,
+              quick: bool = False,
+              plots: bool = True,
+              solve_timeout: float = 2.0,
+              echo: bool = True
+              ) -> Dict[str, Any]:
+    """
+        Runs the benchmarks.
+
+        :param select: A regular expression; only benchmarks whose name matches it are run.
+        :param quick: Fewer and shorter repeats, for a smoke run.
+        :param plots: Whether to include the headless plot benchmarks (they need PySide2 and matplotlib).
+        :param solve_timeout: The time budget in seconds for each symbolic solve.
+        :param echo: Whether to print each result as it completes.
+        :return: The results document: `meta` describing the run and `results` by benchmark name.
+    """
+    repeats, min_time, budget = (3, 0.005, 0.5) if quick else (7, 0.05, 3.0)
+    pattern = re.compile(select) if select else None
+
+    def selected(name: str) -> bool:
+        return pattern is None or pattern.search(name) is not None
+
+    benchmarks = list(startup_benchmarks()) + list(core_benchmarks(CORPUS, solve_timeout))
+    benchmarks += sampling_benchmarks(CORPUS, DENSE_SAMPLES // 10 if quick else DENSE_SAMPLES)
+    plot_cases = [case for case in CORPUS if selected(f"plotter.plot_functions/{case.name}")]
+    if plots and plot_cases:
+        # Only start Qt when a plot benchmark is selected
+        benchmarks += plot_benchmarks(plot_cases)
+
+    results = {}
+    for benchmark in benchmarks:
+        if not selected(benchmark.name):
+            continue
+        results[benchmark.name] = measure(benchmark, repeats, min_time, budget)
+        if echo:
+            print(f"{benchmark.name:<44} {format_time(results[benchmark.name]['median_s'])}", flush=True)
+    add_speedups(results)
+    if echo:
+        for name, result in results.items():
+            if 'speedup' in result:
+                print(f"{name:<44} {result['speedup']:8.2f} x speedup")
+
+    return {
+        'schema': SCHEMA_VERSION,
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'quick': quick,
+            'solve_timeout': solve_timeout,
+        },
+        'results': results,
+    }
+
+
+def compare(results: Dict[str, Any],
+            baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD
+            ) -> List[Dict[str, Any]]:
+    """
+        Compares the medians of a run against a baseline run.
+
+        :param results: The results document of the current run.
+        :param baseline: The results document of the baseline run.
+        :param threshold: The relative slowdown that counts as a regression (0.25 is 25% slower).
+        :return: One row per benchmark present in both runs, with the `baseline_s`, `current_s`, their `ratio` and
+                 whether it is a `regression`. Medians below `NOISE_FLOOR` are never flagged.
+    """
+    rows = []
+    for name, current in results['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        ratio = current['median_s'] / previous['median_s'] if previous['median_s'] > 0 else float('inf')
+        regression = ratio > 1 + threshold and current['median_s'] >= NOISE_FLOOR
+        rows.append({
+            'name': name,
+            'baseline_s': previous['median_s'],
+            'current_s': current['median_s'],
+            'ratio': ratio,
+            'regression': regression,
+        })
+    return rows
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--output', help='write the results as JSON to this file')
+    arg_parser.add_argument('--baseline', help='compare against the results stored in this file')
+    arg_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help='relative slowdown counted as a regression (default: 0.25)')
+    arg_parser.add_argument('--select', help='only run benchmarks whose name matches this regular expression')
+    arg_parser.add_argument('--solve-timeout', type=float, default=2.0,
+                            help='seconds allowed per symbolic solve (default: 2)')
+    arg_parser.add_argument('--no-plots', action='store_true', help='skip the headless plot benchmarks')
+    arg_parser.add_argument('--quick', action='store_true', help='fewer, shorter repeats')
+    args = arg_parser.parse_args(argv)
+
+    results = run_suite(args.select, args.quick, not args.no_plots, args.solve_timeout)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    rows = compare(results, baseline, args.threshold)
+    print(f"\n{'benchmark':<44} {'baseline':>11} {'current':>11} {'ratio':>7}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"{row['name']:<44} {format_time(row['baseline_s'])} {format_time(row['current_s'])} "
+              f"{row['ratio']:7.2f}{flag}")
+    regressions = sum(row['regression'] for row in rows)
+    print(f"\n{regressions} regression{'s' if regressions != 1 else ''} over {args.threshold:.0%} "
+          f"in {len(rows)} compared benchmarks")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+    The expression corpus shared by the benchmarks, from trivial inputs to pathological ones (deep nesting,
+    high-degree polynomials, long log/sqrt mixes). Every expression is valid input for `ExpressionParser`.
+"""
+from typing import List, NamedTuple
+
+
+class Case(NamedTuple):
+    """
+        One benchmark expression.
+
+        Attributes:
+            name (str): A short identifier, used in the result keys.
+            tier (str): `trivial`, `moderate` or `pathological`.
+            expression (str): The expression itself.
+            partner (str): The function it is intersected with in the solve and plot benchmarks.
+    """
+    name: str
+    tier: str
+    expression: str
+    partner: str
+
+
+def nested(depth: int) -> str:
+    """Returns `x` wrapped in `depth` levels of parentheses, alternating `+ 1` and `* 2`."""
+    expression = 'x'
+    for level in range(depth):
+        expression = f"({expression} + 1)" if level % 2 == 0 else f"({expression} * 2)"
+    return expression
+
+
+def polynomial(degree: int) -> str:
+    """Returns a dense polynomial of the given degree with small alternating coefficients."""
+    terms = [f"{(power % 5) + 1}*x^{power}" for power in range(degree, 1, -1)]
+    return ' - '.join(terms) + ' + 3*x - 1'
+
+
+def log_sqrt_mix(count: int) -> str:
+    """Returns a sum of `count` nested log/sqrt terms, each defined for x > 0."""
+    return ' + '.join(f"log(sqrt(x^2 + {k}) + {k}) / sqrt(x + {k})" for k in range(1, count + 1))
+
+
+CORPUS: List[Case] = [
+    Case('linear', 'trivial', '2*x + 1', 'x'),
+    Case('quadratic', 'trivial', 'x^2', '2*x'),
+    Case('log', 'trivial', 'log(x)', '1'),
+    Case('rational', 'moderate', '1/(x - 1) + 1/(x + 2)', 'x'),
+    Case('mixed', 'moderate', 'log(x^2 + 2) - sqrt(x^2 + 1)', '-x^2 + 2'),
+    Case('cubic_power', 'moderate', '(x - 1)^3 - 2*x^2 + x', '0.5*x'),
+    Case('nested_64', 'pathological', nested(64), 'x^2'),
+    Case('polynomial_20', 'pathological', polynomial(20), 'x'),
+    Case('log_sqrt_12', 'pathological', log_sqrt_mix(12), 'x'),
+]
@@ -0,0 +1,300 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from src.function_solver.core.expression_parser import ExpressionParser
+from src.function_solver.core.solve_cache import ENV_VAR as CACHE_ENV_VAR
+from src.function_solver.core.solver import SolveResult, Solver
+from src.function_solver.core.solver_pool import SolverPool
+from src.function_solver.utils.instrumentation import Instrumentation
+
+
+class Pair(NamedTuple):
+    """
+        One function pair read from the input.
+
+        Attributes:
+            index (int): The position of the pair in the input, starting at 0.
+            f1 (str): The first function string.
+            f2 (str): The second function string.
+            id (Optional[str]): The caller's identifier for the pair, copied to the result if given.
+            error (Optional[str]): Why the input record could not be read, None if it was read.
+    """
+    index: int
+    f1: str
+    f2: str
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchSolver:
+    """
+        Validates and solves a stream of function pairs without the GUI. Pairs are read lazily and each one is
+        validated and solved in a `SolverPool` worker process, so the work spreads across cores and a pathological
+        pair costs at most twice the per-item timeout: once for the symbolic solve and, in auto mode, once more for
+        the numeric fallback after it timed out. At most `window` pairs are in flight at once, which bounds memory
+        for inputs of any size; results are written as they complete, either in input order or as they finish.
+    """
+    INVALID = 'invalid'
+    ERROR = 'error'
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 window: Optional[int] = None,
+                 timeout: Optional[float] = 5.0,
+                 mode: str = Solver.AUTO,
+                 interval: Tuple[float, float] = Solver.DEFAULT_INTERVAL,
+                 ordered: bool = True
+                 ):
+        """
+            Initializes the batch solver.
+
+            :param workers: The number of worker processes, defaults to the number of CPUs.
+            :param window: The maximum number of pairs in flight, defaults to four per worker.
+            :param timeout: The time budget in seconds for each solve of a pair, or None for no limit. In auto mode
+                            a pair whose symbolic solve times out gets the same budget again for the numeric
+                            fallback.
+            :param mode: The solver mode, see `Solver.solve`.
+            :param interval: The `(lower, upper)` bounds searched by the numeric solver.
+            :param ordered: Whether results are written in input order (otherwise as soon as they finish).
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.window = window or 4 * self.workers
+        self.timeout = timeout
+        self.mode = mode
+        self.interval = interval
+        self.ordered = ordered
+        self.stats: Counter = Counter()
+
+    def run(self,
+            pairs: Iterable[Pair],
+            output: TextIO
+            ) -> Counter:
+        """
+            Solves every pair and writes one JSON line per pair to the output.
+
+            :param pairs: The pairs to solve, e.g. from `read_pairs`.
+            :param output: The stream the JSONL results are written to.
+            :return: The number of results per status, with the total under `pairs`.
+        """
+        pool = SolverPool(processes=self.workers)
+        pending = deque()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for pair in pairs:
+                    if len(pending) >= self.window:
+                        self._drain(pending, output, block=True)
+                    pending.append(executor.submit(self._solve, pool, pair))
+                    self._drain(pending, output, block=False)
+                while pending:
+                    self._drain(pending, output, block=True)
+        finally:
+            pool.shutdown()
+        return self.stats
+
+    def _drain(self, pending: deque, output: TextIO, block: bool) -> None:
+        """Writes finished results; with `block`, waits until at least one result was written."""
+        if self.ordered:
+            while pending and (pending[0].done() or block):
+                self._write(pending.popleft().result(), output)
+                block = False
+            return
+        done, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in [future for future in pending if future in done]:
+            pending.remove(future)
+            self._write(future.result(), output)
+
+    def _write(self, result: Dict[str, Any], output: TextIO) -> None:
+        self.stats['pairs'] += 1
+        self.stats[result['status']] += 1
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+
+    def _solve(self, pool: SolverPool, pair: Pair) -> Dict[str, Any]:
+        """Solves one pair in the pool, turning every outcome into a result record."""
+        start = time.monotonic()
+        result = {'index': pair.index, 'f1': pair.f1, 'f2': pair.f2}
+        if pair.id is not None:
+            result['id'] = pair.id
+
+        if pair.error is not None:
+            outcome = {'status': self.ERROR, 'errors': [pair.error]}
+        else:
+            try:
+                with Instrumentation.span('batch.solve_pair'):
+                    outcome = pool.run(solve_pair, pair.f1, pair.f2, self.mode, self.interval,
+                                       timeout=self.timeout)
+            except TimeoutError:
+                Instrumentation.count('batch.timeouts')
+                outcome = self._solve_after_timeout(pool, pair)
+            except Exception as e:
+                outcome = {'status': self.ERROR, 'errors': [f"{type(e).__name__}: {e}"]}
+
+        result.update(outcome)
+        result['elapsed'] = round(time.monotonic() - start, 6)
+        return result
+
+    def _solve_after_timeout(self, pool: SolverPool, pair: Pair) -> Dict[str, Any]:
+        """In auto mode, falls back to the numeric solver, with a budget of its own, after a symbolic timeout."""
+        if self.mode == Solver.AUTO:
+            try:
+                outcome = pool.run(solve_pair, pair.f1, pair.f2, Solver.NUMERIC, self.interval, timeout=self.timeout)
+            except TimeoutError:
+                pass
+            except Exception as e:
+                return {'status': self.ERROR, 'errors': [f"{type(e).__name__}: {e}"]}
+            else:
+                outcome['status'] = SolveResult.TIMED_OUT
+                return outcome
+        return {'status': SolveResult.TIMED_OUT, 'solutions': []}
+
+
+def solve_pair(f1: str,
+               f2: str,
+               mode: str,
+               interval: Tuple[float, float]
+               ) -> Dict[str, Any]:
+    """
+        Validates and solves one pair. Module-level so `SolverPool` workers can run it.
+
+        :return: The `status`, and either the validation `errors` or the solve `method`, the real `solutions`
+                 as floats and, for symbolic solves, every solution as an `exact` string.
+    """
+    errors = []
+    for name, text in (('f1', f1), ('f2', f2)):
+        errors.extend(f"{name}: {error}" for error in ExpressionParser.shared().validate(text)['errors'])
+    if errors:
+        return {'status': BatchSolver.INVALID, 'errors': errors}
+
+    result = Solver.solve_detailed(f1, f2, mode, interval)
+    outcome = {
+        'status': result.status,
+        'method': result.method,
+        'solutions': [complex(sol).real for sol in result.solutions if complex(sol).imag == 0],
+    }
+    if result.method == Solver.SYMBOLIC:
+        outcome['exact'] = [str(sol) for sol in result.solutions]
+    return outcome
+
+
+def read_pairs(stream: TextIO, file_format: str = 'jsonl') -> Iterator[Pair]:
+    """
+        Reads function pairs lazily from a stream.
+
+        JSONL lines are objects with `f1` and `f2` (or `function1` and `function2`) and an optional `id`. CSV rows
+        hold `f1,f2[,id]`, optionally under a header row naming those columns. Blank lines are skipped, and records
+        that cannot be read are yielded with their `error` set so they still get a result.
+
+        :param stream: The text stream to read.
+        :param file_format: `jsonl` or `csv`.
+        :return: An iterator over the pairs.
+    """
+    if file_format == 'csv':
+        yield from _read_csv(stream)
+        return
+
+    index = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            f1 = record.get('f1', record.get('function1'))
+            f2 = record.get('f2', record.get('function2'))
+            if not isinstance(f1, str) or not isinstance(f2, str):
+                raise ValueError("expected string fields 'f1' and 'f2'")
+            pair_id = record.get('id')
+            yield Pair(index, f1, f2, None if pair_id is None else str(pair_id))
+        except (ValueError, AttributeError) as e:
+            yield Pair(index, '', '', error=f"Invalid input record: {e}")
+        index += 1
+
+
+def _read_csv(stream: TextIO) -> Iterator[Pair]:
+    columns = None
+    index = 0
+    for row in csv.reader(stream):
+        row = [cell.strip() for cell in row]
+        if not any(row):
+            continue
+        if columns is None:
+            header = [cell.lower() for cell in row]
+            if {'f1', 'f2'} <= set(header):
+                columns = {name: header.index(name) for name in ('f1', 'f2', 'id') if name in header}
+                continue
+            columns = {'f1': 0, 'f2': 1, 'id': 2}
+        try:
+            pair_id = row[columns['id']] if 'id' in columns and columns['id'] < len(row) else None
+            yield Pair(index, row[columns['f1']], row[columns['f2']], pair_id or None)
+        except IndexError:
+            yield Pair(index, '', '', error="Invalid input record: expected the columns f1,f2")
+        index += 1
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.function_solver.cli',
+        description="Validate and solve function pairs f1(x) = f2(x) in batch, writing one JSON line per pair.")
+    parser.add_argument('input', nargs='?', default='-', help="JSONL or CSV file of pairs, '-' for stdin (default)")
+    parser.add_argument('-o', '--output', default='-', help="JSONL file for the results, '-' for stdout (default)")
+    parser.add_argument('--format', choices=('auto', 'jsonl', 'csv'), default='auto',
+                        help="input format (default: from the file extension, JSONL for stdin)")
+    parser.add_argument('--mode', choices=Solver.MODES, default=Solver.AUTO, help="solver mode (default: auto)")
+    parser.add_argument('--interval', nargs=2, type=float, default=Solver.DEFAULT_INTERVAL, metavar=('LOWER', 'UPPER'),
+                        help="interval searched by the numeric solver (default: -10 10)")
+    parser.add_argument('--timeout', type=float, default=5.0,
+                        help="seconds allowed per solve of a pair, 0 for no limit (in auto mode a pair that times out "
+                             "gets as much again for the numeric fallback, so up to twice this)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--window', type=int, default=None, help="maximum pairs in flight (default: 4 per worker)")
+    parser.add_argument('--unordered', action='store_true', help="write results as they finish, not in input order")
+    parser.add_argument('--quiet', action='store_true', help="do not print throughput statistics to stderr")
+    parser.add_argument('--profile', action='store_true',
+                        help="print per-stage timings to stderr (also enabled by FUNCTION_SOLVER_PROFILE=1)")
+    parser.add_argument('--cache', default=None, metavar='PATH',
+                        help=f"SQLite file caching results across runs (default: ${CACHE_ENV_VAR}, if set)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.profile:
+        Instrumentation.enable()
+    if args.cache:
+        os.environ[CACHE_ENV_VAR] = args.cache  # Set before the workers are spawned, so they inherit it
+    file_format = args.format
+    if file_format == 'auto':
+        file_format = 'csv' if args.input.lower().endswith('.csv') else 'jsonl'
+
+    batch = BatchSolver(workers=args.workers,
+                        window=args.window,
+                        timeout=args.timeout or None,
+                        mode=args.mode,
+                        interval=tuple(args.interval),
+                        ordered=not args.unordered)
+    with contextlib.ExitStack() as stack:
+        stream = sys.stdin if args.input == '-' else stack.enter_context(open(args.input, newline=''))
+        output = sys.stdout if args.output == '-' else stack.enter_context(open(args.output, 'w'))
+        start = time.monotonic()
+        stats = batch.run(read_pairs(stream, file_format), output)
+        elapsed = time.monotonic() - start
+
+    if not args.quiet:
+        summary = ', '.join(f"{status}: {count}" for status, count in sorted(stats.items()) if status != 'pairs')
+        rate = stats['pairs'] / elapsed if elapsed > 0 else 0.0
+        workers = f"{batch.workers} worker{'s' if batch.workers != 1 else ''}"
+        print(f"{stats['pairs']} pairs in {elapsed:.2f}s ({rate:.1f} pairs/s, {workers})"
+              f"{' - ' + summary if summary else ''}", file=sys.stderr)
+    Instrumentation.report()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+import math
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.function_solver.core.domain_analysis import DomainAnalyzer, Interval
+from src.function_solver.core.expression_compiler import Kernel
+
+
+class SampledCurve(NamedTuple):
+    """
+        A sampled curve ready to be plotted.
+
+        Attributes:
+            x (np.ndarray): The sample positions, in increasing order.
+            y (np.ndarray): The sampled values. NaN marks points outside the domain and breaks inserted at poles,
+                            so a plotted line never bridges a gap or an asymptote.
+            poles (List[float]): The x-positions where the curve was broken at a pole.
+            evaluations (int): The number of points the function was evaluated at.
+    """
+    x: np.ndarray
+    y: np.ndarray
+    poles: List[float]
+    evaluations: int
+
+
+class AdaptiveSampler:
+    """
+        Samples a vectorized function with a density that follows its shape on screen. Starting from a coarse grid,
+        every segment is split at its midpoint while the midpoint strays from the straight line between its ends by
+        more than the pixel tolerance (curvature), while the segment climbs steeply (change in y), or while it
+        straddles the edge of the domain. All segments of a refinement level are evaluated in one vectorized call.
+        Afterwards the curve is broken at poles (see `break_at_poles`): where a sample is infinite, where it jumps
+        across the whole canvas between two neighbouring samples with a sign change (e.g., `1/x`), or where a
+        single sample towers over both of its neighbours (e.g., `1/x^2`). Given the function's domain (see
+        `DomainAnalyzer`), only the parts of the interval inside it are sampled, separated by NaN breaks.
+    """
+    INITIAL_SEGMENTS = 64
+    MAX_DEPTH = 16
+    MAX_POINTS = 200_000
+
+    @staticmethod
+    def sample(function: Kernel,
+               interval: Tuple[float, float],
+               pixel_size: Tuple[float, float] = (1000, 600),
+               tolerance: float = 0.25,
+               max_step: float = 32,
+               min_width: float = 0.125,
+               edge_width: float = 1 / 64,
+               initial_segments: int = INITIAL_SEGMENTS,
+               domain: Optional[Sequence[Interval]] = None
+               ) -> SampledCurve:
+        """
+            Samples a function over an interval for display on a canvas of the given size.
+
+            :param function: A kernel taking an array of `x` values (e.g., from `ExpressionCompiler.compile`).
+            :param interval: The `(lower, upper)` x-range to sample.
+            :param pixel_size: The `(width, height)` of the plotting area in pixels.
+            :param tolerance: The largest allowed distance, in pixels, between the curve and its line segments.
+            :param max_step: The largest allowed vertical step, in pixels, between neighbouring samples.
+            :param min_width: The narrowest segment, in pixels, that is split to meet `tolerance` or `max_step`.
+            :param edge_width: The narrowest segment, in pixels, that is split to locate the edge of the domain.
+            :param initial_segments: The number of segments of the coarse grid refinement starts from.
+            :param domain: The intervals where the function is defined; the coarse grid only covers them.
+            :return: The `SampledCurve`.
+        """
+        lower, upper = float(interval[0]), float(interval[1])
+        pixel_width, pixel_height = max(pixel_size[0], 1), max(pixel_size[1], 1)
+        pieces = [(lower, upper)] if domain is None else DomainAnalyzer.clip(domain, (lower, upper))
+        if not pieces:
+            return SampledCurve(np.array([lower, upper]), np.full(2, np.nan), [], 0)
+        x, gaps = AdaptiveSampler.initial_grid(pieces, initial_segments)
+        y = function(x)
+        evaluations = x.size
+
+        x_scale = pixel_width / (upper - lower) if upper > lower else 0.0
+        y_scale = pixel_height / AdaptiveSampler.robust_span(y)
+
+        # Segments joining two domain pieces lie outside the domain and are never split
+        active = np.setdiff1d(np.arange(x.size - 1), gaps)
+        for _ in range(AdaptiveSampler.MAX_DEPTH):
+            if active.size == 0 or x.size + active.size > AdaptiveSampler.MAX_POINTS:
+                break
+            x_left, x_right = x[active], x[active + 1]
+            y_left, y_right = y[active], y[active + 1]
+            x_mid = (x_left + x_right) / 2
+            y_mid = function(x_mid)
+            evaluations += x_mid.size
+
+            finite_left, finite_right, finite_mid = np.isfinite(y_left), np.isfinite(y_right), np.isfinite(y_mid)
+            all_finite = finite_left & finite_right & finite_mid
+            width = (x_right - x_left) * x_scale
+            with np.errstate(invalid='ignore', over='ignore'):
+                deviation = np.abs(y_mid - (y_left + y_right) / 2) * y_scale
+                step = np.abs(y_right - y_left) * y_scale
+                smooth = all_finite & (width > min_width) & ((deviation > tolerance)
+                                                             | ((step > max_step) & (width > 1)))
+            edge = ~all_finite & (finite_left | finite_right | finite_mid) & (width > edge_width)
+            refine = smooth | edge
+
+            # Keep every midpoint (it is already paid for) and split the refined segments again
+            x = np.insert(x, active + 1, x_mid)
+            y = np.insert(y, active + 1, y_mid)
+            left = (active + np.arange(active.size))[refine]
+            active = np.sort(np.concatenate([left, left + 1]))
+
+        if domain is not None:
+            x, y = AdaptiveSampler.break_outside(x, y, pieces, (lower, upper))
+        x, y, poles = AdaptiveSampler.break_at_poles(x, y, pixel_height / y_scale)
+        return SampledCurve(x, y, poles, evaluations)
+
+    @staticmethod
+    def initial_grid(pieces: Sequence[Interval], segments: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+            Spreads the segments of the coarse grid over domain pieces in proportion to their widths.
+
+            :param pieces: The sorted, disjoint, finite `(lower, upper)` pieces to cover.
+            :param segments: The total number of segments.
+            :return: The grid, and the indices of the segments that join one piece to the next.
+        """
+        total = sum(high - low for low, high in pieces)
+        grids = [np.linspace(low, high, max(math.ceil(segments * (high - low) / total), 1) + 1)
+                 for low, high in pieces]
+        gaps = np.cumsum([grid.size for grid in grids[:-1]], dtype=int) - 1
+        return np.concatenate(grids), gaps
+
+    @staticmethod
+    def break_outside(x: np.ndarray,
+                      y: np.ndarray,
+                      pieces: Sequence[Interval],
+                      interval: Interval
+                      ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+            Inserts NaN breaks between domain pieces and at the ends of the interval they do not reach, so the
+            curve is not bridged across the gaps and still spans the whole interval.
+
+            :param x: The sample positions, all inside the pieces.
+            :param y: The sampled values.
+            :param pieces: The sampled domain pieces.
+            :param interval: The sampled `(lower, upper)` x-range.
+            :return: The `(x, y)` arrays with the breaks inserted.
+        """
+        breaks = [(left[1] + right[0]) / 2 for left, right in zip(pieces[:-1], pieces[1:])]
+        if pieces[0][0] > interval[0]:
+            breaks.insert(0, interval[0])
+        if pieces[-1][1] < interval[1]:
+            breaks.append(interval[1])
+        if not breaks:
+            return x, y
+        positions = np.searchsorted(x, breaks)
+        return np.insert(x, positions, breaks), np.insert(y, positions, np.nan)
+
+    @staticmethod
+    def break_at_poles(x: np.ndarray,
+                       y: np.ndarray,
+                       span: float
+                       ) -> Tuple[np.ndarray, np.ndarray, List[float]]:
+        """
+            Breaks the curve at poles, which are recognised in three ways:
+                - an infinite sample, where the pole falls exactly on a sample (e.g., `1/x` at 0), is replaced
+                  with NaN;
+                - between two neighbouring samples that change sign while jumping by more than `span` (an odd pole
+                  between samples), a NaN break is inserted;
+                - a finite sample whose magnitude exceeds both of its neighbours and differs from one of them by
+                  more than `span` (an even pole between samples, e.g. `1/x^2`) is replaced with NaN.
+            Refinement keeps neighbouring samples of a continuous curve far closer than `span`, so such jumps only
+            happen at poles. Other non-finite samples (NaN outside the domain) are left as they are.
+
+            :param x: The sample positions.
+            :param y: The sampled values, possibly infinite.
+            :param span: The visible y-span; a larger jump between two samples is treated as a pole.
+            :return: The `(x, y)` arrays with breaks inserted and no infinite values, and the sorted x-positions
+                     of the poles.
+        """
+        infinite = np.isinf(y)
+        y = np.where(infinite, np.nan, y)
+        with np.errstate(invalid='ignore'):
+            size = np.abs(y)
+            jumps = np.abs(np.diff(y)) > span
+            flips = jumps & (np.sign(y[:-1]) * np.sign(y[1:]) < 0)
+            above_left = np.concatenate([[True], size[1:] > size[:-1]])
+            above_right = np.concatenate([size[:-1] > size[1:], [True]])
+        jumped = np.concatenate([[False], jumps]) | np.concatenate([jumps, [False]])
+        flipped = np.concatenate([[False], flips]) | np.concatenate([flips, [False]])
+        spikes = above_left & above_right & jumped & ~flipped
+
+        broken = infinite | spikes
+        y[spikes] = np.nan
+        flips = np.flatnonzero(flips)
+        poles = np.sort(np.concatenate([x[broken], (x[flips] + x[flips + 1]) / 2]))
+        if flips.size == 0:
+            return x, y, poles.tolist()
+        return np.insert(x, flips + 1, (x[flips] + x[flips + 1]) / 2), np.insert(y, flips + 1, np.nan), poles.tolist()
+
+    @staticmethod
+    def robust_span(y: np.ndarray) -> float:
+        """
+            Estimates the y-span a plot of the samples would show, ignoring extreme values near poles.
+
+            :param y: The sampled values.
+            :return: The span between the 2nd and 98th percentiles of the finite values (1 if they coincide).
+        """
+        finite = y[np.isfinite(y)]
+        if finite.size == 0:
+            return 1.0
+        low, high = np.percentile(finite, [2, 98])
+        return float(high - low) or 1.0
@@ -0,0 +1,69 @@
+import math
+from typing import Tuple
+
+import numpy as np
+
+from src.function_solver.core.adaptive_sampler import SampledCurve
+
+
+class ColumnDecimator:
+    """
+        Reduces a sampled curve to at most four points per pixel column before it is drawn: the first, lowest,
+        highest and last sample of the column, in their original order. A line through these points covers exactly
+        the pixels the full curve covers (it enters and leaves each column at the same heights and spans the same
+        vertical extent), so the picture is unchanged while the number of vertices handed to Matplotlib is bounded
+        by the width of the canvas instead of the number of samples.
+
+        Non-finite samples (the NaN breaks at poles and domain edges) are always kept, and the runs on either side
+        of one are decimated separately, so a decimated line never bridges a gap. Samples left or right of the
+        visible range are grouped into one column on each side, which keeps the lines reaching the edges.
+    """
+    POINTS_PER_COLUMN = 4
+
+    @staticmethod
+    def decimate(curve: SampledCurve,
+                 interval: Tuple[float, float],
+                 pixel_width: float
+                 ) -> SampledCurve:
+        """
+            Decimates a curve for the visible x-range.
+
+            :param curve: The sampled curve.
+            :param interval: The visible `(lower, upper)` x-range.
+            :param pixel_width: The width of the plotting area in pixels.
+            :return: The decimated curve, with the same `poles` and `evaluations`, or `curve` itself if it has no
+                     more than `POINTS_PER_COLUMN` samples per column anyway.
+        """
+        x, y = curve.x, curve.y
+        lower, upper = interval
+        columns = max(math.ceil(pixel_width), 1)
+        if x.size <= ColumnDecimator.POINTS_PER_COLUMN * (columns + 2) or not upper > lower:
+            return curve
+
+        with np.errstate(invalid='ignore'):
+            column = np.floor((x - lower) * (columns / (upper - lower)))
+        column = np.clip(column, -1, columns)
+        finite = np.isfinite(y)
+        # A new group starts wherever the column changes, and at and right after every non-finite sample
+        starts = np.empty(x.size, dtype=bool)
+        starts[0] = True
+        starts[1:] = (column[1:] != column[:-1]) | ~finite[1:] | ~finite[:-1]
+        starts = np.flatnonzero(starts)
+        ends = np.append(starts[1:], x.size) - 1
+        sizes = ends - starts + 1
+        group = np.repeat(np.arange(starts.size), sizes)
+
+        lowest = ColumnDecimator._first_where((y == np.repeat(np.minimum.reduceat(y, starts), sizes)) | ~finite,
+                                              group)
+        highest = ColumnDecimator._first_where((y == np.repeat(np.maximum.reduceat(y, starts), sizes)) | ~finite,
+                                               group)
+        keep = np.sort(np.stack([starts, lowest, highest, ends], axis=1), axis=1).ravel()
+        keep = keep[np.append(True, keep[1:] != keep[:-1])]
+        return SampledCurve(x[keep], y[keep], curve.poles, curve.evaluations)
+
+    @staticmethod
+    def _first_where(mask: np.ndarray, group: np.ndarray) -> np.ndarray:
+        """Returns the index of the first True of `mask` in each group (every group is assumed to have one)."""
+        indices = np.flatnonzero(mask)
+        groups = group[indices]
+        return indices[np.append(True, groups[1:] != groups[:-1])]
@@ -0,0 +1,231 @@
+import csv
+import threading
+from concurrent.futures import CancelledError
+from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.function_solver.core.parallel_sampler import ParallelSampler
+from src.function_solver.core.solver import Solver
+
+
+class ExportResult(NamedTuple):
+    """
+        The outcome of `CurveExporter.export`.
+
+        Attributes:
+            path (Path): The file the samples were written to.
+            samples (int): The number of rows written.
+            intersections_path (Optional[Path]): The sidecar file of intersection points, or None if there were
+                                                 fewer than two functions.
+            intersections (int): The number of intersection points written to the sidecar.
+    """
+    path: Path
+    samples: int
+    intersections_path: Optional[Path]
+    intersections: int
+
+
+class CurveExporter:
+    """
+        Exports functions sampled on a uniform grid to a file, for analysis outside the application. The grid is
+        evaluated and written in chunks of `chunk_size` rows, so memory use does not depend on the number of samples.
+        Every row holds `x` followed by the value of each function at `x` (NaN outside its domain), as float64.
+        Each column of a chunk is split across the `SolverPool` workers by `ParallelSampler` when the chunk is large
+        enough, so the default chunk is sized to fill several workers.
+
+        Three formats are supported, chosen from the file extension unless given:
+            - `CSV` (".csv"): a header line with `x` and the function strings, then one line per sample.
+            - `NPY` (".npy"): a NumPy array of shape `(samples, 1 + functions)`, readable with `numpy.load`
+              (including `mmap_mode='r'`).
+            - `MEMMAP` (any other extension, e.g. ".dat"): the same array as raw little-endian float64 in row
+              order without a header, written through `numpy.memmap`, readable with
+              `numpy.memmap(path, dtype='<f8').reshape(-1, 1 + functions)`.
+
+        With two functions or more, the intersection points of every pair inside the range, as found by `Solver`,
+        go into a CSV sidecar file next to the export (see `sidecar_path`).
+    """
+    CSV = 'csv'
+    NPY = 'npy'
+    MEMMAP = 'memmap'
+    FORMATS = (CSV, NPY, MEMMAP)
+    CHUNK_SIZE = 1 << 18  # Rows evaluated and written at a time, 8 times `ParallelSampler.MIN_CHUNK`
+    DTYPE = np.dtype('<f8')
+
+    @staticmethod
+    def file_format(path: Union[str, Path]) -> str:
+        """
+            Returns the export format matching a file extension.
+
+            :param path: The file path (e.g., "curves.npy").
+            :return: `CSV` for ".csv", `NPY` for ".npy" and `MEMMAP` otherwise.
+        """
+        suffix = Path(path).suffix.lower()
+        return {'.csv': CurveExporter.CSV, '.npy': CurveExporter.NPY}.get(suffix, CurveExporter.MEMMAP)
+
+    @staticmethod
+    def sidecar_path(path: Union[str, Path]) -> Path:
+        """
+            Returns the path of the intersections sidecar of an export.
+
+            :param path: The file path of the export (e.g., "curves.npy").
+            :return: The sidecar path (e.g., "curves.intersections.csv").
+        """
+        path = Path(path)
+        return path.with_name(path.stem + '.intersections.csv')
+
+    @staticmethod
+    def chunks(functions: Sequence[str],
+               interval: Tuple[float, float],
+               samples: int,
+               chunk_size: int = CHUNK_SIZE,
+               processes: Optional[int] = None
+               ) -> Iterator[np.ndarray]:
+        """
+            Evaluates functions on a uniform grid, one chunk of rows at a time.
+
+            :param functions: The function strings.
+            :param interval: The `(lower, upper)` x-range; both ends are part of the grid.
+            :param samples: The number of grid points, at least 2.
+            :param chunk_size: The maximum number of rows per chunk.
+            :param processes: The number of worker processes sampling each chunk, see `ParallelSampler.evaluate`.
+            :return: An iterator over arrays of shape `(rows, 1 + len(functions))`.
+        """
+        if samples < 2:
+            raise ValueError(f"At least 2 samples are needed, got {samples}")
+        lower, upper = interval
+        step = (upper - lower) / (samples - 1)
+        for start in range(0, samples, chunk_size):
+            stop = min(start + chunk_size, samples)
+            chunk = np.empty((stop - start, 1 + len(functions)), dtype=CurveExporter.DTYPE)
+            chunk[:, 0] = lower + np.arange(start, stop) * step
+            if stop == samples:
+                chunk[-1, 0] = upper  # Land exactly on the end, whatever the rounding of the step
+            for column, function in enumerate(functions, start=1):
+                chunk[:, column] = ParallelSampler.evaluate(function, interval, samples, start, stop, processes)[1]
+            yield chunk
+
+    @staticmethod
+    def export(functions: Sequence[str],
+               interval: Tuple[float, float],
+               samples: int,
+               path: Union[str, Path],
+               file_format: Optional[str] = None,
+               chunk_size: int = CHUNK_SIZE,
+               processes: Optional[int] = None,
+               solve_timeout: Optional[float] = None,
+               cancel: Optional[threading.Event] = None,
+               progress: Optional[Callable[[int, int], None]] = None,
+               numbers: Optional[Sequence[int]] = None
+               ) -> ExportResult:
+        """
+            Samples functions on a uniform grid and writes them to a file, chunk by chunk, together with the
+            intersections sidecar.
+
+            :param functions: The function strings.
+            :param interval: The `(lower, upper)` x-range.
+            :param samples: The number of grid points, at least 2.
+            :param path: The file to write.
+            :param file_format: `CSV`, `NPY` or `MEMMAP`, or None to choose from the file extension.
+            :param chunk_size: The number of rows evaluated and written at a time.
+            :param processes: The number of worker processes sampling each chunk, defaults to the size of the pool.
+            :param solve_timeout: The time budget in seconds for each symbolic solve of the intersections.
+            :param cancel: An event that abandons the export between chunks when set.
+            :param progress: Called with the number of rows written so far and the total after every chunk.
+            :param numbers: The numbers naming the functions in the sidecar, see `export_intersections`.
+            :return: An `ExportResult`.
+            :raises ValueError: If there are fewer than 2 samples or the format is unknown; no file is written.
+            :raises CancelledError: If `cancel` was set before the export finished; the files are left incomplete.
+        """
+        if samples < 2:
+            raise ValueError(f"At least 2 samples are needed, got {samples}")
+        path = Path(path)
+        file_format = file_format or CurveExporter.file_format(path)
+        if file_format not in CurveExporter.FORMATS:
+            raise ValueError(f"Unknown export format '{file_format}', expected one of {CurveExporter.FORMATS}")
+
+        columns = 1 + len(functions)
+        chunks = CurveExporter.chunks(functions, interval, samples, chunk_size, processes)
+        written = 0
+        if file_format == CurveExporter.MEMMAP:
+            array = np.memmap(path, dtype=CurveExporter.DTYPE, mode='w+', shape=(samples, columns))
+            try:
+                for chunk in chunks:
+                    array[written:written + len(chunk)] = chunk
+                    array.flush()  # Write the dirty pages back, so they can be dropped from memory
+                    written = CurveExporter._advance(written, len(chunk), samples, cancel, progress)
+            finally:
+                del array
+        else:
+            with open(path, 'w' if file_format == CurveExporter.CSV else 'wb',
+                      newline='' if file_format == CurveExporter.CSV else None) as handle:
+                if file_format == CurveExporter.CSV:
+                    csv.writer(handle).writerow(['x', *functions])
+                else:
+                    np.lib.format.write_array_header_1_0(handle, {'descr': CurveExporter.DTYPE.str,
+                                                                  'fortran_order': False,
+                                                                  'shape': (samples, columns)})
+                for chunk in chunks:
+                    if file_format == CurveExporter.CSV:
+                        np.savetxt(handle, chunk, fmt='%.17g', delimiter=',')
+                    else:
+                        chunk.tofile(handle)
+                    written = CurveExporter._advance(written, len(chunk), samples, cancel, progress)
+
+        sidecar, intersections = None, 0
+        if len(functions) >= 2:
+            sidecar = CurveExporter.sidecar_path(path)
+            intersections = CurveExporter.export_intersections(functions, interval, sidecar, solve_timeout, cancel,
+                                                               numbers)
+        return ExportResult(path, written, sidecar, intersections)
+
+    @staticmethod
+    def export_intersections(functions: Sequence[str],
+                             interval: Tuple[float, float],
+                             path: Union[str, Path],
+                             timeout: Optional[float] = None,
+                             cancel: Optional[threading.Event] = None,
+                             numbers: Optional[Sequence[int]] = None
+                             ) -> int:
+        """
+            Solves every pair of functions and writes their real intersection points inside a range to a CSV file
+            with the columns `function1`, `function2` (the numbers of the two functions, as in the plot legend),
+            `x` and `y`.
+
+            :param functions: The function strings.
+            :param interval: The `(lower, upper)` x-range; it is also the interval searched by the numeric solver.
+            :param path: The file to write.
+            :param timeout: The time budget in seconds for each symbolic solve, see `Solver.solve_detailed`.
+            :param cancel: An event that abandons the solves when set.
+            :param numbers: The number of each function, defaults to their 1-based positions.
+            :return: The number of intersection points written.
+        """
+        numbers = list(numbers) if numbers is not None else list(range(1, len(functions) + 1))
+        rows: List[Tuple[int, int, float, float]] = []
+        pairs = Solver.solve_pairs(functions, interval=interval, timeout=timeout, cancel=cancel)
+        for (i, j), solutions in pairs.items():
+            xs = sorted(complex(sol).real for sol in solutions
+                        if complex(sol).imag == 0 and interval[0] <= complex(sol).real <= interval[1])
+            ys = Solver.evaluate_many(functions[i], xs).tolist() if xs else []
+            rows.extend((numbers[i], numbers[j], x, y) for x, y in zip(xs, ys))
+        with open(path, 'w', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['function1', 'function2', 'x', 'y'])
+            writer.writerows((i, j, repr(x), repr(y)) for i, j, x, y in rows)
+        return len(rows)
+
+    @staticmethod
+    def _advance(written: int,
+                 rows: int,
+                 samples: int,
+                 cancel: Optional[threading.Event],
+                 progress: Optional[Callable[[int, int], None]]
+                 ) -> int:
+        """Counts a written chunk, reports progress and stops if cancelled."""
+        written += rows
+        if progress is not None:
+            progress(written, samples)
+        if cancel is not None and cancel.is_set():
+            raise CancelledError()
+        return written
@@ -0,0 +1,309 @@
+import math
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.function_solver.core.expression_ast import BinaryOp, FunctionCall, Node, Number, UnaryOp, Variable
+from src.function_solver.core.expression_compiler import ExpressionCompiler
+
+Interval = Tuple[float, float]
+Domain = List[Interval]  # Sorted, disjoint `(lower, upper)` intervals; the ends may be infinite
+
+REAL_LINE: Domain = [(-math.inf, math.inf)]
+
+
+class Enclosure(NamedTuple):
+    """
+        The result of evaluating an expression over an interval of `x` with interval arithmetic.
+
+        Attributes:
+            lower (float): A lower bound of the values the expression takes where it is defined.
+            upper (float): An upper bound of those values.
+            status (int): Where the expression is defined: `DomainAnalyzer.DEFINED` (everywhere in the interval),
+                          `PARTIAL` (possibly only in part of it), `UNKNOWN` (possibly only in part of it, and
+                          splitting the interval would not tell) or `UNDEFINED` (nowhere).
+    """
+    lower: float
+    upper: float
+    status: int
+
+
+class DomainAnalyzer:
+    """
+        Static analysis of where a parsed expression is defined over the reals, by interval arithmetic on its
+        syntax tree. "Defined" follows the compiled NumPy kernels: a point is outside the domain when the kernel
+        returns NaN there (`log` or `sqrt` of a negative number, a negative base raised to a fractional power),
+        while poles such as `1/x` at 0 or `log(0)` stay inside it. The domain is found by branch and bound: an
+        interval where the enclosure is only partially defined is split in two until the pieces are decided or
+        narrower than the resolution. Leftover pieces are kept, so the result never excludes a defined point.
+    """
+    DEFINED = 0
+    UNKNOWN = 1
+    PARTIAL = 2
+    UNDEFINED = 3
+
+    WINDOW = (-2.0 ** 30, 2.0 ** 30)  # Analysed x-range; pieces reaching its ends are taken to be unbounded
+    RESOLUTION = 1e-9  # Relative width below which a partially defined piece is no longer split
+    MAX_BOXES = 4096  # Intervals examined per expression before the remaining ones are kept as they are
+    RANGE_BOXES = 64  # Sub-intervals per domain piece when bounding the range
+
+    @staticmethod
+    def restricts_domain(node: Node) -> bool:
+        """
+            Tells whether an expression can be undefined anywhere, without analysing it: only `log`, `sqrt`,
+            powers with a fractional or variable exponent and undefined constants (e.g., "log(-1)") can be.
+
+            :param node: The root of a constant-folded syntax tree.
+            :return: False if the expression is defined on the whole real line.
+        """
+        if isinstance(node, Number):
+            return math.isnan(node.value)
+        if isinstance(node, FunctionCall):
+            return True
+        if isinstance(node, UnaryOp):
+            return DomainAnalyzer.restricts_domain(node.operand)
+        if isinstance(node, BinaryOp):
+            if node.op == '^' and not (isinstance(node.right, Number) and node.right.value.is_integer()):
+                return True
+            return DomainAnalyzer.restricts_domain(node.left) or DomainAnalyzer.restricts_domain(node.right)
+        return False
+
+    @staticmethod
+    def domain(node: Node,
+               window: Interval = WINDOW,
+               max_boxes: int = MAX_BOXES,
+               resolution: float = RESOLUTION
+               ) -> Domain:
+        """
+            Computes the real domain of an expression.
+
+            :param node: The root of the syntax tree (e.g., of "log(x - 3) + sqrt(5 - x)").
+            :param window: The x-range to analyse.
+            :param max_boxes: The number of intervals to examine before keeping the undecided ones whole.
+            :param resolution: The relative width below which an undecided interval is kept instead of split.
+            :return: The intervals where the expression may be defined, sorted and disjoint (e.g., [(3, 5)]).
+                     Pieces that reach the ends of `window` extend to infinity; an empty list means the
+                     expression is defined nowhere.
+        """
+        folded = ExpressionCompiler.fold_constants(node)
+        if not DomainAnalyzer.restricts_domain(folded):
+            return list(REAL_LINE)
+
+        lower, upper = window
+        pieces: Domain = []
+        stack = [(float(lower), float(upper))]
+        boxes = 0
+        with np.errstate(all='ignore'):
+            while stack:
+                low, high = stack.pop()
+                boxes += 1
+                status = DomainAnalyzer._enclose(folded, low, high).status
+                if status == DomainAnalyzer.UNDEFINED:
+                    continue
+                if (status == DomainAnalyzer.PARTIAL and boxes < max_boxes
+                        and high - low > resolution * max(1.0, abs(low), abs(high))):
+                    middle = (low + high) / 2
+                    stack.append((middle, high))
+                    stack.append((low, middle))  # Popped first, so pieces are found from left to right
+                    continue
+                if pieces and pieces[-1][1] == low:
+                    pieces[-1] = (pieces[-1][0], high)
+                else:
+                    pieces.append((low, high))
+
+        if pieces and pieces[0][0] == lower:
+            pieces[0] = (-math.inf, pieces[0][1])
+        if pieces and pieces[-1][1] == upper:
+            pieces[-1] = (pieces[-1][0], math.inf)
+        return pieces
+
+    @staticmethod
+    def value_range(node: Node,
+                    interval: Interval,
+                    domain: Optional[Domain] = None,
+                    boxes: int = RANGE_BOXES
+                    ) -> Optional[Interval]:
+        """
+            Bounds the values an expression takes over an x-range, where it is defined.
+
+            :param node: The root of the syntax tree.
+            :param interval: The finite `(lower, upper)` x-range.
+            :param domain: The expression's domain, if already known; computed otherwise.
+            :param boxes: The number of sub-intervals each domain piece is split into, which tightens the bounds.
+            :return: The `(lower, upper)` bounds (possibly infinite, e.g. near a pole), or None if the expression
+                     is defined nowhere in the range.
+        """
+        folded = ExpressionCompiler.fold_constants(node)
+        if domain is None:
+            domain = DomainAnalyzer.domain(folded)
+        low, high = math.inf, -math.inf
+        with np.errstate(all='ignore'):
+            for piece_low, piece_high in DomainAnalyzer.clip(domain, interval):
+                edges = np.linspace(piece_low, piece_high, boxes + 1)
+                for left, right in zip(edges[:-1].tolist(), edges[1:].tolist()):
+                    enclosure = DomainAnalyzer._enclose(folded, left, right)
+                    if enclosure.status != DomainAnalyzer.UNDEFINED:
+                        low, high = min(low, enclosure.lower), max(high, enclosure.upper)
+        return (low, high) if low <= high else None
+
+    @staticmethod
+    def clip(domain: Sequence[Interval], interval: Interval) -> Domain:
+        """
+            Restricts a domain to an x-range.
+
+            :param domain: The domain intervals.
+            :param interval: The `(lower, upper)` x-range.
+            :return: The non-empty parts of the domain inside the range.
+        """
+        clipped = []
+        for low, high in domain:
+            low, high = max(low, interval[0]), min(high, interval[1])
+            if low < high:
+                clipped.append((low, high))
+        return clipped
+
+    @staticmethod
+    def intersect(first: Sequence[Interval], second: Sequence[Interval]) -> Domain:
+        """
+            Intersects two domains, e.g. to get where the difference of two functions is defined.
+
+            :param first: The first domain.
+            :param second: The second domain.
+            :return: The intervals contained in both.
+        """
+        result = []
+        i = j = 0
+        while i < len(first) and j < len(second):
+            low, high = max(first[i][0], second[j][0]), min(first[i][1], second[j][1])
+            if low < high:
+                result.append((low, high))
+            if first[i][1] < second[j][1]:
+                i += 1
+            else:
+                j += 1
+        return result
+
+    @staticmethod
+    def union(domains: Sequence[Sequence[Interval]]) -> Domain:
+        """
+            Merges several domains, e.g. to get where at least one of the plotted functions is defined.
+
+            :param domains: The domains to merge.
+            :return: The sorted, disjoint intervals covered by any of them.
+        """
+        result: Domain = []
+        for low, high in sorted(piece for domain in domains for piece in domain):
+            if result and low <= result[-1][1]:
+                result[-1] = (result[-1][0], max(result[-1][1], high))
+            else:
+                result.append((low, high))
+        return result
+
+    @staticmethod
+    def _enclose(node: Node, low: float, high: float) -> Enclosure:
+        """Evaluates a folded tree over `[low, high]` with interval arithmetic."""
+        if isinstance(node, Variable):
+            return Enclosure(low, high, DomainAnalyzer.DEFINED)
+
+        if isinstance(node, Number):
+            if math.isnan(node.value):
+                return Enclosure(math.nan, math.nan, DomainAnalyzer.UNDEFINED)
+            return Enclosure(node.value, node.value, DomainAnalyzer.DEFINED)
+
+        if isinstance(node, UnaryOp):
+            operand = DomainAnalyzer._enclose(node.operand, low, high)
+            return Enclosure(-operand.upper, -operand.lower, operand.status)
+
+        if isinstance(node, FunctionCall):
+            argument = DomainAnalyzer._enclose(node.argument, low, high)
+            if argument.status == DomainAnalyzer.UNDEFINED or argument.upper < 0:
+                return Enclosure(math.nan, math.nan, DomainAnalyzer.UNDEFINED)
+            status = argument.status if argument.lower >= 0 else max(argument.status, DomainAnalyzer.PARTIAL)
+            function = ExpressionCompiler.function_ufuncs[node.name]
+            return Enclosure(float(function(max(argument.lower, 0.0))), float(function(argument.upper)), status)
+
+        if isinstance(node, BinaryOp):
+            left = DomainAnalyzer._enclose(node.left, low, high)
+            if left.status == DomainAnalyzer.UNDEFINED:
+                return left
+            right = DomainAnalyzer._enclose(node.right, low, high)
+            if right.status == DomainAnalyzer.UNDEFINED:
+                return right
+            status = max(left.status, right.status)
+            if node.op == '+':
+                return DomainAnalyzer._bounds((left.lower + right.lower, left.upper + right.upper), status)
+            if node.op == '-':
+                return DomainAnalyzer._bounds((left.lower - right.upper, left.upper - right.lower), status)
+            if node.op == '*':
+                return DomainAnalyzer._product(left, right, status)
+            if node.op == '/':
+                return DomainAnalyzer._quotient(left, right, status)
+            if isinstance(node.right, Number):
+                return DomainAnalyzer._constant_power(left, node.right.value, status)
+            return DomainAnalyzer._variable_power(left, right, status)
+
+        raise TypeError(f"Cannot analyse node {node!r}")
+
+    @staticmethod
+    def _bounds(values: Sequence[float], status: int) -> Enclosure:
+        """The enclosure of candidate bound values; an undetermined one (e.g., inf - inf) widens it fully."""
+        if any(math.isnan(value) for value in values):
+            return Enclosure(-math.inf, math.inf, status)
+        return Enclosure(min(values), max(values), status)
+
+    @staticmethod
+    def _product(left: Enclosure, right: Enclosure, status: int) -> Enclosure:
+        return DomainAnalyzer._bounds((left.lower * right.lower, left.lower * right.upper,
+                                       left.upper * right.lower, left.upper * right.upper), status)
+
+    @staticmethod
+    def _quotient(left: Enclosure, right: Enclosure, status: int) -> Enclosure:
+        if right.lower > 0 or right.upper < 0:
+            reciprocal = Enclosure(1 / right.upper, 1 / right.lower, status)
+        elif right.lower == 0 and right.upper > 0:
+            reciprocal = Enclosure(1 / right.upper, math.inf, status)
+        elif right.upper == 0 and right.lower < 0:
+            reciprocal = Enclosure(-math.inf, 1 / right.lower, status)
+        else:
+            return Enclosure(-math.inf, math.inf, status)  # A pole inside the interval
+        return DomainAnalyzer._product(left, reciprocal, status)
+
+    @staticmethod
+    def _constant_power(base: Enclosure, exponent: float, status: int) -> Enclosure:
+        if exponent == 0:
+            return Enclosure(1.0, 1.0, status)
+        if exponent.is_integer():
+            if exponent < 0:
+                power = DomainAnalyzer._constant_power(base, -exponent, status)
+                return DomainAnalyzer._quotient(Enclosure(1.0, 1.0, status), power, status)
+            values = (DomainAnalyzer._power(base.lower, exponent), DomainAnalyzer._power(base.upper, exponent))
+            if exponent % 2 == 0 and base.lower < 0 < base.upper:
+                return Enclosure(0.0, max(values), status)
+            return DomainAnalyzer._bounds(values, status)
+
+        # A negative base raised to a fractional power is NaN
+        if base.upper < 0:
+            return Enclosure(math.nan, math.nan, DomainAnalyzer.UNDEFINED)
+        if base.lower < 0:
+            status = max(status, DomainAnalyzer.PARTIAL)
+        values = (DomainAnalyzer._power(max(base.lower, 0.0), exponent), DomainAnalyzer._power(base.upper, exponent))
+        return DomainAnalyzer._bounds(values, status)
+
+    @staticmethod
+    def _variable_power(base: Enclosure, exponent: Enclosure, status: int) -> Enclosure:
+        if base.lower > 0:
+            # base^exponent = exp(exponent * log(base)), which is increasing in its argument
+            logarithm = Enclosure(float(np.log(base.lower)), float(np.log(base.upper)), status)
+            power = DomainAnalyzer._product(exponent, logarithm, status)
+            return Enclosure(float(np.exp(power.lower)), float(np.exp(power.upper)), status)
+        if base.lower == 0:
+            return Enclosure(0.0, math.inf, status)
+        if base.upper > 0:
+            # Defined where the base is positive; splitting separates that part
+            return Enclosure(-math.inf, math.inf, max(status, DomainAnalyzer.PARTIAL))
+        # A negative base is only defined at integer exponents, which splitting cannot isolate
+        return Enclosure(-math.inf, math.inf, max(status, DomainAnalyzer.UNKNOWN))
+
+    @staticmethod
+    def _power(base: float, exponent: float) -> float:
+        return float(np.power(base, exponent))
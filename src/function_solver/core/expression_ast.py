@@ -0,0 +1,114 @@
+from decimal import Decimal
+from typing import Tuple
+
+
+class Node:
+    """
+        Base class for the nodes of the expression syntax tree built by `ExpressionParser`.
+        Nodes are immutable and use `__slots__`, so a parsed tree is compact, hashable and safe to share
+        between the validation, solving and plotting stages.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    precedence = 5  # Binding strength used when rendering the node back to text
+
+    def __init__(self, *values):
+        for field, value in zip(self._fields, values):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} nodes are immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} nodes are immutable")
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, field) for field in self._fields)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash((type(self).__name__,) + self._values())
+
+    def __reduce__(self):
+        return type(self), self._values()
+
+    def __repr__(self):
+        args = ', '.join(repr(value) for value in self._values())
+        return f"{type(self).__name__}({args})"
+
+    def __str__(self):
+        return self.to_string()
+
+    def to_string(self) -> str:
+        """
+            Renders the node as an expression string that the lexer and parser accept again.
+
+            :return: The canonical text of the expression (e.g., "x^2 + 1").
+        """
+        raise NotImplementedError
+
+    def _wrap(self, node: 'Node', min_precedence: int) -> str:
+        text = node.to_string()
+        return text if node.precedence >= min_precedence else f"({text})"
+
+
+class Number(Node):
+    """A numeric literal (e.g., 2, 0.5)."""
+    __slots__ = ('value',)
+    _fields = ('value',)
+
+    def to_string(self) -> str:
+        if self.value.is_integer() and abs(self.value) < 1e16:
+            return str(int(self.value))
+        return format(Decimal(repr(self.value)), 'f')
+
+
+class Variable(Node):
+    """A variable reference (e.g., x)."""
+    __slots__ = ('name',)
+    _fields = ('name',)
+
+    def to_string(self) -> str:
+        return self.name
+
+
+class UnaryOp(Node):
+    """A prefix operator applied to an operand (unary minus)."""
+    __slots__ = ('op', 'operand')
+    _fields = ('op', 'operand')
+    precedence = 4
+
+    def to_string(self) -> str:
+        return f"{self.op}{self._wrap(self.operand, 4)}"
+
+
+class BinaryOp(Node):
+    """An infix arithmetic operation (`+`, `-`, `*`, `/` or `^`)."""
+    __slots__ = ('op', 'left', 'right')
+    _fields = ('op', 'left', 'right')
+
+    _precedences = {'+': 1, '-': 1, '*': 2, '/': 2, '^': 4}
+
+    @property
+    def precedence(self) -> int:
+        return self._precedences[self.op]
+
+    def to_string(self) -> str:
+        if self.op == '^':
+            # `^` is right associative and only accepts an atom as its base
+            return f"{self._wrap(self.left, 5)}^{self._wrap(self.right, 4)}"
+        level = self.precedence
+        right_level = 3 if level == 2 else 2
+        return f"{self._wrap(self.left, level)} {self.op} {self._wrap(self.right, right_level)}"
+
+
+class FunctionCall(Node):
+    """A call to one of the supported functions (`log` or `sqrt`)."""
+    __slots__ = ('name', 'argument')
+    _fields = ('name', 'argument')
+    precedence = 3
+
+    def to_string(self) -> str:
+        return f"{self.name}({self.argument.to_string()})"
@@ -0,0 +1,238 @@
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional
+
+import numpy as np
+
+from src.function_solver.core.domain_analysis import REAL_LINE, Domain, DomainAnalyzer
+from src.function_solver.core.expression_ast import Node
+from src.function_solver.core.expression_compiler import ExpressionCompiler, Kernel
+from src.function_solver.core.expression_parser import ExpressionParser
+from src.function_solver.core.forward_diff import Dual, DualKernel, ForwardDiff
+from src.function_solver.core.polynomial_solver import PolynomialSolver
+from src.function_solver.utils.instrumentation import Instrumentation
+
+if TYPE_CHECKING:
+    import sympy
+
+
+_NOT_BUILT = object()  # Marks lazily built attributes whose value may legitimately be None
+
+
+class CachedExpression:
+    """
+        Everything derived from one expression string: its syntax tree, its SymPy form, its compiled NumPy kernel,
+        its derivative kernel, its real domain and its polynomial coefficients. All but the syntax tree are built
+        lazily, the first time they are requested.
+
+        Attributes:
+            text (str): The normalized expression text used as the cache key.
+            ast (Node): The parsed syntax tree, or None if the text is not in the parser's grammar
+                        (e.g., SymPy syntax such as "x**2"), in which case SymPy parses the text instead.
+    """
+    __slots__ = ('text', 'ast', '_sympy_expr', '_kernel', '_dual_kernel', '_domain', '_polynomial')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.ast: Optional[Node] = ExpressionParser.shared().validate(text)['ast']
+        self._sympy_expr = None
+        self._kernel = None
+        self._dual_kernel = None
+        self._domain = None
+        self._polynomial = _NOT_BUILT
+
+    @property
+    def sympy_expr(self) -> 'sympy.Expr':
+        """The expression as a SymPy object, converted from the syntax tree when there is one."""
+        if self._sympy_expr is None:
+            with Instrumentation.span('expression.to_sympy'):
+                if self.ast is not None:
+                    self._sympy_expr = ExpressionCompiler.to_sympy(self.ast)
+                else:
+                    import sympy
+                    self._sympy_expr = sympy.sympify(self.text)
+        return self._sympy_expr
+
+    @property
+    def kernel(self) -> Kernel:
+        """The expression compiled into a vectorized NumPy kernel (see `ExpressionCompiler.compile`)."""
+        if self._kernel is None:
+            with Instrumentation.span('expression.compile'):
+                if self.ast is not None:
+                    self._kernel = ExpressionCompiler.compile(self.ast)
+                else:
+                    self._kernel = self._lambdify(self.sympy_expr)
+        return self._kernel
+
+    @property
+    def dual_kernel(self) -> DualKernel:
+        """
+            The expression and its derivative compiled into a single vectorized kernel (see `ForwardDiff.compile`).
+            Without a syntax tree the derivative is taken once with SymPy and compiled next to `kernel`.
+        """
+        if self._dual_kernel is None:
+            with Instrumentation.span('expression.compile_derivative'):
+                if self.ast is not None:
+                    self._dual_kernel = ForwardDiff.compile(self.ast)
+                else:
+                    import sympy
+                    value = self.kernel
+                    derivative = self._lambdify(sympy.diff(self.sympy_expr, sympy.symbols('x')))
+
+                    def dual_kernel(x):
+                        y, dy = value(x), derivative(x)
+                        dy[np.isnan(y)] = np.nan
+                        return Dual(y, dy)
+                    self._dual_kernel = dual_kernel
+        return self._dual_kernel
+
+    @property
+    def domain(self) -> Domain:
+        """
+            The intervals where the expression is defined (see `DomainAnalyzer.domain`), or the whole real line
+            when there is no syntax tree to analyse.
+        """
+        if self._domain is None:
+            with Instrumentation.span('expression.domain'):
+                self._domain = DomainAnalyzer.domain(self.ast) if self.ast is not None else list(REAL_LINE)
+        return self._domain
+
+    @property
+    def polynomial(self) -> Optional[np.ndarray]:
+        """
+            The coefficients of the expression, highest degree first, if it is a polynomial in `x` (see
+            `PolynomialSolver.coefficients`), otherwise None.
+        """
+        if self._polynomial is _NOT_BUILT:
+            self._polynomial = PolynomialSolver.coefficients(self.ast) if self.ast is not None else None
+        return self._polynomial
+
+    @staticmethod
+    def _lambdify(expr: 'sympy.Expr') -> Kernel:
+        import sympy
+        evaluate = sympy.lambdify(sympy.symbols('x'), expr, 'numpy')
+
+        def kernel(x):
+            x = np.asarray(x, dtype=np.float64)
+            with np.errstate(all='ignore'):
+                return np.broadcast_to(np.asarray(evaluate(x), dtype=np.float64), x.shape).copy()
+        return kernel
+
+
+class ExpressionCache:
+    """
+        A bounded, thread-safe LRU cache of `CachedExpression` entries keyed on the normalized expression text.
+        Parsing, SymPy conversion and compilation of an expression then happen once per expression instead of
+        once per call, and the least recently used entries are evicted once `maxsize` is reached.
+
+        Attributes:
+            hits (int): Lookups answered from the cache.
+            misses (int): Lookups that had to build a new entry.
+            evictions (int): Entries dropped to stay within `maxsize`.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, maxsize: int = 512):
+        """
+            Initializes an empty cache.
+
+            :param maxsize: The maximum number of expressions to keep.
+        """
+        self._entries: 'OrderedDict[str, CachedExpression]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def shared(cls) -> 'ExpressionCache':
+        """
+            Returns the process-wide cache used by the solver and the plotter.
+
+            :return: The shared `ExpressionCache`, created on first use.
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def normalize(expression: str) -> str:
+        """
+            Normalizes an expression string into its cache key by dropping all whitespace.
+
+            :param expression: The expression to normalize (e.g., "x ^ 2 + 1").
+            :return: The normalized form (e.g., "x^2+1").
+        """
+        return ''.join(expression.split())
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def get(self, expression: str) -> CachedExpression:
+        """
+            Returns the cache entry for an expression, building it on a miss.
+
+            :param expression: The expression string (e.g., "x^2 + log(x)").
+            :return: The `CachedExpression` for the normalized expression.
+        """
+        key = self.normalize(expression)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                Instrumentation.count('expression_cache.hits')
+                return entry
+            self.misses += 1
+        Instrumentation.count('expression_cache.misses')
+
+        entry = CachedExpression(key)
+        with self._lock:
+            # Another thread may have built the same entry meanwhile; keep the first one
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            self._evict()
+        return entry
+
+    def clear(self) -> None:
+        """Drops every entry and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+            Returns the cache statistics.
+
+            :return: A dictionary with `hits`, `misses`, `evictions`, the current `size` and the `maxsize`.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self._maxsize,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, expression: str):
+        return self.normalize(expression) in self._entries
+
+    def _evict(self) -> None:
+        while len(self._entries) > max(self._maxsize, 0):
+            self._entries.popitem(last=False)
+            self.evictions += 1
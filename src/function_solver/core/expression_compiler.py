@@ -0,0 +1,162 @@
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+from src.function_solver.core.expression_ast import BinaryOp, FunctionCall, Node, Number, UnaryOp, Variable
+
+if TYPE_CHECKING:
+    import sympy
+
+Kernel = Callable[[np.ndarray], np.ndarray]
+
+
+class ExpressionCompiler:
+    """
+        Compiles parsed expressions (see `expression_ast`) into vectorized NumPy kernels.
+        Constant sub-expressions are folded ahead of time and every operator is bound directly to its
+        NumPy ufunc, so evaluating a kernel over an array never goes through `eval` or string rewriting.
+    """
+    binary_ufuncs = {
+        '+': np.add,
+        '-': np.subtract,
+        '*': np.multiply,
+        '/': np.true_divide,
+        '^': np.power,
+    }
+    unary_ufuncs = {
+        '-': np.negative,
+    }
+    function_ufuncs = {
+        'log': np.log,
+        'sqrt': np.sqrt,
+    }
+    sympy_operators = {
+        '+': lambda a, b: a + b,
+        '-': lambda a, b: a - b,
+        '*': lambda a, b: a * b,
+        '/': lambda a, b: a / b,
+        '^': lambda a, b: a ** b,
+    }
+    sympy_functions = {  # Names in the `sympy` namespace, which is only imported once a conversion needs it
+        'log': 'log',
+        'sqrt': 'sqrt',
+    }
+
+    @staticmethod
+    def fold_constants(node: Node) -> Node:
+        """
+            Replaces every sub-expression that does not depend on `x` with its numeric value.
+
+            :param node: The root of the syntax tree to fold.
+            :return: An equivalent tree where constant sub-expressions are `Number` nodes.
+        """
+        if isinstance(node, UnaryOp):
+            operand = ExpressionCompiler.fold_constants(node.operand)
+            if isinstance(operand, Number):
+                return Number(ExpressionCompiler._apply(ExpressionCompiler.unary_ufuncs[node.op], operand.value))
+            return UnaryOp(node.op, operand)
+        if isinstance(node, BinaryOp):
+            left = ExpressionCompiler.fold_constants(node.left)
+            right = ExpressionCompiler.fold_constants(node.right)
+            if isinstance(left, Number) and isinstance(right, Number):
+                return Number(ExpressionCompiler._apply(ExpressionCompiler.binary_ufuncs[node.op],
+                                                        left.value, right.value))
+            return BinaryOp(node.op, left, right)
+        if isinstance(node, FunctionCall):
+            argument = ExpressionCompiler.fold_constants(node.argument)
+            if isinstance(argument, Number):
+                return Number(ExpressionCompiler._apply(ExpressionCompiler.function_ufuncs[node.name],
+                                                        argument.value))
+            return FunctionCall(node.name, argument)
+        return node
+
+    @staticmethod
+    def compile(node: Node) -> Kernel:
+        """
+            Compiles a syntax tree into a reusable callable over NumPy arrays.
+            Kernels are cached per expression by `ExpressionCache`.
+
+            :param node: The root of the syntax tree to compile.
+            :return: A function that takes an array of `x` values and returns a float64 array of the same shape.
+                     Points outside the domain evaluate to NaN (or ±inf at poles) without raising warnings.
+        """
+        folded = ExpressionCompiler.fold_constants(node)
+
+        if isinstance(folded, Number):
+            value = folded.value
+
+            def constant_kernel(x):
+                return np.full(np.shape(x), value, dtype=np.float64)
+            return constant_kernel
+
+        evaluate = ExpressionCompiler._build(folded)
+
+        def kernel(x):
+            x = np.asarray(x, dtype=np.float64)
+            with np.errstate(all='ignore'):
+                result = evaluate(x)
+            return x.copy() if result is x else result
+        return kernel
+
+    @staticmethod
+    def to_sympy(node: Node) -> 'sympy.Expr':
+        """
+            Converts a syntax tree into the equivalent SymPy expression without going back through text.
+            SymPy is imported on the first conversion, not with this module.
+
+            :param node: The root of the syntax tree to convert.
+            :return: The SymPy expression, in the variable `x`.
+        """
+        import sympy
+        if isinstance(node, Number):
+            return sympy.Integer(int(node.value)) if node.value.is_integer() else sympy.Float(node.value)
+        if isinstance(node, Variable):
+            return sympy.Symbol(node.name)
+        if isinstance(node, UnaryOp):
+            return -ExpressionCompiler.to_sympy(node.operand)
+        if isinstance(node, FunctionCall):
+            function = getattr(sympy, ExpressionCompiler.sympy_functions[node.name])
+            return function(ExpressionCompiler.to_sympy(node.argument))
+        if isinstance(node, BinaryOp):
+            left = ExpressionCompiler.to_sympy(node.left)
+            right = ExpressionCompiler.to_sympy(node.right)
+            return ExpressionCompiler.sympy_operators[node.op](left, right)
+        raise TypeError(f"Cannot convert node {node!r}")
+
+    @staticmethod
+    def _apply(ufunc, *values) -> float:
+        with np.errstate(all='ignore'):
+            return float(ufunc(*(np.float64(value) for value in values)))
+
+    @staticmethod
+    def _build(node: Node) -> Kernel:
+        """Recursively turns a folded tree into nested closures over the bound ufuncs."""
+        if isinstance(node, Variable):
+            return lambda x: x
+
+        if isinstance(node, UnaryOp):
+            ufunc = ExpressionCompiler.unary_ufuncs[node.op]
+            operand = ExpressionCompiler._build(node.operand)
+            return lambda x: ufunc(operand(x))
+
+        if isinstance(node, FunctionCall):
+            ufunc = ExpressionCompiler.function_ufuncs[node.name]
+            argument = ExpressionCompiler._build(node.argument)
+            return lambda x: ufunc(argument(x))
+
+        if isinstance(node, BinaryOp):
+            ufunc = ExpressionCompiler.binary_ufuncs[node.op]
+            # Bind folded constants directly instead of calling a closure for them
+            if isinstance(node.left, Number):
+                constant = np.float64(node.left.value)
+                right = ExpressionCompiler._build(node.right)
+                return lambda x: ufunc(constant, right(x))
+            if isinstance(node.right, Number):
+                constant = np.float64(node.right.value)
+                left = ExpressionCompiler._build(node.left)
+                return lambda x: ufunc(left(x), constant)
+            left = ExpressionCompiler._build(node.left)
+            right = ExpressionCompiler._build(node.right)
+            return lambda x: ufunc(left(x), right(x))
+
+        raise TypeError(f"Cannot compile node {node!r}")
@@ -1,5 +1,9 @@
+import os
+
 import ply.lex as lex
 
+from src.function_solver.utils.instrumentation import Instrumentation
+
 
 class ExpressionLexer:
     """
@@ -31,11 +35,14 @@ class ExpressionLexer:
     t_SQRT = r'sqrt'  # Regular expression for the SQRT token
     t_ignore = ' \t'  # Ignore whitespace characters
 
-    def __init__(self):
+    def __init__(self, prebuilt: bool = True):
         """
             Initializes the lexer. This sets up the lexer and initializes an empty list to store errors.
+
+            :param prebuilt: Load the packaged `lextab` module instead of generating the master regex at runtime.
         """
         self.errors = []  # List to store any errors encountered during tokenization
+        self.prebuilt = prebuilt
         self.lexer = self.build()  # Build the lexer
 
     def t_VARIABLE(self, t):
@@ -61,16 +68,31 @@ class ExpressionLexer:
 
     def build(self, **kwargs):
         self.errors = []  # Reset the errors list
+        if self.prebuilt:
+            from src.function_solver.core import lextab
+            # Optimized mode reads the tables as-is and never writes them back
+            kwargs.setdefault('optimize', True)
+            kwargs.setdefault('lextab', lextab)
         self.lexer = lex.lex(module=self, **kwargs)  # Build the lexer using the current module
         return self.lexer
 
+    @staticmethod
+    def generate_tables(outputdir: str = os.path.dirname(__file__)) -> None:
+        """
+            Regenerates the packaged `lextab` module. Run this after changing any token rule.
+
+            :param outputdir: The directory to write `lextab.py` to, defaults to this package.
+        """
+        ExpressionLexer(prebuilt=False).lexer.writetab('lextab', outputdir)
+
     def tokenize(self, data):
         self.errors = []  # Reset the errors list
-        self.lexer.input(data)  # Provide the input data to the lexer
-        tokens = []  # List to store the token types
-        while True:
-            tok = self.lexer.token()  # Get the next token
-            if not tok:
-                break  # If no more tokens, exit the loop
-            tokens.append(tok.type)  # Add the token type to the list
+        with Instrumentation.span('lexer.tokenize'):
+            self.lexer.input(data)  # Provide the input data to the lexer
+            tokens = []  # List to store the token types
+            while True:
+                tok = self.lexer.token()  # Get the next token
+                if not tok:
+                    break  # If no more tokens, exit the loop
+                tokens.append(tok.type)  # Add the token type to the list
         return tokens, self.errors # Return the list of tokens and any errors
@@ -1,22 +1,50 @@
+import os
+import threading
+
 from ply.yacc import yacc
+from src.function_solver.core.expression_ast import BinaryOp, FunctionCall, Number, UnaryOp, Variable
 from src.function_solver.core.expression_lexer import ExpressionLexer
+from src.function_solver.utils.instrumentation import Instrumentation
 
 
 class ExpressionParser:
     """
         A parser for mathematical expressions. This parser is built using the PLY (Python Lex-Yacc) library.
         It works in conjunction with the `ExpressionLexer` to validate and parse mathematical expressions.
-        The parser handles arithmetic operations, functions (log, sqrt), and variables.
+        The parser handles arithmetic operations, functions (log, sqrt), and variables, and builds an
+        immutable syntax tree (see `expression_ast`) that downstream stages reuse instead of re-parsing the text.
     """
-    def __init__(self):
+    _local = threading.local()  # Holds the per-thread instance returned by `shared()`
+    # Not importable, so PLY cannot find the packaged tables under it and generates them instead; when writing,
+    # only the last part names the file
+    RUNTIME_TABMODULE = '_function_solver_runtime.parsetab'
+
+    def __init__(self, prebuilt: bool = True):
         """
             Initializes the parser. This sets up the lexer, defines the tokens, and initializes an empty list to store errors.
+
+            :param prebuilt: Load the packaged `parsetab`/`lextab` modules instead of generating the LALR tables
+                             and the lexer regex at runtime.
         """
-        self.lexer_obj = ExpressionLexer()  # Create an instance of the ExpressionLexer
+        self.prebuilt = prebuilt
+        self.lexer_obj = ExpressionLexer(prebuilt)  # Create an instance of the ExpressionLexer
         self.tokens = self.lexer_obj.tokens
         self.errors = []
         self.parser = self.build()
 
+    @classmethod
+    def shared(cls) -> 'ExpressionParser':
+        """
+            Returns the process-wide parser for the calling thread. Parsers keep per-call state,
+            so each thread gets its own instance, created once on first use.
+
+            :return: The shared `ExpressionParser` for the current thread.
+        """
+        parser = getattr(cls._local, 'parser', None)
+        if parser is None:
+            parser = cls._local.parser = cls()
+        return parser
+
     precedence = (
         ('left', 'PLUS', 'MINUS'),
         ('left', 'TIMES', 'DIVIDE'),
@@ -30,7 +58,7 @@ class ExpressionParser:
                   | expression PLUS term
                   | expression MINUS term
         '''
-        pass
+        p[0] = p[1] if len(p) == 2 else BinaryOp(p[2], p[1], p[3])
 
     def p_term(self, p):
         '''
@@ -38,7 +66,7 @@ class ExpressionParser:
              | term TIMES factor
              | term DIVIDE factor
         '''
-        pass
+        p[0] = p[1] if len(p) == 2 else BinaryOp(p[2], p[1], p[3])
 
     def p_factor(self, p):
         '''
@@ -46,23 +74,34 @@ class ExpressionParser:
                | LOG LPAREN expression RPAREN
                | SQRT LPAREN expression RPAREN
         '''
-        pass
+        p[0] = p[1] if len(p) == 2 else FunctionCall(p[1], p[3])
 
     def p_power(self, p):
         '''
         power : atom
               | atom POWER power
+              | MINUS power %prec UMINUS
         '''
-        pass
+        # Unary minus binds looser than `^`, so `-x^2` is `-(x^2)` and `2^-x` is `2^(-x)`
+        if len(p) == 2:
+            p[0] = p[1]
+        elif len(p) == 3:
+            p[0] = UnaryOp(p[1], p[2])
+        else:
+            p[0] = BinaryOp('^', p[1], p[3])
 
     def p_atom(self, p):
         '''
         atom : NUMBER
              | VARIABLE
              | LPAREN expression RPAREN
-             | MINUS atom %prec UMINUS
         '''
-        pass
+        if len(p) == 4:
+            p[0] = p[2]
+        elif p.slice[1].type == 'NUMBER':
+            p[0] = Number(float(p[1]))
+        else:
+            p[0] = Variable(p[1])
 
     def p_error(self, p):
         if p:
@@ -71,25 +110,60 @@ class ExpressionParser:
             self.errors.append("Syntax error at end of expression")
 
     def build(self, **kwargs):
-        self.lexer = self.lexer_obj.build()
+        self.lexer = self.lexer_obj.lexer  # Reuse the lexer the ExpressionLexer already built
+        kwargs.setdefault('debug', False)
+        kwargs.setdefault('write_tables', False)
+        if self.prebuilt:
+            from src.function_solver.core import parsetab
+            # Optimized mode trusts the packaged tables and skips grammar validation
+            kwargs.setdefault('optimize', True)
+            kwargs.setdefault('tabmodule', parsetab)
+        else:
+            kwargs.setdefault('tabmodule', self.RUNTIME_TABMODULE)
+            kwargs.setdefault('outputdir', os.path.dirname(__file__))  # Otherwise PLY imports the tabmodule's package
         parser = yacc(module=self, **kwargs)
         return parser
 
+    @staticmethod
+    def generate_tables(outputdir: str = os.path.dirname(__file__)) -> None:
+        """
+            Regenerates the packaged `parsetab` and `lextab` modules. Run this after changing the grammar
+            or any token rule (`python -m src.function_solver.core.expression_parser`).
+
+            :param outputdir: The directory to write the table modules to, defaults to this package.
+        """
+        ExpressionLexer.generate_tables(outputdir)
+        ExpressionParser(prebuilt=False).build(outputdir=outputdir, write_tables=True)
+
     def validate(self, expression):
-        self.errors = []
+        """
+            Validates an expression and builds its syntax tree in a single lex + parse pass.
 
-        # First, validate tokens using the lexer object's method
-        tokens, lexer_errors = self.lexer_obj.tokenize(expression)
-        self.errors.extend(lexer_errors)
+            :param expression: The expression to validate (e.g., "x^2 + log(x)").
+            :return: A dictionary with `is_valid`, the list of `errors` and the parsed `ast`
+                     (an `expression_ast.Node`, or None when the expression is invalid).
+        """
+        self.errors = []
+        self.lexer_obj.errors = []  # The lexer reports invalid tokens while the parser pulls them
 
-        if not lexer_errors:
-            # Then validate syntax
+        with Instrumentation.span('parser.validate'):
             try:
-                self.parser.parse(expression)
+                ast = self.parser.parse(expression, lexer=self.lexer)
             except Exception as e:
                 self.errors.append(str(e))
+                ast = None
+
+        # Lexer errors take priority over the syntax errors they cause
+        if self.lexer_obj.errors:
+            self.errors = list(self.lexer_obj.errors)
 
+        is_valid = len(self.errors) == 0
         return {
-            'is_valid': len(self.errors) == 0,
+            'is_valid': is_valid,
             'errors': self.errors,
-        }
\ No newline at end of file
+            'ast': ast if is_valid else None,
+        }
+
+
+if __name__ == '__main__':
+    ExpressionParser.generate_tables()
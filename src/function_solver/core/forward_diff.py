@@ -0,0 +1,218 @@
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from src.function_solver.core.expression_ast import BinaryOp, FunctionCall, Node, Number, UnaryOp, Variable
+from src.function_solver.core.expression_compiler import ExpressionCompiler
+
+
+class Dual(NamedTuple):
+    """
+        A dual number over NumPy arrays: the values of an expression and of its derivative with respect to `x`.
+
+        Attributes:
+            value (np.ndarray): The values of the expression.
+            derivative (np.ndarray): The values of its derivative, same shape.
+    """
+    value: np.ndarray
+    derivative: np.ndarray
+
+
+DualKernel = Callable[[np.ndarray], Dual]
+
+
+class ForwardDiff:
+    """
+        Forward-mode automatic differentiation of parsed expressions (see `expression_ast`). A syntax tree is
+        compiled, like `ExpressionCompiler.compile` does, into nested closures over NumPy ufuncs, except that every
+        closure carries a `Dual` pair, so a single vectorized pass gives both the function and its derivative,
+        exact up to rounding, without SymPy.
+
+        Domain edges follow the values of the function:
+            - Where the function is undefined (NaN, e.g. `log(-1)` or `sqrt(-1)`), so is the derivative.
+            - Where the function is defined but not differentiable with a vertical tangent, the derivative is
+              infinite (e.g. `sqrt(x)` at 0 gives +inf), as is the derivative next to a pole.
+            - Where the derivative has no real value although the function has one (e.g. `(-2)^x`), it is NaN.
+    """
+
+    @staticmethod
+    def compile(node: Node) -> DualKernel:
+        """
+            Compiles a syntax tree into a reusable callable giving the values of the expression and of its
+            derivative. Kernels are cached per expression by `ExpressionCache`.
+
+            :param node: The root of the syntax tree to differentiate.
+            :return: A function that takes an array of `x` values and returns a `Dual` of two float64 arrays of
+                     the same shape, without raising warnings.
+        """
+        folded = ExpressionCompiler.fold_constants(node)
+
+        if isinstance(folded, Number):
+            value = folded.value
+
+            def constant_kernel(x):
+                shape = np.shape(x)
+                return Dual(np.full(shape, value, dtype=np.float64), np.zeros(shape, dtype=np.float64))
+            return constant_kernel
+
+        evaluate = ForwardDiff._build(folded)
+
+        def kernel(x):
+            x = np.asarray(x, dtype=np.float64)
+            with np.errstate(all='ignore'):
+                value, derivative = evaluate(x)
+                value = x.copy() if value is x else np.asarray(value, dtype=np.float64)
+                derivative = np.array(np.broadcast_to(derivative, x.shape), dtype=np.float64)
+            derivative[np.isnan(value)] = np.nan
+            return Dual(value, derivative)
+        return kernel
+
+    @staticmethod
+    def _build(node: Node) -> DualKernel:
+        """Recursively turns a folded tree into nested closures over `Dual` pairs."""
+        if isinstance(node, Variable):
+            return lambda x: Dual(x, np.ones_like(x))
+
+        if isinstance(node, UnaryOp):
+            operand = ForwardDiff._build(node.operand)
+
+            def negative(x):
+                u, du = operand(x)
+                return Dual(-u, -du)
+            return negative
+
+        if isinstance(node, FunctionCall):
+            argument = ForwardDiff._build(node.argument)
+            if node.name == 'log':
+                def log(x):
+                    u, du = argument(x)
+                    return Dual(np.log(u), du / u)
+                return log
+            if node.name == 'sqrt':
+                def sqrt(x):
+                    u, du = argument(x)
+                    root = np.sqrt(u)
+                    return Dual(root, du / (2 * root))
+                return sqrt
+            raise TypeError(f"Cannot differentiate function {node.name!r}")
+
+        if isinstance(node, BinaryOp):
+            # Bind folded constants directly, which also keeps `0 * inf` out of their derivatives
+            if isinstance(node.left, Number):
+                return ForwardDiff._constant_left(node.op, np.float64(node.left.value), ForwardDiff._build(node.right))
+            if isinstance(node.right, Number):
+                return ForwardDiff._constant_right(node.op, ForwardDiff._build(node.left), np.float64(node.right.value))
+            return ForwardDiff._binary(node.op, ForwardDiff._build(node.left), ForwardDiff._build(node.right))
+
+        raise TypeError(f"Cannot differentiate node {node!r}")
+
+    @staticmethod
+    def _constant_left(op: str,
+                       constant: np.float64,
+                       right: DualKernel
+                       ) -> DualKernel:
+        """Differentiates `constant <op> right`."""
+        if op == '+':
+            return lambda x: _shift(right(x), constant)
+        if op == '-':
+            def subtract(x):
+                v, dv = right(x)
+                return Dual(constant - v, -dv)
+            return subtract
+        if op == '*':
+            def multiply(x):
+                v, dv = right(x)
+                return Dual(constant * v, constant * dv)
+            return multiply
+        if op == '/':
+            def divide(x):
+                v, dv = right(x)
+                quotient = constant / v
+                return Dual(quotient, -quotient * dv / v)
+            return divide
+        if op == '^':
+            log_base = np.log(constant) if constant > 0 else np.float64(np.nan)
+
+            def power(x):
+                v, dv = right(x)
+                value = np.power(constant, v)
+                if constant == 0:  # 0^v is flat wherever it is defined
+                    return Dual(value, np.zeros_like(value))
+                return Dual(value, value * log_base * dv)
+            return power
+        raise TypeError(f"Cannot differentiate operator {op!r}")
+
+    @staticmethod
+    def _constant_right(op: str,
+                        left: DualKernel,
+                        constant: np.float64
+                        ) -> DualKernel:
+        """Differentiates `left <op> constant`."""
+        if op in ('+', '-'):
+            offset = constant if op == '+' else -constant
+            return lambda x: _shift(left(x), offset)
+        if op == '*':
+            def multiply(x):
+                u, du = left(x)
+                return Dual(u * constant, du * constant)
+            return multiply
+        if op == '/':
+            def divide(x):
+                u, du = left(x)
+                return Dual(u / constant, du / constant)
+            return divide
+        if op == '^':
+            if constant == 0:
+                return lambda x: Dual(np.power(left(x).value, constant), np.zeros(np.shape(x)))
+            if constant == 1:
+                return left
+            exponent = constant - 1
+
+            def power(x):
+                u, du = left(x)
+                return Dual(np.power(u, constant), constant * np.power(u, exponent) * du)
+            return power
+        raise TypeError(f"Cannot differentiate operator {op!r}")
+
+    @staticmethod
+    def _binary(op: str,
+                left: DualKernel,
+                right: DualKernel
+                ) -> DualKernel:
+        """Differentiates `left <op> right` where both sides depend on `x`."""
+        if op == '+':
+            def add(x):
+                (u, du), (v, dv) = left(x), right(x)
+                return Dual(u + v, du + dv)
+            return add
+        if op == '-':
+            def subtract(x):
+                (u, du), (v, dv) = left(x), right(x)
+                return Dual(u - v, du - dv)
+            return subtract
+        if op == '*':
+            def multiply(x):
+                (u, du), (v, dv) = left(x), right(x)
+                return Dual(u * v, du * v + u * dv)
+            return multiply
+        if op == '/':
+            def divide(x):
+                (u, du), (v, dv) = left(x), right(x)
+                quotient = u / v
+                return Dual(quotient, (du - quotient * dv) / v)
+            return divide
+        if op == '^':
+            def power(x):
+                (u, du), (v, dv) = left(x), right(x)
+                value = np.power(u, v)
+                # d(u^v) = u^v * (v' log u + v u'/u); where v' vanishes this is the power rule, which also holds
+                # for negative bases with integer exponents, where log u is undefined
+                general = value * (dv * np.log(u) + v * du / u)
+                return Dual(value, np.where(dv == 0, v * np.power(u, v - 1) * du, general))
+            return power
+        raise TypeError(f"Cannot differentiate operator {op!r}")
+
+
+def _shift(dual: Dual, offset: np.float64) -> Dual:
+    """Adds a constant to a dual number, which leaves its derivative unchanged."""
+    return Dual(dual.value + offset, dual.derivative)
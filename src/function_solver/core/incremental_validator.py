@@ -0,0 +1,260 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from ply.yacc import YaccProduction, YaccSymbol
+
+from src.function_solver.core.expression_lexer import ExpressionLexer
+from src.function_solver.core.expression_parser import ExpressionParser
+from src.function_solver.utils.instrumentation import Instrumentation
+
+ParserStacks = Tuple[tuple, tuple]
+
+
+class LexState(NamedTuple):
+    """
+        The tokens of one input string and the parser stacks after each of them, kept to re-lex and re-parse only
+        what changed on the next keystroke.
+
+        Attributes:
+            text (str): The lexed text.
+            tokens (List): The PLY tokens, in order.
+            ends (List[int]): The end position of each token in the text.
+            errors (List[Tuple[int, str]]): The lexer errors, each with the position lexing resumed from when it was
+                                            raised (so an error is never kept without the text that caused it).
+            stacks (List[ParserStacks]): The `(states, symbols)` stacks of the LR parser after shifting the first
+                                         `k` tokens, for `k` from 0 up to the number of tokens parsed so far.
+    """
+    text: str
+    tokens: List
+    ends: List[int]
+    errors: List[Tuple[int, str]]
+    stacks: List[ParserStacks]
+
+
+class _ReplayLexer:
+    """Feeds already lexed tokens to the PLY parser in place of a lexer."""
+
+    def __init__(self, tokens: List):
+        self._tokens = iter(tokens)
+
+    def input(self, data: str) -> None:
+        pass
+
+    def token(self):
+        return next(self._tokens, None)
+
+
+class IncrementalValidator:
+    """
+        Validates expressions as they are typed. Results are cached per input string, and each input field
+        (identified by a key) keeps the tokens of its last text and the parser stacks after each token: when the
+        text changes, the tokens before the first changed character are reused, only the changed suffix is re-lexed,
+        and parsing resumes from the stacks saved after the last reused token. Typing at the end of a long expression
+        therefore costs about as much as a short one. The results are the same as those of `ExpressionParser.validate`.
+
+        Attributes:
+            hits (int): Validations answered from the cache.
+            misses (int): Validations that had to lex and parse.
+            relexed (int): Characters lexed so far, which shows how much of each input was reused.
+    """
+    # The token rules look at most this many characters past the end of a match (e.g., "2" in "2.(" becomes
+    # "2.1" in "2.1("), so tokens ending closer than this to a change are lexed again
+    LOOKAHEAD = 2
+
+    def __init__(self, maxsize: int = 256):
+        """
+            Initializes the validator.
+
+            :param maxsize: The maximum number of validation results to keep.
+        """
+        self.maxsize = maxsize
+        self._results: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._states: Dict[Hashable, LexState] = {}
+        self._lexer = ExpressionLexer()
+        self.hits = 0
+        self.misses = 0
+        self.relexed = 0
+
+    def validate(self,
+                 expression: str,
+                 key: Hashable = None
+                 ) -> Dict[str, Any]:
+        """
+            Validates an expression, reusing the cached result or the work done on the previous text of the same input.
+
+            :param expression: The expression to validate (e.g., "x^2 + log(x)").
+            :param key: Identifies the input the expression was typed in, e.g., the input field.
+            :return: A dictionary with `is_valid`, the list of `errors` and the parsed `ast`, as from
+                     `ExpressionParser.validate`.
+        """
+        previous = self._states.get(key)
+        result = self._results.get(expression)
+        if result is not None:
+            self._results.move_to_end(expression)
+            self.hits += 1
+            Instrumentation.count('validator.hits')
+            # Keep the input's tokens in step with its text, so the next keystroke re-lexes from here
+            if previous is None or previous.text != expression:
+                self._states[key] = self.lex(expression, previous)
+            return result
+        self.misses += 1
+        Instrumentation.count('validator.misses')
+
+        with Instrumentation.span('validator.validate'):
+            state = self.lex(expression, previous)
+            self._states[key] = state
+            result = self.parse(state)
+        self._results[expression] = result
+        while len(self._results) > max(self.maxsize, 0):
+            self._results.popitem(last=False)
+        return result
+
+    def forget(self, key: Hashable) -> None:
+        """
+            Drops the state kept for an input, e.g., when the input is removed.
+
+            :param key: The key the input was validated with.
+        """
+        self._states.pop(key, None)
+
+    def lex(self,
+            text: str,
+            previous: Optional[LexState] = None
+            ) -> LexState:
+        """
+            Lexes a text, reusing the tokens of a previous text up to the first changed character.
+
+            Tokens that end within `LOOKAHEAD` characters of the change are lexed again, since the change may
+            extend them (e.g., "lo" followed by "g", or "1" followed by "2").
+
+            :param text: The text to lex.
+            :param previous: The state of the previous text of the same input, if any.
+            :return: The `LexState` of the text, with the parser stacks of the reused tokens.
+        """
+        if previous is None:
+            tokens, ends, errors, stacks, resume = [], [], [], [], 0
+        else:
+            kept = bisect_right(previous.ends, self._common_prefix(previous.text, text) - self.LOOKAHEAD)
+            tokens, ends = previous.tokens[:kept], previous.ends[:kept]
+            resume = ends[-1] if ends else 0
+            errors = [error for error in previous.errors if error[0] < resume]
+            stacks = previous.stacks[:kept + 1]
+
+        lexer = self._lexer.lexer
+        lexer.input(text)
+        lexer.lexpos = resume
+        self._lexer.errors = []
+        while True:
+            start = lexer.lexpos
+            token = lexer.token()
+            if self._lexer.errors:
+                errors.extend((start, error) for error in self._lexer.errors)
+                self._lexer.errors = []
+            if not token:
+                break
+            tokens.append(token)
+            ends.append(lexer.lexpos)
+        self.relexed += len(text) - resume
+        return LexState(text, tokens, ends, errors, stacks)
+
+    @staticmethod
+    def parse(state: LexState) -> Dict[str, Any]:
+        """
+            Parses lexed tokens, resuming from the last saved parser stacks. The stacks after every newly shifted
+            token are added to the state.
+
+            :param state: The lexed text.
+            :return: The validation result, as from `ExpressionParser.validate`.
+        """
+        if state.errors:
+            # Lexer errors take priority over the syntax errors they cause
+            return {'is_valid': False, 'errors': [error for _, error in state.errors], 'ast': None}
+
+        parser = ExpressionParser.shared()
+        parser.errors = []
+        try:
+            ast = IncrementalValidator._resume(parser, state)
+        except SyntaxError:
+            # A syntax error before the end: let PLY parse from the start to report it with its error recovery
+            parser.errors = []
+            try:
+                ast = parser.parser.parse(state.text, lexer=_ReplayLexer(state.tokens))
+            except Exception as e:
+                parser.errors.append(str(e))
+                ast = None
+        except Exception as e:
+            parser.errors.append(str(e))
+            ast = None
+
+        errors = list(parser.errors)
+        is_valid = len(errors) == 0
+        return {
+            'is_valid': is_valid,
+            'errors': errors,
+            'ast': ast if is_valid else None,
+        }
+
+    @staticmethod
+    def _resume(parser: ExpressionParser, state: LexState):
+        """
+            Runs the LR automaton of the PLY parser over the tokens, starting from the last saved stacks.
+
+            :return: The parsed syntax tree, or None after reporting a syntax error at the end of the expression.
+            :raises SyntaxError: On a syntax error before the end of the expression.
+        """
+        lr = parser.parser
+        actions, goto, productions = lr.action, lr.goto, lr.productions
+        if not state.stacks:
+            start = YaccSymbol()
+            start.type = '$end'
+            state.stacks.append(((0,), (start,)))
+        index = len(state.stacks) - 1
+        states, symbols = (list(stack) for stack in state.stacks[index])
+
+        end = YaccSymbol()
+        end.type = '$end'
+        production = YaccProduction(None)
+        production.parser = lr
+        production.stack = symbols
+        while True:
+            lookahead = state.tokens[index] if index < len(state.tokens) else end
+            action = actions[states[-1]].get(lookahead.type)
+            if action is None:
+                if lookahead is not end:
+                    raise SyntaxError(lookahead.value)
+                parser.p_error(None)
+                return None
+            if action > 0:
+                # Shift, and save the stacks for the next edit
+                states.append(action)
+                symbols.append(lookahead)
+                index += 1
+                state.stacks.append((tuple(states), tuple(symbols)))
+            elif action < 0:
+                # Reduce by running the grammar rule
+                rule = productions[-action]
+                result = YaccSymbol()
+                result.type = rule.name
+                result.value = None
+                production.slice = [result] + (symbols[-rule.len:] if rule.len else [])
+                if rule.len:
+                    del symbols[-rule.len:]
+                    del states[-rule.len:]
+                rule.callable(production)
+                symbols.append(result)
+                states.append(goto[states[-1]][rule.name])
+            else:
+                return symbols[-1].value
+
+    @staticmethod
+    def _common_prefix(a: str, b: str) -> int:
+        """Returns the length of the common prefix of two strings, comparing slices in halving steps."""
+        low, high = 0, min(len(a), len(b))
+        while low < high:
+            middle = (low + high + 1) // 2
+            if a[low:middle] == b[low:middle]:
+                low = middle
+            else:
+                high = middle - 1
+        return low
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('DIVIDE', 'LOG', 'LPAREN', 'MINUS', 'NUMBER', 'PLUS', 'POWER', 'RPAREN', 'SQRT', 'TIMES', 'VARIABLE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_VARIABLE>[a-zA-Z][a-zA-Z0-9]*)|(?P<t_NUMBER>\\d*\\.?\\d+)|(?P<t_SQRT>sqrt)|(?P<t_LOG>log)|(?P<t_LPAREN>\\()|(?P<t_PLUS>\\+)|(?P<t_POWER>\\^)|(?P<t_RPAREN>\\))|(?P<t_TIMES>\\*)|(?P<t_DIVIDE>/)|(?P<t_MINUS>-)', [None, ('t_VARIABLE', 'VARIABLE'), ('t_NUMBER', 'NUMBER'), (None, 'SQRT'), (None, 'LOG'), (None, 'LPAREN'), (None, 'PLUS'), (None, 'POWER'), (None, 'RPAREN'), (None, 'TIMES'), (None, 'DIVIDE'), (None, 'MINUS')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -0,0 +1,229 @@
+import math
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.function_solver.core.domain_analysis import Interval
+from src.function_solver.core.expression_compiler import Kernel
+
+ScalarFunction = Callable[[float], float]
+
+
+class NumericSolver:
+    """
+        A numeric root finder for compiled expressions. The function is sampled over the whole interval in one
+        vectorized pass, candidate roots are located from sign changes and from near-zero local minima of |f|
+        (roots that touch zero without crossing it), and each candidate is refined to the requested tolerance
+        with Brent's bracketed method or a golden-section search. Given the function's domain, the samples that
+        would fall outside it are spent inside it instead.
+    """
+    GOLDEN_RATIO = (math.sqrt(5) - 1) / 2
+    MAX_REFINEMENT = 64  # Largest factor the grid is refined by when part of the interval is outside the domain
+
+    @staticmethod
+    def find_roots(function: Kernel,
+                   interval: Tuple[float, float],
+                   samples: int = 2001,
+                   tolerance: float = 1e-12,
+                   zero_tolerance: float = 1e-9,
+                   max_iterations: int = 100,
+                   domain: Optional[Sequence[Interval]] = None
+                   ) -> List[float]:
+        """
+            Finds the real roots of a vectorized function inside an interval.
+
+            :param function: A kernel taking an array of `x` values (e.g., from `ExpressionCompiler.compile`).
+            :param interval: The `(lower, upper)` bounds to search.
+            :param samples: The number of points sampled across the interval to bracket the roots.
+            :param tolerance: The absolute tolerance on the position of each root.
+            :param zero_tolerance: How close to zero |f| must get at a local minimum to count as a root.
+            :param max_iterations: The iteration limit for refining a single root.
+            :param domain: The intervals where the function is defined (see `DomainAnalyzer`), if known.
+            :return: The roots found, sorted in increasing order.
+        """
+        lower, upper = interval
+        x = np.linspace(lower, upper, samples)
+        if domain is not None:
+            x = NumericSolver.restrict_grid(x, domain)
+            if x.size == 0:
+                return []
+        y = function(x)
+        if domain is not None:
+            x, y = NumericSolver._break_gaps(x, y, (upper - lower) / max(samples - 1, 1))
+        scalar = NumericSolver._scalar(function)
+
+        finite = np.isfinite(y)
+        if not np.any(y[finite]):
+            return []  # Identically zero (or undefined) everywhere: no isolated roots to report
+        roots = list(x[finite & (y == 0)])
+
+        # Sign changes between consecutive finite samples bracket a root (or a pole, rejected below)
+        crossings = np.flatnonzero(finite[:-1] & finite[1:] & (np.sign(y[:-1]) * np.sign(y[1:]) < 0))
+        for i in crossings:
+            root = NumericSolver.brent(scalar, x[i], x[i + 1], y[i], y[i + 1], tolerance, max_iterations)
+            if abs(scalar(root)) <= max(abs(y[i]), abs(y[i + 1])):
+                roots.append(root)
+
+        # Interior local minima of |f| that do not cross zero may still touch it (e.g., x^2 at 0)
+        magnitude = np.where(finite, np.abs(y), np.inf)
+        minima = np.flatnonzero((magnitude[1:-1] < magnitude[:-2]) & (magnitude[1:-1] <= magnitude[2:])
+                                & (magnitude[1:-1] > 0) & (np.sign(y[:-2]) == np.sign(y[2:]))) + 1
+        for i in minima:
+            root = NumericSolver.golden_section(lambda value: abs(scalar(value)), x[i - 1], x[i + 1],
+                                                tolerance, max_iterations)
+            if abs(scalar(root)) <= zero_tolerance:
+                roots.append(root)
+
+        return NumericSolver._deduplicate(sorted(float(root) for root in roots), max(tolerance, 1e-9))
+
+    @staticmethod
+    def restrict_grid(x: np.ndarray, domain: Sequence[Interval]) -> np.ndarray:
+        """
+            Drops the grid segments outside a domain and refines the others by a common integer factor, so that
+            about as many points as before lie where the function is defined. Every original grid point of a kept
+            segment stays in the grid, so no root the full grid brackets is lost.
+
+            :param x: The evenly spaced grid.
+            :param domain: The sorted, disjoint intervals where the function is defined.
+            :return: The restricted, refined grid in increasing order (empty if no segment meets the domain).
+        """
+        if x.size < 2 or not domain:
+            return x[:0]
+        lows = np.array([low for low, _ in domain])
+        highs = np.array([high for _, high in domain])
+        # A segment meets the domain if the first piece not entirely left of it starts before its right end
+        piece = np.searchsorted(highs, x[:-1], 'left')
+        meets = piece < lows.size
+        meets[meets] &= lows[piece[meets]] <= x[1:][meets]
+        kept = np.flatnonzero(meets)
+        if kept.size == 0:
+            return x[:0]
+        if kept.size == x.size - 1:
+            return x
+        factor = min(max((x.size - 1) // kept.size, 1), NumericSolver.MAX_REFINEMENT)
+        left, width = x[kept], x[kept + 1] - x[kept]
+        refined = (left[:, None] + width[:, None] * (np.arange(factor) / factor)).ravel()
+        return np.unique(np.concatenate([refined, x[kept + 1]]))
+
+    @staticmethod
+    def _break_gaps(x: np.ndarray, y: np.ndarray, step: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Inserts a NaN sample inside every gap of a restricted grid so no bracket spans the gap."""
+        gaps = np.flatnonzero(np.diff(x) > 1.5 * step)
+        if gaps.size == 0:
+            return x, y
+        return np.insert(x, gaps + 1, (x[gaps] + x[gaps + 1]) / 2), np.insert(y, gaps + 1, np.nan)
+
+    @staticmethod
+    def brent(function: ScalarFunction,
+              lower: float,
+              upper: float,
+              f_lower: float,
+              f_upper: float,
+              tolerance: float = 1e-12,
+              max_iterations: int = 100
+              ) -> float:
+        """
+            Refines a bracketed root with Brent's method (inverse quadratic interpolation and secant steps,
+            falling back to bisection), which always stays inside the bracket.
+
+            :param function: The scalar function whose root is bracketed.
+            :param lower: The lower end of the bracket.
+            :param upper: The upper end of the bracket.
+            :param f_lower: The function value at `lower`.
+            :param f_upper: The function value at `upper`; its sign must differ from `f_lower`.
+            :param tolerance: The absolute tolerance on the root position.
+            :param max_iterations: The maximum number of iterations.
+            :return: The refined root.
+        """
+        x_prev, x_cur = float(lower), float(upper)
+        f_prev, f_cur = float(f_lower), float(f_upper)
+        x_block = f_block = step_prev = step_cur = 0.0
+        relative_tolerance = 4 * np.finfo(float).eps
+
+        if f_prev == 0:
+            return x_prev
+        if f_cur == 0:
+            return x_cur
+
+        for _ in range(max_iterations):
+            if (f_prev > 0) != (f_cur > 0):
+                x_block, f_block = x_prev, f_prev
+                step_prev = step_cur = x_cur - x_prev
+            if abs(f_block) < abs(f_cur):
+                x_prev, x_cur, x_block = x_cur, x_block, x_cur
+                f_prev, f_cur, f_block = f_cur, f_block, f_cur
+
+            delta = (tolerance + relative_tolerance * abs(x_cur)) / 2
+            bisect = (x_block - x_cur) / 2
+            if f_cur == 0 or abs(bisect) < delta:
+                return x_cur
+
+            if abs(step_prev) > delta and abs(f_cur) < abs(f_prev):
+                if x_prev == x_block:
+                    # Secant step
+                    trial = -f_cur * (x_cur - x_prev) / (f_cur - f_prev)
+                else:
+                    # Inverse quadratic interpolation
+                    d_prev = (f_prev - f_cur) / (x_prev - x_cur)
+                    d_block = (f_block - f_cur) / (x_block - x_cur)
+                    trial = -f_cur * (f_block * d_block - f_prev * d_prev) / (d_block * d_prev * (f_block - f_prev))
+                if 2 * abs(trial) < min(abs(step_prev), 3 * abs(bisect) - delta):
+                    step_prev, step_cur = step_cur, trial
+                else:
+                    step_prev = step_cur = bisect
+            else:
+                step_prev = step_cur = bisect
+
+            x_prev, f_prev = x_cur, f_cur
+            x_cur += step_cur if abs(step_cur) > delta else math.copysign(delta, bisect)
+            f_cur = function(x_cur)
+            if not math.isfinite(f_cur):
+                return x_prev
+
+        return x_cur
+
+    @staticmethod
+    def golden_section(function: ScalarFunction,
+                       lower: float,
+                       upper: float,
+                       tolerance: float = 1e-12,
+                       max_iterations: int = 100
+                       ) -> float:
+        """
+            Finds the minimum of a unimodal scalar function on an interval by golden-section search.
+
+            :param function: The function to minimize.
+            :param lower: The lower end of the interval.
+            :param upper: The upper end of the interval.
+            :param tolerance: The absolute tolerance on the position of the minimum.
+            :param max_iterations: The maximum number of iterations.
+            :return: The position of the minimum.
+        """
+        a, b = float(lower), float(upper)
+        c = b - NumericSolver.GOLDEN_RATIO * (b - a)
+        d = a + NumericSolver.GOLDEN_RATIO * (b - a)
+        f_c, f_d = function(c), function(d)
+        for _ in range(max_iterations):
+            if abs(b - a) <= tolerance:
+                break
+            if f_c < f_d:
+                b, d, f_d = d, c, f_c
+                c = b - NumericSolver.GOLDEN_RATIO * (b - a)
+                f_c = function(c)
+            else:
+                a, c, f_c = c, d, f_d
+                d = a + NumericSolver.GOLDEN_RATIO * (b - a)
+                f_d = function(d)
+        return (a + b) / 2
+
+    @staticmethod
+    def _scalar(function: Kernel) -> ScalarFunction:
+        return lambda value: float(function(np.float64(value)))
+
+    @staticmethod
+    def _deduplicate(roots: List[float], tolerance: float) -> List[float]:
+        unique = []
+        for root in roots:
+            if not unique or root - unique[-1] > tolerance * max(1.0, abs(root)):
+                unique.append(root)
+        return unique
@@ -0,0 +1,158 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.function_solver.core.adaptive_sampler import SampledCurve
+from src.function_solver.core.expression_ast import Node
+from src.function_solver.core.expression_cache import ExpressionCache
+from src.function_solver.core.expression_compiler import ExpressionCompiler, Kernel
+from src.function_solver.core.solver_pool import SolverPool
+from src.function_solver.utils.instrumentation import Instrumentation
+
+
+class ParallelSampler:
+    """
+        Samples an expression densely on a uniform grid, splitting the grid across the worker processes of a
+        `SolverPool`. Each worker is sent the constant-folded syntax tree (never expression text to evaluate),
+        compiles it into a kernel once, and writes its slice of the grid and of the values straight into a shared
+        memory buffer, so the samples are never pickled on their way back. Every grid point is computed from its
+        index alone and the kernels work element by element, so the result is identical to the bit to sampling
+        in a single process, whatever the number of workers.
+
+        Expressions outside the parser's grammar (evaluated through SymPy, see `ExpressionCache`) and grids too
+        small to be worth a process round trip are sampled in this process. `evaluate` samples one slice of a grid
+        the same way, so a very dense grid can also be worked through in slices of bounded memory (see
+        `CurveExporter`).
+    """
+    MIN_CHUNK = 1 << 15  # Fewest grid points worth sending to a worker
+
+    @staticmethod
+    def grid(interval: Tuple[float, float],
+             samples: int,
+             start: int = 0,
+             stop: Optional[int] = None
+             ) -> np.ndarray:
+        """
+            Returns a slice of the uniform grid of `samples` points over an interval, both ends included.
+
+            :param interval: The `(lower, upper)` x-range.
+            :param samples: The number of grid points, at least 2.
+            :param start: The index of the first point of the slice.
+            :param stop: The index past the last point of the slice, defaults to `samples`.
+            :return: The grid points `start` to `stop`.
+        """
+        if samples < 2:
+            raise ValueError(f"At least 2 samples are needed, got {samples}")
+        stop = samples if stop is None else stop
+        lower, upper = interval
+        x = lower + np.arange(start, stop) * ((upper - lower) / (samples - 1))
+        if stop == samples and stop > start:
+            x[-1] = upper  # Land exactly on the end, whatever the rounding of the step
+        return x
+
+    @staticmethod
+    def sample(expression: str,
+               interval: Tuple[float, float],
+               samples: int,
+               processes: Optional[int] = None,
+               pool: Optional[SolverPool] = None
+               ) -> SampledCurve:
+        """
+            Evaluates an expression on a uniform grid.
+
+            :param expression: The expression string (e.g., "log(sqrt(x^2 + 1) + 1) / sqrt(x + 1)").
+            :param interval: The `(lower, upper)` x-range.
+            :param samples: The number of grid points, at least 2.
+            :param processes: The number of worker processes to use, defaults to the size of the pool. 1 samples
+                              in this process.
+            :param pool: The pool whose workers sample the grid, defaults to the shared `SolverPool`.
+            :return: A `SampledCurve` with the grid, the values (NaN outside the domain), no poles and `samples`
+                     evaluations.
+        """
+        x, y = ParallelSampler.evaluate(expression, interval, samples, processes=processes, pool=pool)
+        return SampledCurve(x, y, [], samples)
+
+    @staticmethod
+    def evaluate(expression: str,
+                 interval: Tuple[float, float],
+                 samples: int,
+                 start: int = 0,
+                 stop: Optional[int] = None,
+                 processes: Optional[int] = None,
+                 pool: Optional[SolverPool] = None
+                 ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+            Evaluates an expression on a slice of a uniform grid, split across the workers when the slice is large
+            enough (at least `MIN_CHUNK` points per worker).
+
+            :param expression: The expression string.
+            :param interval: The `(lower, upper)` x-range of the whole grid.
+            :param samples: The number of points of the whole grid, at least 2.
+            :param start: The index of the first point of the slice.
+            :param stop: The index past the last point of the slice, defaults to `samples`.
+            :param processes: The number of worker processes to use, defaults to the size of the pool. 1 samples
+                              in this process.
+            :param pool: The pool whose workers sample the slice, defaults to the shared `SolverPool`.
+            :return: The grid points of the slice and the values there (NaN outside the domain).
+        """
+        stop = samples if stop is None else stop
+        count = stop - start
+        entry = ExpressionCache.shared().get(expression)
+        pool = pool or SolverPool.shared()
+        workers = min(processes or pool.processes, count // ParallelSampler.MIN_CHUNK)
+        if entry.ast is None or workers <= 1:
+            with Instrumentation.span('sampler.dense'):
+                x = ParallelSampler.grid(interval, samples, start, stop)
+                return x, entry.kernel(x)
+
+        tree = ExpressionCompiler.fold_constants(entry.ast)
+        bounds = np.linspace(start, stop, workers + 1).astype(int).tolist()
+        memory = shared_memory.SharedMemory(create=True, size=2 * count * np.dtype(np.float64).itemsize)
+        try:
+            with Instrumentation.span('sampler.parallel'), ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(pool.run, _sample_chunk, memory.name, tree, interval, samples,
+                                           (start, stop), low, high)
+                           for low, high in zip(bounds[:-1], bounds[1:])]
+                for future in futures:
+                    future.result()
+            shared = np.ndarray((2, count), dtype=np.float64, buffer=memory.buf)
+            x, y = shared.copy()
+            del shared  # The buffer cannot be closed while an array still points into it
+        finally:
+            memory.close()
+            memory.unlink()
+        Instrumentation.count('sampler.parallel_chunks', workers)
+        return x, y
+
+
+@functools.lru_cache(maxsize=64)
+def _kernel(tree: Node) -> Kernel:
+    """Compiles a tree once per worker process; trees are hashable, and the same one is sent for every chunk."""
+    return ExpressionCompiler.compile(tree)
+
+
+def _sample_chunk(name: str,
+                  tree: Node,
+                  interval: Tuple[float, float],
+                  samples: int,
+                  buffered: Tuple[int, int],
+                  start: int,
+                  stop: int
+                  ) -> None:
+    """
+        Samples grid points `start` to `stop` into the shared buffer `name`, whose rows are the grid and the values
+        of the points in the `buffered` `(start, stop)` slice. Module-level so `SolverPool` workers can run it.
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        offset, count = buffered[0], buffered[1] - buffered[0]
+        shared = np.ndarray((2, count), dtype=np.float64, buffer=memory.buf)
+        x = ParallelSampler.grid(interval, samples, start, stop)
+        shared[0, start - offset:stop - offset] = x
+        shared[1, start - offset:stop - offset] = _kernel(tree)(x)
+        del shared
+    finally:
+        memory.close()
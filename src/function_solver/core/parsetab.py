@@ -0,0 +1,45 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftPLUSMINUSleftTIMESDIVIDErightPOWERrightUMINUSDIVIDE LOG LPAREN MINUS NUMBER PLUS POWER RPAREN SQRT TIMES VARIABLE\n        expression : term\n                  | expression PLUS term\n                  | expression MINUS term\n        \n        term : factor\n             | term TIMES factor\n             | term DIVIDE factor\n        \n        factor : power\n               | LOG LPAREN expression RPAREN\n               | SQRT LPAREN expression RPAREN\n        \n        power : atom\n              | atom POWER power\n              | MINUS power %prec UMINUS\n        \n        atom : NUMBER\n             | VARIABLE\n             | LPAREN expression RPAREN\n        '
+    
+_lr_action_items = {'LOG':([0,7,12,13,14,15,17,19,],[6,6,6,6,6,6,6,6,]),'SQRT':([0,7,12,13,14,15,17,19,],[8,8,8,8,8,8,8,8,]),'MINUS':([0,1,2,3,4,5,7,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,],[3,13,-1,3,-4,-7,3,-10,-13,-14,3,3,3,3,-12,3,13,3,3,-2,-3,-5,-6,13,-15,13,-11,-8,-9,]),'NUMBER':([0,3,7,12,13,14,15,17,19,20,],[10,10,10,10,10,10,10,10,10,10,]),'VARIABLE':([0,3,7,12,13,14,15,17,19,20,],[11,11,11,11,11,11,11,11,11,11,]),'LPAREN':([0,3,6,7,8,12,13,14,15,17,19,20,],[7,7,17,7,19,7,7,7,7,7,7,7,]),'$end':([1,2,4,5,9,10,11,16,21,22,23,24,26,28,29,30,],[0,-1,-4,-7,-10,-13,-14,-12,-2,-3,-5,-6,-15,-11,-8,-9,]),'PLUS':([1,2,4,5,9,10,11,16,18,21,22,23,24,25,26,27,28,29,30,],[12,-1,-4,-7,-10,-13,-14,-12,12,-2,-3,-5,-6,12,-15,12,-11,-8,-9,]),'RPAREN':([2,4,5,9,10,11,16,18,21,22,23,24,25,26,27,28,29,30,],[-1,-4,-7,-10,-13,-14,-12,26,-2,-3,-5,-6,29,-15,30,-11,-8,-9,]),'TIMES':([2,4,5,9,10,11,16,21,22,23,24,26,28,29,30,],[14,-4,-7,-10,-13,-14,-12,14,14,-5,-6,-15,-11,-8,-9,]),'DIVIDE':([2,4,5,9,10,11,16,21,22,23,24,26,28,29,30,],[15,-4,-7,-10,-13,-14,-12,15,15,-5,-6,-15,-11,-8,-9,]),'POWER':([9,10,11,26,],[20,-13,-14,-15,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'expression':([0,7,17,19,],[1,18,25,27,]),'term':([0,7,12,13,17,19,],[2,2,21,22,2,2,]),'factor':([0,7,12,13,14,15,17,19,],[4,4,4,4,23,24,4,4,]),'power':([0,3,7,12,13,14,15,17,19,20,],[5,16,5,5,5,5,5,5,5,28,]),'atom':([0,3,7,12,13,14,15,17,19,20,],[9,9,9,9,9,9,9,9,9,9,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> expression","S'",1,None,None,None),
+  ('expression -> term','expression',1,'p_expression','expression_parser.py',53),
+  ('expression -> expression PLUS term','expression',3,'p_expression','expression_parser.py',54),
+  ('expression -> expression MINUS term','expression',3,'p_expression','expression_parser.py',55),
+  ('term -> factor','term',1,'p_term','expression_parser.py',61),
+  ('term -> term TIMES factor','term',3,'p_term','expression_parser.py',62),
+  ('term -> term DIVIDE factor','term',3,'p_term','expression_parser.py',63),
+  ('factor -> power','factor',1,'p_factor','expression_parser.py',69),
+  ('factor -> LOG LPAREN expression RPAREN','factor',4,'p_factor','expression_parser.py',70),
+  ('factor -> SQRT LPAREN expression RPAREN','factor',4,'p_factor','expression_parser.py',71),
+  ('power -> atom','power',1,'p_power','expression_parser.py',77),
+  ('power -> atom POWER power','power',3,'p_power','expression_parser.py',78),
+  ('power -> MINUS power','power',2,'p_power','expression_parser.py',79),
+  ('atom -> NUMBER','atom',1,'p_atom','expression_parser.py',91),
+  ('atom -> VARIABLE','atom',1,'p_atom','expression_parser.py',92),
+  ('atom -> LPAREN expression RPAREN','atom',3,'p_atom','expression_parser.py',93),
+]
@@ -0,0 +1,165 @@
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.function_solver.core.expression_ast import BinaryOp, FunctionCall, Node, Number, UnaryOp, Variable
+from src.function_solver.core.expression_compiler import ExpressionCompiler
+
+
+class PolynomialSolver:
+    """
+        Solves polynomial equations without SymPy. The coefficients are read off the syntax tree, the roots are the
+        eigenvalues of the companion matrix (`numpy.roots`), and the eigenvalues that are real up to a tolerance
+        are polished with Newton's method on the polynomial and kept if it vanishes there. An eigenvalue is taken
+        to be real when its imaginary part is within its rounding error bound (the size of the polynomial's terms
+        over its slope); when that bound is too wide to tell, as for multiple roots other than 0 or badly
+        conditioned ones, the polynomial is left to the general solvers.
+    """
+    MAX_DEGREE = 256
+    ERROR_FACTOR = 16  # Safety factor on the rounding error bound of an eigenvalue
+    ACCURACY = 1e-6  # Largest relative error bound of an eigenvalue that may be a real root
+    RESIDUAL_TOLERANCE = 1e-9  # Largest |p(r)|, relative to the size of its terms, for `r` to be a root
+    NEWTON_STEPS = 8
+    HORNER_STEPS = 3
+
+    @staticmethod
+    def coefficients(node: Node) -> Optional[np.ndarray]:
+        """
+            Reads the coefficients of an expression that is a polynomial in `x`: sums, products and differences
+            of polynomials, divisions by constants and non-negative integer powers.
+
+            :param node: The root of the syntax tree (e.g., of "(x - 1)*(x + 2)/2").
+            :return: The coefficients, highest degree first as `numpy.roots` takes them (e.g., [0.5, 0.5, -1]),
+                     or None if the expression is not a polynomial of degree at most `MAX_DEGREE`.
+        """
+        coefficients = PolynomialSolver._extract(ExpressionCompiler.fold_constants(node))
+        return None if coefficients is None else coefficients[::-1].copy()
+
+    @staticmethod
+    def subtract(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """
+            Subtracts two polynomials given by their coefficients, highest degree first.
+
+            :param first: The coefficients of the minuend.
+            :param second: The coefficients of the subtrahend.
+            :return: The coefficients of the difference.
+        """
+        size = max(first.size, second.size)
+        return np.pad(first, (size - first.size, 0)) - np.pad(second, (size - second.size, 0))
+
+    @staticmethod
+    def real_roots(coefficients: np.ndarray) -> Optional[List[float]]:
+        """
+            Finds the real roots of a polynomial.
+
+            :param coefficients: The coefficients, highest degree first.
+            :return: The distinct real roots in increasing order (empty for a constant, including 0), or None if
+                     the eigenvalues cannot tell which roots are real (e.g., a multiple root other than 0).
+        """
+        coefficients = np.asarray(coefficients, dtype=np.float64)
+        if coefficients.size == 0 or not np.all(np.isfinite(coefficients)):
+            return None
+        nonzero = np.flatnonzero(coefficients)
+        if nonzero.size == 0:
+            return []
+        roots = [0.0] if nonzero[-1] < coefficients.size - 1 else []  # Trailing zeros are the factor x^k
+        coefficients = coefficients[nonzero[0]:nonzero[-1] + 1]
+        if coefficients.size == 1:
+            return roots
+
+        eigenvalues = np.roots(coefficients)
+        with np.errstate(all='ignore'):
+            # A first-order bound on how far each eigenvalue may be from the exact root it approximates
+            value, slope, size = PolynomialSolver._evaluate(coefficients, eigenvalues)
+            error = PolynomialSolver.ERROR_FACTOR * np.finfo(float).eps * size / np.abs(slope)
+        ambiguous = np.abs(eigenvalues.imag) <= error
+        if np.any(ambiguous & ~(error <= PolynomialSolver.ACCURACY * np.maximum(np.abs(eigenvalues), 1))):
+            return None  # A multiple or ill-conditioned root that may or may not be real
+        candidates = eigenvalues[ambiguous].real
+
+        with np.errstate(all='ignore'):
+            for _ in range(PolynomialSolver.NEWTON_STEPS):
+                value, slope, size = PolynomialSolver._evaluate(coefficients, candidates)
+                step = np.where(slope != 0, value / slope, 0)
+                step = np.where(np.isfinite(step), step, 0)
+                candidates = candidates - step
+                if np.all(np.abs(step) <= 4 * np.finfo(float).eps * np.maximum(np.abs(candidates), 1)):
+                    break
+            value, slope, size = PolynomialSolver._evaluate(coefficients, candidates)
+        vanishes = np.abs(value) <= PolynomialSolver.RESIDUAL_TOLERANCE * size
+        # Finish with Horner's scheme, which is more accurate than summing the powers near a root
+        real = [PolynomialSolver._polish(coefficients.tolist(), root) for root in candidates[vanishes].tolist()]
+
+        unique = []
+        for root in sorted(roots + real):
+            if not unique or root - unique[-1] > 1e-12 * max(1.0, abs(root)):
+                unique.append(root)
+        return unique
+
+    @staticmethod
+    def _polish(coefficients: List[float], root: float) -> float:
+        """Takes Newton steps from a root evaluated with Horner's scheme, until the step vanishes."""
+        for _ in range(PolynomialSolver.HORNER_STEPS):
+            value = slope = 0.0
+            for coefficient in coefficients:
+                slope = slope * root + value
+                value = value * root + coefficient
+            if slope == 0 or not math.isfinite(value / slope) or value == 0:
+                break
+            root -= value / slope
+        return root
+
+    @staticmethod
+    def _evaluate(coefficients: np.ndarray, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the polynomial, its derivative and the sum of the magnitudes of its terms at each point."""
+        degrees = np.arange(coefficients.size - 1, -1, -1)
+        terms = x[:, None] ** degrees
+        derivative = terms[:, 1:] @ (coefficients[:-1] * degrees[:-1])
+        return terms @ coefficients, derivative, np.abs(terms) @ np.abs(coefficients)
+
+    @staticmethod
+    def _extract(node: Node) -> Optional[np.ndarray]:
+        """Returns the coefficients of a folded tree, lowest degree first, or None if it is not a polynomial."""
+        if isinstance(node, Number):
+            return np.array([node.value]) if np.isfinite(node.value) else None
+
+        if isinstance(node, Variable):
+            return np.array([0.0, 1.0])
+
+        if isinstance(node, UnaryOp):
+            operand = PolynomialSolver._extract(node.operand)
+            return None if operand is None else -operand
+
+        if isinstance(node, FunctionCall):
+            return None
+
+        if isinstance(node, BinaryOp):
+            left = PolynomialSolver._extract(node.left)
+            if left is None:
+                return None
+            if node.op == '^':
+                exponent = node.right.value if isinstance(node.right, Number) else -1.0
+                degree = max(left.size - 1, 1) * exponent
+                if not exponent.is_integer() or exponent < 0 or degree > PolynomialSolver.MAX_DEGREE:
+                    return None
+                power = np.array([1.0])
+                for _ in range(int(exponent)):
+                    power = np.convolve(power, left)
+                return power
+            right = PolynomialSolver._extract(node.right)
+            if right is None:
+                return None
+            if node.op in ('+', '-'):
+                size = max(left.size, right.size)
+                left, right = np.pad(left, (0, size - left.size)), np.pad(right, (0, size - right.size))
+                return left + right if node.op == '+' else left - right
+            if node.op == '*':
+                if left.size + right.size - 2 > PolynomialSolver.MAX_DEGREE:
+                    return None
+                return np.convolve(left, right)
+            if right.size == 1 and right[0] != 0:
+                return left / right[0]
+            return None
+
+        return None
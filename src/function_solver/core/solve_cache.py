@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.function_solver.core.expression_cache import ExpressionCache
+from src.function_solver.utils.instrumentation import Instrumentation
+
+ENV_VAR = 'FUNCTION_SOLVER_CACHE'  # Path of the SQLite file `SolveCache.shared` opens; unset disables the cache
+
+CachedSolve = Tuple[List, str, str]  # `(solutions, status, method)`, the fields of a `SolveResult`
+
+
+class SolveCache:
+    """
+        A persistent cache of solve results in a SQLite file, shared by every process and session that opens it.
+
+        Entries are keyed on a hash of the canonical form of both expressions (their syntax trees rendered back to
+        text, so "x^2+1" and "(x ^ 2) + 1" share an entry), the solver mode, the numeric interval and tolerance,
+        and `VERSION`. The file is opened in WAL mode, so readers never block each other or the writer, and every
+        write is a short transaction retried for up to `BUSY_TIMEOUT` seconds. Once more than `max_entries` are
+        stored, the least recently used ones are evicted. A cache that cannot be read or written (e.g., a locked or
+        corrupt file) behaves as if it were empty instead of failing the solve.
+
+        Attributes:
+            path (str): The SQLite file.
+            max_entries (int): The maximum number of entries kept.
+    """
+    VERSION = 1  # Bump whenever a solver change alters results, so entries written before it are ignored
+    MAX_ENTRIES = 100_000
+    BUSY_TIMEOUT = 10.0  # Seconds a write waits for another process's transaction to finish
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str, max_entries: int = MAX_ENTRIES):
+        """
+            Opens (and creates if needed) a cache file, dropping the entries of other versions.
+
+            :param path: The SQLite file.
+            :param max_entries: The maximum number of entries to keep.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        try:
+            with self._transaction() as connection:
+                connection.execute("CREATE TABLE IF NOT EXISTS solves ("
+                                   "key TEXT PRIMARY KEY, version INTEGER NOT NULL, result TEXT NOT NULL, "
+                                   "accessed REAL NOT NULL)")
+                connection.execute("CREATE INDEX IF NOT EXISTS solves_accessed ON solves (accessed)")
+                connection.execute("DELETE FROM solves WHERE version != ?", (self.VERSION,))
+        except sqlite3.Error:
+            Instrumentation.count('solve_cache.errors')
+
+    @classmethod
+    def shared(cls) -> Optional['SolveCache']:
+        """
+            Returns the process-wide cache used by `Solver`, at the path in the `FUNCTION_SOLVER_CACHE` environment
+            variable. Worker processes inherit the variable, so they share the same file.
+
+            :return: The shared `SolveCache`, or None if the variable is not set.
+        """
+        path = os.environ.get(ENV_VAR)
+        if not path:
+            return None
+        if cls._shared is None or cls._shared.path != path:
+            with cls._shared_lock:
+                if cls._shared is None or cls._shared.path != path:
+                    cls._shared = cls(path)
+        return cls._shared
+
+    @staticmethod
+    def key(function1: str,
+            function2: str,
+            mode: str,
+            interval: Sequence[float],
+            tolerance: float
+            ) -> str:
+        """
+            Returns the cache key of a solve.
+
+            :param function1: The first function string.
+            :param function2: The second function string.
+            :param mode: The solver mode.
+            :param interval: The `(lower, upper)` bounds searched by the numeric solver.
+            :param tolerance: The absolute tolerance on numeric roots.
+            :return: A SHA-256 hex digest.
+        """
+        canonical = [SolveCache.canonical(function1), SolveCache.canonical(function2), mode,
+                     [float(bound) for bound in interval], float(tolerance), SolveCache.VERSION]
+        return hashlib.sha256(json.dumps(canonical).encode()).hexdigest()
+
+    @staticmethod
+    def canonical(expression: str) -> str:
+        """
+            Returns the canonical text of an expression: its syntax tree rendered back to text, or its normalized
+            text if it is not in the parser's grammar.
+
+            :param expression: The expression string (e.g., "(x ^ 2) + 1").
+            :return: The canonical text (e.g., "x^2 + 1").
+        """
+        entry = ExpressionCache.shared().get(expression)
+        return entry.ast.to_string() if entry.ast is not None else entry.text
+
+    def get(self, key: str) -> Optional[CachedSolve]:
+        """
+            Looks up a solve and marks it as recently used.
+
+            :param key: The key from `SolveCache.key`.
+            :return: The cached `(solutions, status, method)`, or None on a miss.
+        """
+        try:
+            connection = self._connection()
+            row = connection.execute("SELECT result FROM solves WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                Instrumentation.count('solve_cache.misses')
+                return None
+            with self._transaction() as connection:
+                connection.execute("UPDATE solves SET accessed = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            Instrumentation.count('solve_cache.errors')
+            return None
+        Instrumentation.count('solve_cache.hits')
+        return self._decode(row[0])
+
+    def put(self, key: str, result: Sequence) -> None:
+        """
+            Stores a solve, evicting the least recently used entries beyond `max_entries`.
+
+            :param key: The key from `SolveCache.key`.
+            :param result: The `SolveResult` (or any `(solutions, status, method)` sequence) to store.
+        """
+        solutions, status, method = result
+        encoded = json.dumps({'solutions': [self._encode(solution) for solution in solutions],
+                              'status': status, 'method': method})
+        try:
+            with self._transaction() as connection:
+                connection.execute("INSERT OR REPLACE INTO solves (key, version, result, accessed) "
+                                   "VALUES (?, ?, ?, ?)", (key, self.VERSION, encoded, time.time()))
+                excess = connection.execute("SELECT COUNT(*) FROM solves").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    connection.execute("DELETE FROM solves WHERE key IN "
+                                       "(SELECT key FROM solves ORDER BY accessed LIMIT ?)", (excess,))
+        except sqlite3.Error:
+            Instrumentation.count('solve_cache.errors')
+
+    def clear(self) -> None:
+        """Drops every entry."""
+        try:
+            with self._transaction() as connection:
+                connection.execute("DELETE FROM solves")
+        except sqlite3.Error:
+            Instrumentation.count('solve_cache.errors')
+
+    def stats(self) -> Dict[str, Any]:
+        """
+            Returns the cache statistics.
+
+            :return: A dictionary with the `path`, the current `size`, the `max_entries` and the `version`.
+        """
+        return {'path': self.path, 'size': len(self), 'max_entries': self.max_entries, 'version': self.VERSION}
+
+    def close(self) -> None:
+        """Closes this thread's connection; it is reopened on the next use."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def __len__(self):
+        try:
+            return self._connection().execute("SELECT COUNT(*) FROM solves").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns this thread's connection, opening it on first use (SQLite connections are per thread)."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")  # Durable enough for a cache, and no fsync per write
+            self._local.connection = connection
+        return connection
+
+    def _transaction(self):
+        """Returns a context manager running a write transaction that takes the write lock up front."""
+        return _Transaction(self._connection())
+
+    @staticmethod
+    def _encode(solution) -> Any:
+        """Floats are stored as numbers; SymPy numbers as their text, to be parsed back on a hit."""
+        if isinstance(solution, (int, float)):
+            return float(solution)
+        return {'sympy': str(solution)}
+
+    @staticmethod
+    def _decode(text: str) -> CachedSolve:
+        data = json.loads(text)
+        solutions = data['solutions']
+        if any(isinstance(solution, dict) for solution in solutions):
+            import sympy
+            solutions = [sympy.sympify(solution['sympy']) if isinstance(solution, dict) else solution
+                         for solution in solutions]
+        return solutions, data['status'], data['method']
+
+
+class _Transaction:
+    """`BEGIN IMMEDIATE` ... `COMMIT`, rolled back if the block raises."""
+    __slots__ = ('connection',)
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, *exc_info):
+        self.connection.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+        return False
@@ -1,15 +1,59 @@
-from typing import List
-import sympy
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+
+from src.function_solver.core.domain_analysis import DomainAnalyzer
+from src.function_solver.core.expression_cache import ExpressionCache
+from src.function_solver.core.numeric_solver import NumericSolver
+from src.function_solver.core.polynomial_solver import PolynomialSolver
+from src.function_solver.core.solve_cache import SolveCache
+from src.function_solver.core.solver_pool import SolverPool
+from src.function_solver.utils.instrumentation import Instrumentation
+
+
+class SolveResult(NamedTuple):
+    """
+        The outcome of `Solver.solve_detailed`.
+
+        Attributes:
+            solutions (List): The solutions found (possibly partial when the status is `TIMED_OUT`).
+            status (str): `SOLVED`, `UNSOLVED` (SymPy gave up and no fallback was allowed) or `TIMED_OUT`.
+            method (str): The solver mode that produced the solutions (`Solver.SYMBOLIC` or `Solver.NUMERIC`).
+    """
+    solutions: List
+    status: str
+    method: str
+
+    SOLVED = 'solved'
+    UNSOLVED = 'unsolved'
+    TIMED_OUT = 'timed_out'
 
 
 class Solver:
     """
         A class for solving and evaluating mathematical functions. This class uses the SymPy library
-        to perform symbolic mathematics, including solving equations and evaluating functions at specific points.
+        to perform symbolic mathematics, including solving equations and evaluating functions at specific points,
+        and `NumericSolver` for equations SymPy cannot solve (or when a numeric answer is requested). Polynomial
+        equations are solved by `PolynomialSolver` instead, except in symbolic mode.
     """
+    SYMBOLIC = 'symbolic'  # sympy.solve only
+    NUMERIC = 'numeric'    # Sampled bracketing + Brent refinement only
+    AUTO = 'auto'          # sympy.solve, falling back to the numeric solver when SymPy cannot solve the equation
+    MODES = (SYMBOLIC, NUMERIC, AUTO)
+    POLYNOMIAL = 'polynomial'  # Not a mode: the method reported when the polynomial fast path solved the equation
+
+    DEFAULT_INTERVAL = (-10.0, 10.0)  # Interval searched by the numeric solver when none is given
+
     @staticmethod
     def solve(function1: str,
-              function2: str
+              function2: str,
+              mode: str = AUTO,
+              interval: Tuple[float, float] = DEFAULT_INTERVAL,
+              tolerance: float = 1e-12,
+              timeout: Optional[float] = None,
+              cancel: Optional[threading.Event] = None
               ) -> List:
         """
             Solves the equation `function1 = function2` for the variable `x`.
@@ -19,20 +63,211 @@ class Solver:
 
             :param function1: A string representing the first mathematical function (e.g., "x**2 + 3*x + 2").
             :param function2: A string representing the second mathematical function (e.g., "2*x + 1").
-            :return: A list of solutions for the variable `x`. If no solution is found or if the equation
-                     cannot be solved, an empty list is returned.
+            :param mode: `Solver.SYMBOLIC`, `Solver.NUMERIC` or `Solver.AUTO` (symbolic with numeric fallback).
+            :param interval: The `(lower, upper)` bounds searched by the numeric solver.
+            :param tolerance: The absolute tolerance on numeric roots.
+            :param timeout: The time budget in seconds for the symbolic solve, see `solve_detailed`.
+            :param cancel: An event that abandons the solve when set, see `solve_detailed`.
+            :return: A list of solutions for the variable `x` (SymPy numbers when solved symbolically, floats when
+                     solved numerically or as a polynomial). If no solution is found or if the equation cannot be
+                     solved, an empty list is returned.
+        """
+        return Solver.solve_detailed(function1, function2, mode, interval, tolerance, timeout, cancel).solutions
+
+    @staticmethod
+    def solve_detailed(function1: str,
+                       function2: str,
+                       mode: str = AUTO,
+                       interval: Tuple[float, float] = DEFAULT_INTERVAL,
+                       tolerance: float = 1e-12,
+                       timeout: Optional[float] = None,
+                       cancel: Optional[threading.Event] = None
+                       ) -> SolveResult:
+        """
+            Solves the equation `function1 = function2` like `solve`, and also reports how it was solved.
+
+            In auto and numeric mode, an equation between two polynomials is first handed to `solve_polynomial`,
+            which returns every real root (only those inside `interval` in numeric mode) with the
+            `Solver.POLYNOMIAL` method; SymPy and the numeric solver only see the equations it cannot solve.
+            With a `timeout`, the symbolic solve runs in a worker of the shared `SolverPool`; if it does not finish
+            in time the worker is killed, and the numeric result (in auto mode) or no solutions (in symbolic mode)
+            come back with the `SolveResult.TIMED_OUT` status. The same happens with a `cancel` event, which kills
+            the worker as soon as it is set. Without either, the symbolic solve runs in this process.
+
+            When the `FUNCTION_SOLVER_CACHE` environment variable names a file, results are looked up in and stored
+            to that `SolveCache`, so a solve done once by any process is not repeated. Timed out results are not
+            stored, since a later solve with more time may do better.
+
+            :param function1: A string representing the first mathematical function.
+            :param function2: A string representing the second mathematical function.
+            :param mode: `Solver.SYMBOLIC`, `Solver.NUMERIC` or `Solver.AUTO` (symbolic with numeric fallback).
+            :param interval: The `(lower, upper)` bounds searched by the numeric solver.
+            :param tolerance: The absolute tolerance on numeric roots.
+            :param timeout: The time budget in seconds for the symbolic solve, or None for no limit.
+            :param cancel: An event that abandons the solve when set.
+            :return: A `SolveResult` with the solutions, the status and the method that produced them.
+            :raises CancelledError: If `cancel` was set before the symbolic solve finished.
         """
-        # Convert the input strings into SymPy expressions
-        function1_sympified = sympy.sympify(function1)
-        function2_sympified = sympy.sympify(function2)
+        if mode not in Solver.MODES:
+            raise ValueError(f"Unknown solve mode '{mode}', expected one of {Solver.MODES}")
+
+        cache = SolveCache.shared()
+        if cache is None:
+            return Solver._solve_uncached(function1, function2, mode, interval, tolerance, timeout, cancel)
+        key = SolveCache.key(function1, function2, mode, interval, tolerance)
+        cached = cache.get(key)
+        if cached is not None:
+            return SolveResult(*cached)
+        result = Solver._solve_uncached(function1, function2, mode, interval, tolerance, timeout, cancel)
+        if result.status != SolveResult.TIMED_OUT:
+            cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _solve_uncached(function1: str,
+                        function2: str,
+                        mode: str,
+                        interval: Tuple[float, float],
+                        tolerance: float,
+                        timeout: Optional[float],
+                        cancel: Optional[threading.Event]
+                        ) -> SolveResult:
+        """Does the work of `solve_detailed`, without the persistent cache."""
+        if mode != Solver.SYMBOLIC:
+            roots = Solver.solve_polynomial(function1, function2)
+            if roots is not None:
+                if mode == Solver.NUMERIC:
+                    roots = [root for root in roots if interval[0] <= root <= interval[1]]
+                return SolveResult(roots, SolveResult.SOLVED, Solver.POLYNOMIAL)
+
+        if mode == Solver.NUMERIC:
+            return SolveResult(Solver.solve_numeric(function1, function2, interval, tolerance),
+                               SolveResult.SOLVED, Solver.NUMERIC)
+
+        status = SolveResult.SOLVED
         try:
-            # Solve the equation `function1 = function2` for `x`
-            return sympy.solve(sympy.Eq(function1_sympified,
-                                        function2_sympified),
-                               sympy.symbols('x'))
-        except NotImplementedError as e:
-            print(e)
-            return []
+            with Instrumentation.span('solver.symbolic'):
+                if timeout is None and cancel is None:
+                    solved, value = _solve_symbolic(function1, function2)
+                else:
+                    solved, value = SolverPool.shared().run(_solve_symbolic, function1, function2,
+                                                            timeout=timeout, cancel=cancel)
+            if solved:
+                return SolveResult(value, SolveResult.SOLVED, Solver.SYMBOLIC)
+            Instrumentation.count('solver.symbolic_unsolved')
+            if mode == Solver.SYMBOLIC:
+                return SolveResult([], SolveResult.UNSOLVED, Solver.SYMBOLIC)
+        except TimeoutError:
+            Instrumentation.count('solver.symbolic_timeouts')
+            status = SolveResult.TIMED_OUT
+            if mode == Solver.SYMBOLIC:
+                return SolveResult([], status, Solver.SYMBOLIC)
+
+        return SolveResult(Solver.solve_numeric(function1, function2, interval, tolerance), status, Solver.NUMERIC)
+
+    @staticmethod
+    def warm_up(pool: bool = True) -> None:
+        """
+            Imports SymPy and runs a trivial solve, so the first real solve does not pay for them. SymPy is
+            otherwise only imported when an expression is first solved symbolically. Meant to run on a background
+            thread once the GUI is showing.
+
+            :param pool: Whether to also start a worker of the shared `SolverPool` and warm it up the same way.
+        """
+        with Instrumentation.span('solver.warm_up'):
+            _warm_up()
+            if pool:
+                try:
+                    SolverPool.shared().run(_warm_up)
+                except RuntimeError:
+                    pass  # The pool was shut down meanwhile (e.g., at exit); workers are started on demand anyway
+
+    @staticmethod
+    def solve_pairs(functions: Sequence[str],
+                    mode: str = AUTO,
+                    interval: Tuple[float, float] = DEFAULT_INTERVAL,
+                    tolerance: float = 1e-12,
+                    timeout: Optional[float] = None,
+                    cancel: Optional[threading.Event] = None,
+                    workers: Optional[int] = None,
+                    pairs: Optional[Sequence[Tuple[int, int]]] = None
+                    ) -> Dict[Tuple[int, int], List]:
+        """
+            Solves `functions[i] = functions[j]` for every pair `i < j`, spreading the pairs over the workers of
+            the shared `SolverPool`. Each function is parsed, converted and compiled once (see `ExpressionCache`)
+            and shared by every pair it is part of.
+
+            :param functions: The function strings.
+            :param mode: `Solver.SYMBOLIC`, `Solver.NUMERIC` or `Solver.AUTO` (symbolic with numeric fallback).
+            :param interval: The `(lower, upper)` bounds searched by the numeric solver.
+            :param tolerance: The absolute tolerance on numeric roots.
+            :param timeout: The time budget in seconds for each symbolic solve, see `solve_detailed`.
+            :param cancel: An event that abandons every remaining solve when set.
+            :param workers: The number of pairs solved at once, defaults to the size of the shared pool.
+            :param pairs: The `(i, j)` pairs to solve, defaults to every pair `i < j`.
+            :return: The solutions of each pair, keyed on the `(i, j)` indices of its functions.
+            :raises CancelledError: If `cancel` was set before every pair was solved.
+        """
+        pairs = list(itertools.combinations(range(len(functions)), 2) if pairs is None else pairs)
+        if not pairs:
+            return {}
+        # An event, even one that is never set, makes every symbolic solve run in a pool worker, in parallel
+        cancel = cancel or threading.Event()
+        workers = min(workers or SolverPool.shared().processes, len(pairs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {(i, j): executor.submit(Solver.solve, functions[i], functions[j], mode, interval, tolerance,
+                                               timeout, cancel)
+                       for i, j in pairs}
+            try:
+                return {pair: future.result() for pair, future in futures.items()}
+            except BaseException:
+                cancel.set()  # Do not leave the remaining pairs running in the pool
+                raise
+
+    @staticmethod
+    def solve_numeric(function1: str,
+                      function2: str,
+                      interval: Tuple[float, float] = DEFAULT_INTERVAL,
+                      tolerance: float = 1e-12
+                      ) -> List[float]:
+        """
+            Solves `function1 = function2` numerically: `function1 - function2` is sampled in one vectorized pass
+            over the parts of the interval where both functions are defined, and every bracketed root is refined
+            with Brent's method.
+
+            :param function1: A string representing the first mathematical function.
+            :param function2: A string representing the second mathematical function.
+            :param interval: The `(lower, upper)` bounds to search.
+            :param tolerance: The absolute tolerance on each root.
+            :return: The real solutions inside the interval, sorted in increasing order.
+        """
+        entry1 = ExpressionCache.shared().get(function1)
+        entry2 = ExpressionCache.shared().get(function2)
+        kernel1, kernel2 = entry1.kernel, entry2.kernel
+        with Instrumentation.span('solver.numeric'):
+            domain = DomainAnalyzer.intersect(entry1.domain, entry2.domain)
+            return NumericSolver.find_roots(lambda x: kernel1(x) - kernel2(x), interval, tolerance=tolerance,
+                                            domain=domain)
+
+    @staticmethod
+    def solve_polynomial(function1: str, function2: str) -> Optional[List[float]]:
+        """
+            Solves `function1 = function2` from the eigenvalues of a companion matrix, if both sides are polynomials.
+
+            :param function1: A string representing the first mathematical function (e.g., "x^3 - 2*x").
+            :param function2: A string representing the second mathematical function (e.g., "1").
+            :return: Every real solution in increasing order, or None if the equation is not polynomial or its
+                     roots cannot be told apart reliably (see `PolynomialSolver.real_roots`).
+        """
+        polynomial1 = ExpressionCache.shared().get(function1).polynomial
+        polynomial2 = ExpressionCache.shared().get(function2).polynomial
+        if polynomial1 is None or polynomial2 is None:
+            return None
+        with Instrumentation.span('solver.polynomial'):
+            roots = PolynomialSolver.real_roots(PolynomialSolver.subtract(polynomial1, polynomial2))
+        if roots is None:
+            Instrumentation.count('solver.polynomial_fallbacks')
+        return roots
 
     @staticmethod
     def evaluate(function: str,
@@ -47,7 +282,75 @@ class Solver:
                 :param value: The value of `x` at which the function should be evaluated.
                 :return: The result of evaluating the function at the given value of `x`.
                 """
-        function_sympified = sympy.sympify(function)
+        import sympy
+        function_sympified = ExpressionCache.shared().get(function).sympy_expr
         # Substitute `x` with the given value and evaluate the expression
         return function_sympified.subs(sympy.symbols('x'), value)
 
+    @staticmethod
+    def evaluate_many(function: str,
+                      xs
+                      ) -> np.ndarray:
+        """
+                Evaluates a mathematical function at many values of `x` at once, in a single call of its compiled
+                NumPy kernel (see `ExpressionCache`).
+
+                Points outside the domain (e.g., `log(-1)`, `sqrt(-1)` or `0/0`) evaluate to NaN; points where the
+                function diverges (e.g., `1/x` at 0 or `log(x)` at 0) evaluate to +inf or -inf. No warnings are raised.
+
+                :param function: A string representing the mathematical function (e.g., "x^2 + 3*x + 2").
+                :param xs: The values of `x`, as an array or any sequence of real numbers.
+                :return: A float64 array of the function values, with the same shape as `xs`.
+                """
+        xs = np.asarray(xs, dtype=np.float64)
+        kernel = ExpressionCache.shared().get(function).kernel
+        with Instrumentation.span('solver.evaluate_many'):
+            return np.asarray(kernel(xs), dtype=np.float64)
+
+    @staticmethod
+    def evaluate_with_slope(function: str,
+                            xs
+                            ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+                Evaluates a mathematical function and its derivative at many values of `x` at once, in a single pass
+                of forward-mode automatic differentiation over its syntax tree (see `ForwardDiff`).
+
+                Where the function is undefined the slope is NaN as well; at a vertical tangent (e.g., `sqrt(x)` at 0)
+                or next to a pole it is +inf or -inf. No warnings are raised.
+
+                :param function: A string representing the mathematical function (e.g., "x^2 + 3*x + 2").
+                :param xs: The values of `x`, as an array or any sequence of real numbers.
+                :return: Two float64 arrays with the same shape as `xs`: the function values and the slopes.
+                """
+        xs = np.asarray(xs, dtype=np.float64)
+        kernel = ExpressionCache.shared().get(function).dual_kernel
+        with Instrumentation.span('solver.evaluate_with_slope'):
+            value, derivative = kernel(xs)
+        return value, derivative
+
+
+def _warm_up() -> None:
+    """Imports SymPy and solves `x - 1 = 0`, loading the solver machinery. Module-level for `SolverPool` workers."""
+    import sympy
+    x = sympy.Symbol('x')
+    sympy.solve(sympy.Eq(x, 1), x)
+
+
+def _solve_symbolic(function1: str, function2: str) -> Tuple[bool, object]:
+    """
+        Runs `sympy.solve` on `function1 = function2`. Module-level so `SolverPool` workers can run it.
+
+        :return: `(True, solutions)`, or `(False, reason)` if SymPy cannot solve the equation.
+    """
+    import sympy
+    # Look up the SymPy expressions, converted once per expression by the (per-process) cache
+    function1_sympified = ExpressionCache.shared().get(function1).sympy_expr
+    function2_sympified = ExpressionCache.shared().get(function2).sympy_expr
+    try:
+        # Solve the equation `function1 = function2` for `x`
+        return True, sympy.solve(sympy.Eq(function1_sympified,
+                                          function2_sympified),
+                                 sympy.symbols('x'))
+    except (NotImplementedError, TypeError, ValueError) as e:
+        # SymPy gives up with any of these on some mixed log/sqrt/polynomial equations
+        return False, str(e)
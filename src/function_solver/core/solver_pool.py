@@ -0,0 +1,183 @@
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError
+from typing import Any, Callable, Optional
+
+
+class SolverPool:
+    """
+        A reusable pool of worker processes for running solver tasks under a time budget.
+        Unlike `concurrent.futures.ProcessPoolExecutor`, a task that runs past its deadline gets its worker
+        killed and replaced, so a pathological expression costs a bounded amount of time and never leaves
+        a worker stuck. Workers are started lazily and reused across tasks, which keeps the SymPy import
+        and the per-process expression cache warm.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, processes: Optional[int] = None):
+        """
+            Initializes the pool. No process is started until the first task is run.
+
+            :param processes: The maximum number of worker processes, defaults to the number of CPUs.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self._context = multiprocessing.get_context('spawn')  # Never fork a process that may be running Qt
+        self._idle = queue.LifoQueue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def shared(cls) -> 'SolverPool':
+        """
+            Returns the process-wide pool used by `Solver` for deadline-bounded solves.
+
+            :return: The shared `SolverPool`, created on first use and shut down at exit.
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+                    atexit.register(cls._shared.shutdown)
+        return cls._shared
+
+    POLL_INTERVAL = 0.05  # Seconds between checks of the cancel event while a task runs or waits for a worker
+
+    def run(self,
+            function: Callable,
+            *args,
+            timeout: Optional[float] = None,
+            cancel: Optional[threading.Event] = None
+            ) -> Any:
+        """
+            Runs `function(*args)` in a worker process and waits for its result. Safe to call from several
+            threads at once; calls beyond the number of workers wait for a worker to become free.
+
+            :param function: A picklable (module-level) function to run.
+            :param args: Picklable arguments for the function.
+            :param timeout: The time budget in seconds, including any wait for a free worker. None waits forever.
+            :param cancel: An event that abandons the task when set, before it starts or while it waits for a
+                           worker (no worker is started then) or while it runs (the worker running it is killed).
+            :return: The function's return value.
+            :raises TimeoutError: If the budget runs out. A worker that was running the task is killed.
+            :raises CancelledError: If `cancel` was set before the task finished.
+            :raises Exception: Whatever the function raised in the worker.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        worker = self._acquire(deadline, cancel)
+        process, connection = worker
+        try:
+            connection.send((function, args))
+            finished = self._wait(connection, deadline, cancel)
+            if finished:
+                succeeded, value = connection.recv()
+        except (EOFError, OSError):
+            # The worker died underneath us (e.g., killed by the OS); replace it
+            self._kill(worker)
+            raise RuntimeError("Solver worker process exited unexpectedly")
+
+        if not finished:
+            self._kill(worker)
+            if cancel is not None and cancel.is_set():
+                raise CancelledError()
+            raise TimeoutError(f"Task did not finish within {timeout} seconds")
+
+        if self._closed:
+            self._kill(worker)
+        else:
+            self._idle.put(worker)
+        if not succeeded:
+            raise value
+        return value
+
+    def shutdown(self) -> None:
+        """Stops every idle worker. Workers busy with a task are stopped when they are returned."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._kill(worker)
+
+    def _wait(self, connection, deadline: Optional[float], cancel: Optional[threading.Event]) -> bool:
+        """Waits for a result until the deadline or cancellation. Returns whether a result is ready."""
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if cancel is None:
+                return connection.poll(remaining)
+            if cancel.is_set():
+                return False
+            step = self.POLL_INTERVAL if remaining is None else min(remaining, self.POLL_INTERVAL)
+            if connection.poll(step):
+                return True
+            if remaining is not None and remaining <= step:
+                return False
+
+    def _acquire(self, deadline: Optional[float], cancel: Optional[threading.Event]):
+        """
+            Takes an idle worker, or starts one while fewer than `processes` are running. Otherwise polls until one
+            is returned or a killed one can be replaced, checking the deadline and the cancel event on every pass.
+        """
+        while True:
+            if self._closed:
+                raise RuntimeError("SolverPool has been shut down")
+            if cancel is not None and cancel.is_set():
+                raise CancelledError()
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._started < self.processes:
+                    self._started += 1
+                    return self._start_worker()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError("No solver worker became available within the time budget")
+            try:
+                return self._idle.get(timeout=self.POLL_INTERVAL if remaining is None
+                                      else min(remaining, self.POLL_INTERVAL))
+            except queue.Empty:
+                pass
+
+    def _start_worker(self):
+        parent_connection, child_connection = self._context.Pipe()
+        process = self._context.Process(target=_worker_main, args=(child_connection,), daemon=True)
+        process.start()
+        child_connection.close()
+        return process, parent_connection
+
+    def _kill(self, worker) -> None:
+        process, connection = worker
+        connection.close()
+        process.terminate()
+        process.join(1)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        with self._lock:
+            self._started -= 1
+
+
+def _worker_main(connection) -> None:
+    """Worker loop: runs tasks received over the pipe until it is closed."""
+    while True:
+        try:
+            function, args = connection.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            result = (True, function(*args))
+        except Exception as e:
+            result = (False, e)
+        try:
+            connection.send(result)
+        except Exception as e:
+            # The result (or exception) could not be pickled; report it in a form that can
+            connection.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
@@ -0,0 +1,164 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.function_solver.core.adaptive_sampler import AdaptiveSampler, SampledCurve
+from src.function_solver.core.expression_cache import ExpressionCache
+from src.function_solver.utils.instrumentation import Instrumentation
+
+TileKey = Tuple[str, int, int]
+
+
+class TiledSampler:
+    """
+        Samples expressions over arbitrary x-ranges by stitching together fixed tiles, kept in a bounded, thread-safe
+        LRU cache keyed on `(expression, zoom level, tile index)`. At zoom level `z` the x-axis is cut into tiles of
+        width `TILE_PIXELS * 2**z`, and `z` is chosen so that a tile is sampled at least as finely as the screen shows
+        it. Panning back to a region, or zooming back to a previous level, then reuses the tiles sampled before
+        instead of evaluating the expression again. Tiles only sample the expression's domain, so a tile outside it
+        costs no evaluations.
+
+        Attributes:
+            hits (int): Tiles answered from the cache.
+            misses (int): Tiles that had to be sampled.
+            evictions (int): Tiles dropped to stay within `maxsize`.
+    """
+    TILE_PIXELS = 256  # Screen width of a tile at its own zoom level
+    TILE_HEIGHT = 512  # Pixel height the vertical tolerance of a tile is measured against
+    TILE_SEGMENTS = 16  # Coarse segments per tile before adaptive refinement
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, maxsize: int = 1024):
+        """
+            Initializes an empty tile cache.
+
+            :param maxsize: The maximum number of tiles to keep.
+        """
+        self._tiles: 'OrderedDict[TileKey, SampledCurve]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def shared(cls) -> 'TiledSampler':
+        """
+            Returns the process-wide tiled sampler used by the plotter.
+
+            :return: The shared `TiledSampler`, created on first use.
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def zoom_level(interval: Tuple[float, float], pixel_width: float) -> int:
+        """
+            Returns the zoom level whose tile resolution is at least the screen resolution of an x-range.
+
+            :param interval: The visible `(lower, upper)` x-range.
+            :param pixel_width: The width of the plotting area in pixels.
+            :return: The zoom level `z`; one tile pixel then spans `2**z` x-units.
+        """
+        units_per_pixel = (interval[1] - interval[0]) / max(pixel_width, 1)
+        return math.floor(math.log2(units_per_pixel)) if units_per_pixel > 0 else 0
+
+    def sample(self,
+               expression: str,
+               interval: Tuple[float, float],
+               pixel_width: float = 1000
+               ) -> SampledCurve:
+        """
+            Samples an expression over an x-range from the tiles that cover it.
+
+            :param expression: The expression string (e.g., "1/x").
+            :param interval: The visible `(lower, upper)` x-range.
+            :param pixel_width: The width of the plotting area in pixels, which sets the zoom level.
+            :return: The stitched `SampledCurve`, cropped to `interval` plus one sample beyond each end so the
+                     lines reach the edges of the plot. Its `evaluations` only count the tiles sampled by this
+                     call, so a fully cached range reports 0.
+        """
+        key = ExpressionCache.normalize(expression)
+        level = self.zoom_level(interval, pixel_width)
+        width = self.TILE_PIXELS * 2.0 ** level
+        first, last = math.floor(interval[0] / width), math.floor(interval[1] / width)
+
+        xs: List[np.ndarray] = []
+        ys: List[np.ndarray] = []
+        poles: List[float] = []
+        evaluations = 0
+        for index in range(first, last + 1):
+            tile, sampled = self._tile(key, level, index, width)
+            evaluations += tile.evaluations if sampled else 0
+            # Neighbouring tiles share their boundary point; keep it once
+            start = 1 if xs and tile.x[0] == xs[-1][-1] else 0
+            xs.append(tile.x[start:])
+            ys.append(tile.y[start:])
+            poles.extend(tile.poles)
+
+        x, y = np.concatenate(xs), np.concatenate(ys)
+        start = max(np.searchsorted(x, interval[0], 'right') - 1, 0)
+        stop = np.searchsorted(x, interval[1], 'left') + 1
+        # A pole on the boundary of two tiles is found by both
+        poles = sorted({pole for pole in poles if interval[0] <= pole <= interval[1]})
+        return SampledCurve(x[start:stop], y[start:stop], poles, evaluations)
+
+    def clear(self) -> None:
+        """Drops every tile and resets the statistics."""
+        with self._lock:
+            self._tiles.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+            Returns the cache statistics.
+
+            :return: A dictionary with `hits`, `misses`, `evictions`, the current `size` and the `maxsize`.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._tiles),
+                'maxsize': self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def _tile(self, expression: str, level: int, index: int, width: float) -> Tuple[SampledCurve, bool]:
+        """Returns a tile and whether it had to be sampled."""
+        key = (expression, level, index)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                self.hits += 1
+                Instrumentation.count('tiles.hits')
+                return tile, False
+            self.misses += 1
+        Instrumentation.count('tiles.misses')
+
+        entry = ExpressionCache.shared().get(expression)
+        kernel, domain = entry.kernel, entry.domain
+        with Instrumentation.span('sampler.tile'):
+            tile = AdaptiveSampler.sample(kernel, (index * width, (index + 1) * width),
+                                          (self.TILE_PIXELS, self.TILE_HEIGHT),
+                                          initial_segments=self.TILE_SEGMENTS, domain=domain)
+        Instrumentation.count('sampler.evaluations', tile.evaluations)
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > max(self.maxsize, 0):
+                self._tiles.popitem(last=False)
+                self.evictions += 1
+        return tile, True
@@ -1,7 +1,11 @@
-from PySide2.QtWidgets import QMainWindow, QWidget, QHBoxLayout
+import threading
+
+from PySide2.QtCore import QTimer
+from PySide2.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QFileDialog, QInputDialog
 from pathlib import Path
 from .components.input import InputWidget
 from .components.plotter import PlotterWidget
+from ..core.solver import Solver
 from ..utils.resources_utils import ResourceUtils
 
 
@@ -11,16 +15,26 @@ class FunctionSolverWindow(QMainWindow):
         the input widget and the plotter widget, allowing users to input mathematical functions
         and visualize their plots and intersection points.
 
+        The window is shown before the heavy dependencies are loaded: the plot canvas (and Matplotlib) is built
+        right after the first paint, and SymPy is optionally warmed up on a background thread after that.
+
         Attributes:
             input_widget (InputWidget): The widget for inputting mathematical functions.
             plot_widget (PlotterWidget): The widget for plotting the functions and displaying their intersection points.
+            warm_up (bool): Whether to import SymPy and start a solver worker in the background once shown.
     """
-    def __init__(self):
+    EXPORT_SAMPLES = 100_000  # Default number of samples offered by the export dialog
+
+    def __init__(self, warm_up: bool = True):
         """
             Initializes the FunctionSolverWindow. This sets up the user interface, loads the application styles,
             and sets the window icon.
+
+            :param warm_up: Whether to warm up SymPy in the background once the window is shown (see `Solver.warm_up`).
         """
         super().__init__()
+        self.warm_up = warm_up
+        self.started = False  # Whether the deferred startup work has been scheduled
         self.setWindowTitle("Function Plotter")
         self.setup_ui()
         self.load_styles()
@@ -39,12 +53,67 @@ class FunctionSolverWindow(QMainWindow):
         self.plot_widget = PlotterWidget()
 
         # Connect signals
-        self.input_widget.functions_updated.connect(self.plot_widget.plot_functions)
+        self.input_widget.functions_updated.connect(
+            lambda functions, numbers: self.plot_widget.plot_functions(*functions, numbers=numbers))
+        self.input_widget.export_requested.connect(self.export_data)
 
         main_layout.addWidget(self.input_widget, 1)
         main_layout.addWidget(self.plot_widget, 2)
         self.setMinimumSize(800, 600)
 
+    def showEvent(self, event):
+        """
+            Schedules the deferred startup work the first time the window is shown. The zero-delay timer fires
+            once the pending paint events have been processed, i.e. after the window has been drawn.
+        """
+        super().showEvent(event)
+        if not self.started:
+            self.started = True
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """
+            Builds the plot canvas, then starts the SymPy warm-up on a daemon thread if enabled.
+        """
+        self.plot_widget.ensure_canvas()
+        if self.warm_up:
+            threading.Thread(target=Solver.warm_up, name='solver-warm-up', daemon=True).start()
+
+    def export_data(self):
+        """
+            Asks for a file and a number of samples, then exports the plotted functions over the visible range
+            (see `PlotterWidget.export_view`). Progress and the outcome are shown in the status bar.
+        """
+        if not self.plot_widget.plotted_functions:
+            self.statusBar().showMessage("Plot functions before exporting them.", 5000)
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Data", "curves.csv",
+                                              "CSV (*.csv);;NumPy array (*.npy);;Raw float64 (*.dat)")
+        if not path:
+            return
+        samples, accepted = QInputDialog.getInt(self, "Export Data", "Number of samples:",
+                                                self.EXPORT_SAMPLES, 2, 1_000_000_000)
+        if not accepted:
+            return
+
+        job = self.plot_widget.export_view(path, samples)
+        job.signals.progress.connect(
+            lambda written, total: self.statusBar().showMessage(f"Exporting... {written * 100 // total}%"))
+        job.signals.finished.connect(
+            lambda result: self.statusBar().showMessage(
+                f"Exported {result.samples} samples to {result.path}"
+                + (f", {result.intersections} intersections to {result.intersections_path}"
+                   if result.intersections_path else ""), 10000))
+        job.signals.failed.connect(lambda message: self.statusBar().showMessage(f"Export failed: {message}", 10000))
+        job.signals.cancelled.connect(lambda: self.statusBar().showMessage("Export cancelled.", 10000))
+
+    def closeEvent(self, event):
+        """
+            Cancels running exports before the window closes, instead of waiting for them to finish writing.
+        """
+        self.plot_widget.cancel_exports()
+        super().closeEvent(event)
+
     def load_styles(self):
         """
             Loads the application styles from a QSS (Qt Style Sheet) file and applies them to the window.
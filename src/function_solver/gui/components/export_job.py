@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import CancelledError
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+from PySide2.QtCore import QObject, QRunnable, Signal
+from src.function_solver.core.curve_exporter import CurveExporter
+
+
+class ExportJobSignals(QObject):
+    """
+        Signals of an `ExportJob`. `QRunnable` is not a `QObject`, so its signals live on this helper.
+
+        Attributes:
+            progress (Signal): Emits the number of rows written so far and the total.
+            finished (Signal): Emits the `ExportResult`.
+            failed (Signal): Emits an error message.
+            cancelled (Signal): Emitted when the job stopped because it was cancelled.
+    """
+    progress = Signal(int, int)
+    finished = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class ExportJob(QRunnable):
+    """
+        Exports sampled functions and their intersections to a file on a worker thread (see `CurveExporter`).
+        The job can be cancelled: it then stops after the chunk being written, leaving the files incomplete.
+    """
+    SOLVE_TIMEOUT = 5.0  # Seconds SymPy may spend on the intersections before the numeric result is used
+
+    def __init__(self,
+                 functions: Sequence[str],
+                 interval: Tuple[float, float],
+                 samples: int,
+                 path: str,
+                 numbers: Optional[Sequence[int]] = None
+                 ):
+        """
+            Initializes the job.
+
+            :param functions: The function strings.
+            :param interval: The `(lower, upper)` x-range to sample.
+            :param samples: The number of grid points.
+            :param path: The file to write; its extension selects the format.
+            :param numbers: The input number of each function, used in the intersections sidecar.
+        """
+        super().__init__()
+        self.setAutoDelete(False)  # Python owns the job, so it is never deleted under a running thread
+        self.functions = tuple(functions)
+        self.interval = interval
+        self.samples = samples
+        self.path = Path(path)
+        self.numbers = numbers
+        self.signals = ExportJobSignals()
+        self.cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """Asks the job to stop; it emits `cancelled` instead of its result."""
+        self.cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def run(self) -> None:
+        try:
+            result = CurveExporter.export(self.functions, self.interval, self.samples, self.path,
+                                          solve_timeout=self.SOLVE_TIMEOUT, cancel=self.cancel_event,
+                                          progress=self.signals.progress.emit, numbers=self.numbers)
+        except CancelledError:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
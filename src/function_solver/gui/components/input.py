@@ -1,34 +1,49 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from PySide2.QtWidgets import (QFrame, QVBoxLayout, QLabel, QLineEdit,
-                               QPushButton, QMessageBox)
-from PySide2.QtCore import Signal
-from src.function_solver.core.expression_parser import ExpressionParser
+                               QPushButton, QMessageBox, QSizePolicy)
+from PySide2.QtCore import QTimer, Signal
+from src.function_solver.core.incremental_validator import IncrementalValidator
 
 
 class InputWidget(QFrame):
     """
         A custom widget for inputting and validating mathematical functions. This widget provides
-        input fields for two functions, validates them using the `ExpressionParser`, and emits
-        a signal when the functions are valid and ready to be processed.
+        input fields for two functions, and more on demand, validates them using the `IncrementalValidator`,
+        and emits a signal when the functions are valid and ready to be processed. Inputs are validated
+        as they are typed, once typing pauses, and errors are shown inline below each input.
 
         Attributes:
-            functions_updated (Signal): A PySide2 signal that emits the validated function strings.
+            functions_updated (Signal): A PySide2 signal that emits the list of validated function strings and the
+                                        list of their input numbers (1-based, counting the skipped empty inputs).
+            export_requested (Signal): Emitted when the export button is clicked.
+            function_frames (List[QFrame]): The input frames, in order; the first two are `func1_frame`
+                                            and `func2_frame`.
+            validator (IncrementalValidator): Validates the inputs, caching results and reusing the work done
+                                              on the previous text of each input.
     """
-    functions_updated = Signal(str, str)  # Signal for function1, function2
+    functions_updated = Signal(list, list)  # Signal for the list of functions and their input numbers
+    export_requested = Signal()
+    MAX_FUNCTIONS = 10
+    VALIDATION_DELAY = 250  # Milliseconds of typing pause before the changed inputs are validated
 
     def __init__(self):
         """
-            Initializes the InputWidget. This sets up the user interface and initializes the expression parser.
+            Initializes the InputWidget. This sets up the user interface and the debounced live validation.
         """
         super().__init__()
+        self.validator = IncrementalValidator()
+        self.pending_frames = set()  # Inputs changed since the last validation
+        self.validation_timer = QTimer(self)
+        self.validation_timer.setSingleShot(True)
+        self.validation_timer.setInterval(self.VALIDATION_DELAY)
+        self.validation_timer.timeout.connect(self.validate_pending)
         self.setup_ui()
-        self.parser = ExpressionParser()
 
     def setup_ui(self):
         """
             Sets up the user interface for the InputWidget. This includes creating input fields for
-            two functions, a button to trigger validation, and labels for displaying errors.
+            two functions, a button to add more, a button to trigger validation, and labels for displaying errors.
         """
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -38,18 +53,32 @@ class InputWidget(QFrame):
         input_label.setStyleSheet("font-size: 14px; font-weight: bold; color: #2c3e50;")
         layout.addWidget(input_label)
 
-        # Function 1 input
-        self.func1_frame = self.create_function_input("Function 1:", "e.g., x^2")
-        layout.addWidget(self.func1_frame)
+        # Function inputs
+        self.inputs_layout = QVBoxLayout()
+        self.inputs_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(self.inputs_layout)
 
-        # Function 2 input
+        self.func1_frame = self.create_function_input("Function 1:", "e.g., x^2")
         self.func2_frame = self.create_function_input("Function 2:", "e.g., log(x)")
-        layout.addWidget(self.func2_frame)
+        self.function_frames = [self.func1_frame, self.func2_frame]
+        for frame in self.function_frames:
+            self.inputs_layout.addWidget(frame)
+            self.watch_input(frame)
+
+        # Add function button
+        self.add_button = QPushButton("Add Function")
+        self.add_button.clicked.connect(self.add_function_input)
+        layout.addWidget(self.add_button)
 
         # Plot button
         self.plot_button = QPushButton("Plot Functions")
         self.plot_button.clicked.connect(self.validate_and_emit)
         layout.addWidget(self.plot_button)
+
+        # Export button
+        self.export_button = QPushButton("Export Data")
+        self.export_button.clicked.connect(self.export_requested)
+        layout.addWidget(self.export_button)
         layout.addStretch()
 
     @staticmethod
@@ -73,48 +102,155 @@ class InputWidget(QFrame):
         layout.addWidget(input_field)
 
         error_label = QLabel()
+        error_label.setObjectName("error_label")
         error_label.setStyleSheet("color: #dc3545; font-size: 12px;")
+        # Wrap long errors instead of widening the panel, so showing or hiding them never resizes the plot
+        error_label.setWordWrap(True)
+        error_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Preferred)
         error_label.hide()
         layout.addWidget(error_label)
 
         return frame
 
+    def add_function_input(self) -> QFrame:
+        """
+            Adds an input field for one more function, with a button to remove it again.
+
+            :return: The new input frame.
+        """
+        frame = self.create_function_input(f"Function {len(self.function_frames) + 1}:", "e.g., sqrt(x)")
+        remove_button = QPushButton("Remove")
+        remove_button.clicked.connect(lambda: self.remove_function_input(frame))
+        frame.layout().addWidget(remove_button)
+
+        self.function_frames.append(frame)
+        self.inputs_layout.addWidget(frame)
+        self.watch_input(frame)
+        self.add_button.setEnabled(len(self.function_frames) < self.MAX_FUNCTIONS)
+        return frame
+
+    def remove_function_input(self,
+                              frame: QFrame
+                              ) -> None:
+        """
+            Removes an added function input and renumbers the remaining ones. The first two inputs are permanent.
+
+            :param frame: The input frame to remove.
+        """
+        if frame not in self.function_frames[2:]:
+            return
+        self.function_frames.remove(frame)
+        self.pending_frames.discard(frame)
+        self.validator.forget(id(frame))
+        self.inputs_layout.removeWidget(frame)
+        frame.deleteLater()
+        for number, remaining in enumerate(self.function_frames, start=1):
+            remaining.findChild(QLabel).setText(f"Function {number}:")
+        self.add_button.setEnabled(len(self.function_frames) < self.MAX_FUNCTIONS)
+
+    def watch_input(self,
+                    frame: QFrame
+                    ) -> None:
+        """
+            Schedules validation of an input whenever its text changes.
+
+            :param frame: The input frame to watch.
+        """
+        frame.findChild(QLineEdit).textChanged.connect(lambda: self.schedule_validation(frame))
+
+    def schedule_validation(self,
+                            frame: QFrame
+                            ) -> None:
+        """
+            Marks an input as changed and (re)starts the debounce timer, so validation runs once typing pauses.
+            A shown error is cleared right away, since it belongs to the previous text.
+
+            :param frame: The input frame that changed.
+        """
+        self.set_error(frame, "")
+        self.pending_frames.add(frame)
+        self.validation_timer.start()
+
+    def validate_pending(self) -> None:
+        """
+            Validates the inputs changed since the last validation and shows or clears their inline errors.
+        """
+        pending, self.pending_frames = self.pending_frames, set()
+        for frame in self.function_frames:
+            if frame in pending:
+                self.validate_input(frame)
+
+    def validate_input(self,
+                       frame: QFrame
+                       ) -> Optional[Dict[str, any]]:
+        """
+            Validates one input and shows its errors below it, or hides them when it is valid or empty.
+
+            :param frame: The input frame to validate.
+            :return: The validation result, or None if the input is empty.
+        """
+        text = frame.findChild(QLineEdit).text().strip()
+        if not text:
+            self.set_error(frame, "")
+            return None
+        validation = self.validator.validate(text, key=id(frame))
+        self.set_error(frame, "" if validation['is_valid'] else self.format_error_message(validation['errors']))
+        return validation
+
+    @staticmethod
+    def set_error(frame: QFrame,
+                  message: str
+                  ) -> None:
+        """
+            Shows an error message in the error label of an input, or hides the label for an empty message.
+
+            :param frame: The input frame.
+            :param message: The error message to show.
+        """
+        error_label = frame.findChild(QLabel, "error_label")
+        error_label.setText(message)
+        error_label.setVisible(bool(message))
+
     def validate_and_emit(self):
         """
             Validates the input functions and emits the `functions_updated` signal if they are valid.
-            If the functions are invalid, an error message is displayed.
+            Empty inputs are skipped, but at least two functions are needed.
+            If the functions are invalid, their errors are shown below the inputs.
         """
-        f1_text = self.func1_frame.findChild(QLineEdit).text().strip()
-        f2_text = self.func2_frame.findChild(QLineEdit).text().strip()
+        self.validation_timer.stop()
+        self.pending_frames.clear()
+        validations = []
+        texts = []
+        numbers = []
+        for number, frame in enumerate(self.function_frames, start=1):
+            validation = self.validate_input(frame)
+            if validation is not None:
+                validations.append((number, validation))
+                texts.append(frame.findChild(QLineEdit).text().strip())
+                numbers.append(number)
 
-        if not f1_text or not f2_text:
-            QMessageBox.critical(self, "Input Error", "Please enter both functions.")
+        if len(validations) < 2:
+            QMessageBox.critical(self, "Input Error", "Please enter at least two functions.")
             return
 
-        f1_validation = self.parser.validate(f1_text)
-        f2_validation = self.parser.validate(f2_text)
-
-        if f1_validation['is_valid'] and f2_validation['is_valid']:
-            self.functions_updated.emit(f1_text, f2_text)
+        if all(validation['is_valid'] for _, validation in validations):
+            self.functions_updated.emit(texts, numbers)
         else:
-            self.show_validation_errors(f1_validation, f2_validation)
+            self.show_validation_errors(validations)
 
     def show_validation_errors(self,
-                               f1_validation: Dict[str, any],
-                               f2_validation: Dict[str, any]
+                               validations: List[Tuple[int, Dict[str, any]]]
                                ) -> None:
         """
-            Displays validation errors for the input functions.
+            Displays validation errors for the input functions, inline below each invalid input.
 
-            :param f1_validation: The validation result for function 1.
-            :param f2_validation: The validation result for function 2.
+            :param validations: The number of each function and its validation result.
         """
-        error_messages = []
-        if not f1_validation['is_valid']:
-            error_messages.append(f"Function 1: {self.format_error_message(f1_validation['errors'])}")
-        if not f2_validation['is_valid']:
-            error_messages.append(f"Function 2: {self.format_error_message(f2_validation['errors'])}")
-        QMessageBox.critical(self, "Validation Error", "\n\n".join(error_messages))
+        for number, validation in validations:
+            if not validation['is_valid']:
+                frame = self.function_frames[number - 1]
+                self.set_error(frame, self.format_error_message(validation['errors']))
+
     @staticmethod
     def format_error_message(errors: List[str]
                              ) -> str:
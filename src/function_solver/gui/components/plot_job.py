@@ -0,0 +1,187 @@
+import itertools
+import threading
+from concurrent.futures import CancelledError
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from PySide2.QtCore import QObject, QRunnable, Signal
+import numpy as np
+from src.function_solver.core.adaptive_sampler import SampledCurve
+from src.function_solver.core.expression_cache import ExpressionCache
+from src.function_solver.core.solver import Solver
+from src.function_solver.core.tiled_sampler import TiledSampler
+from src.function_solver.utils.instrumentation import Instrumentation
+from src.function_solver.utils.math_utils import MathUtils
+
+
+class PlotData(NamedTuple):
+    """
+        Everything the plotter needs to draw a set of functions, computed off the GUI thread.
+
+        Attributes:
+            functions (Tuple[str, ...]): The function strings.
+            numbers (Tuple[int, ...]): The number of the input each function came from, which names it in the
+                                       legend and the hover annotation.
+            x_range (Tuple[float, float]): The x-axis range to show.
+            y_range (Optional[Tuple[float, float]]): The y-axis range to show, or None to autoscale. Only set when
+                                                     a curve has a pole, whose extreme values would squash the plot.
+            curves (Tuple[SampledCurve, ...]): The adaptively sampled curve of each function.
+            solutions (List[float]): The real x-coordinates of the intersection points of every pair of functions.
+            solution_values (List[float]): The y-coordinates of the intersection points.
+            solution_pairs (List[Tuple[int, int]]): The indices of the two functions meeting at each point.
+            solution_slopes (List[Tuple[float, float]]): The slopes of those two functions at each point.
+            solved (Dict[Tuple[str, str], List]): The solutions of every pair, keyed on its two function strings,
+                                                  for the next job to reuse.
+    """
+    functions: Tuple[str, ...]
+    numbers: Tuple[int, ...]
+    x_range: Tuple[float, float]
+    y_range: Optional[Tuple[float, float]]
+    curves: Tuple[SampledCurve, ...]
+    solutions: List[float]
+    solution_values: List[float]
+    solution_pairs: List[Tuple[int, int]]
+    solution_slopes: List[Tuple[float, float]]
+    solved: Dict[Tuple[str, str], List]
+
+
+class PlotJobSignals(QObject):
+    """
+        Signals of a `PlotJob`. `QRunnable` is not a `QObject`, so its signals live on this helper.
+
+        Attributes:
+            finished (Signal): Emits the job generation and its `PlotData`, or None if the job was cancelled.
+            failed (Signal): Emits the job generation and an error message.
+    """
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+
+
+class PlotJob(QRunnable):
+    """
+        Solves and samples a set of functions on a worker thread. Every pair of functions is solved, in parallel
+        over the `SolverPool` workers, unless the previous plot already solved it, and every function is sampled
+        once however many pairs it is part of (from the `TiledSampler` cache when it was plotted over the same
+        range before). Each job carries the generation of the plot request that created it, so the plotter can
+        drop results of superseded requests, and can be cancelled: the job then stops at its next stage boundary,
+        killing a running symbolic solve.
+    """
+    SOLVE_TIMEOUT = 5.0  # Seconds SymPy may spend on the intersections before the numeric result is used
+    POLE_MARGIN = 0.1  # Fraction of the y-range added above and below when the range is fitted around a pole
+
+    def __init__(self,
+                 generation: int,
+                 functions: Sequence[str],
+                 pixel_size: Tuple[float, float] = (1000, 600),
+                 solved: Optional[Dict[Tuple[str, str], List]] = None,
+                 numbers: Optional[Sequence[int]] = None
+                 ):
+        """
+            Initializes the job.
+
+            :param generation: The generation of the plot request this job serves.
+            :param functions: The function strings.
+            :param pixel_size: The `(width, height)` of the plotting area in pixels, which sets the sampling density.
+            :param solved: The solutions of pairs solved before, keyed on their two function strings (see
+                           `PlotData.solved`); these pairs are not solved again.
+            :param numbers: The input number of each function, defaults to their 1-based positions.
+        """
+        super().__init__()
+        self.setAutoDelete(False)  # Python owns the job, so it is never deleted under a running thread
+        self.generation = generation
+        self.functions = tuple(functions)
+        self.numbers = tuple(numbers) if numbers is not None else tuple(range(1, len(self.functions) + 1))
+        self.pixel_size = pixel_size
+        self.solved = dict(solved or {})
+        self.signals = PlotJobSignals()
+        self.cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """Asks the job to stop; it emits `finished` with None instead of its result."""
+        self.cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def run(self) -> None:
+        try:
+            with Instrumentation.span('plot.compute'):
+                data = self.compute()
+        except CancelledError:
+            data = None
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+            data = None
+        self.signals.finished.emit(self.generation, None if self.is_cancelled() else data)
+
+    def compute(self) -> PlotData:
+        """
+            Runs the solve and sample stages, checking for cancellation between them.
+
+            :return: The computed `PlotData`.
+            :raises CancelledError: If the job was cancelled.
+        """
+        pairs = list(itertools.combinations(range(len(self.functions)), 2))
+        unsolved = [(i, j) for i, j in pairs if (self.functions[i], self.functions[j]) not in self.solved]
+        with Instrumentation.span('plot.solve'):
+            new_solutions = Solver.solve_pairs(self.functions, timeout=self.SOLVE_TIMEOUT, cancel=self.cancel_event,
+                                               pairs=unsolved)
+        self._check_cancelled()
+        pair_solutions = {(i, j): new_solutions[(i, j)] if (i, j) in new_solutions
+                          else self.solved[(self.functions[i], self.functions[j])] for i, j in pairs}
+        solved = {(self.functions[i], self.functions[j]): solutions for (i, j), solutions in pair_solutions.items()}
+
+        solutions = [sol for pair in pair_solutions.values() for sol in pair]
+        center = MathUtils.find_solution_center(solutions)
+        domains = [ExpressionCache.shared().get(text).domain for text in self.functions]
+        min_x, max_x = MathUtils.get_plot_range(center, solutions, domains)
+        with Instrumentation.span('plot.sample'):
+            curves = tuple(TiledSampler.shared().sample(text, (min_x, max_x), self.pixel_size[0])
+                           for text in self.functions)
+        self._check_cancelled()
+
+        numeric_solutions, solution_values, solution_pairs, solution_slopes = [], [], [], []
+        with Instrumentation.span('plot.evaluate'):
+            for (i, j), pair in pair_solutions.items():
+                xs = [complex(sol).real for sol in pair if complex(sol).imag == 0]
+                values, slopes_i = Solver.evaluate_with_slope(self.functions[i], xs)
+                _, slopes_j = Solver.evaluate_with_slope(self.functions[j], xs)
+                numeric_solutions.extend(xs)
+                solution_values.extend(values.tolist())
+                solution_pairs.extend([(i, j)] * len(xs))
+                solution_slopes.extend(zip(slopes_i.tolist(), slopes_j.tolist()))
+        y_range = self.pole_y_range(curves, solution_values)
+        return PlotData(self.functions, self.numbers, (min_x, max_x), y_range, curves, numeric_solutions,
+                        solution_values, solution_pairs, solution_slopes, solved)
+
+    def pole_y_range(self,
+                     curves: Tuple[SampledCurve, ...],
+                     solution_values: List[float]
+                     ) -> Optional[Tuple[float, float]]:
+        """
+            Fits the y-axis range around the bulk of the curves when one of them has a pole. The bulk lies between
+            the 2nd and 98th percentiles of the curves' values, each sample weighted by the x-distance it covers;
+            unweighted, the samples that adaptive sampling crowds next to a pole would stretch the range to it.
+
+            :param curves: The sampled curves.
+            :param solution_values: The y-coordinates of the intersection points, which are always kept in view.
+            :return: The `(lower, upper)` y-range, or None if no curve has a pole.
+        """
+        if not any(curve.poles for curve in curves):
+            return None
+        y = np.concatenate([curve.y for curve in curves])
+        weights = np.concatenate([np.gradient(curve.x) if curve.x.size > 1 else np.ones(curve.x.size)
+                                  for curve in curves])
+        finite = np.isfinite(y)
+        if not finite.any():
+            return None
+        order = np.argsort(y[finite])
+        y, weights = y[finite][order], weights[finite][order]
+        quantiles = (np.cumsum(weights) - weights / 2) / weights.sum()
+        low, high = np.interp([0.02, 0.98], quantiles, y)
+        low, high = min([low, *solution_values]), max([high, *solution_values])
+        margin = (high - low) * self.POLE_MARGIN or 1.0
+        return float(low - margin), float(high + margin)
+
+    def _check_cancelled(self) -> None:
+        if self.is_cancelled():
+            raise CancelledError()
@@ -1,49 +1,149 @@
-from typing import List, Union, Dict
+from typing import TYPE_CHECKING, List, Optional, Sequence, Union, Dict
 
+from PySide2.QtCore import QThreadPool, QTimer, Signal
 from PySide2.QtWidgets import QFrame, QVBoxLayout
-from matplotlib.backend_bases import MouseEvent
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.collections import PathCollection
-from matplotlib.figure import Figure
 import numpy as np
-from src.function_solver.core.solver import Solver
-from src.function_solver.utils.math_utils import MathUtils
+from src.function_solver.gui.components.point_index import PointIndex
+from src.function_solver.core.column_decimator import ColumnDecimator
+from src.function_solver.core.tiled_sampler import TiledSampler
+from src.function_solver.gui.components.export_job import ExportJob
+from src.function_solver.gui.components.plot_job import PlotData, PlotJob
+from src.function_solver.utils.instrumentation import Instrumentation
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.backend_bases import MouseEvent
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+    from matplotlib.collections import PathCollection
+    from matplotlib.figure import Figure
 
 
 class PlotterWidget(QFrame):
     """
         A custom widget for plotting mathematical functions. This widget uses Matplotlib to plot
-        two functions, find their intersection points, and display annotations when hovering over
-        the intersection points.
+        any number of functions, find the intersection points of every pair, and display annotations when hovering over
+        the intersection points. The plot can be zoomed with the mouse wheel and panned by dragging;
+        the curves are then resampled over the visible range (see `TiledSampler`). Curves are decimated to a few
+        points per pixel column before they are drawn (see `ColumnDecimator`), again whenever the view is zoomed,
+        panned or resized, so the cost of a redraw does not grow with the number of samples.
+
+        Matplotlib is only imported when the canvas is built, which happens on first access to `figure`, `canvas`
+        or `ax` (the main window does it right after it is first shown), so it does not delay the window.
 
         Attributes:
             points (matplotlib.collections.PathCollection): The scatter plot points representing the solutions.
             annotation (matplotlib.text.Annotation): The annotation displayed when hovering over a solution point.
+                                                     It is animated: full redraws skip it and hovering blits it
+                                                     over a cached background instead of redrawing the figure.
+            point_index (PointIndex): The screen positions of the solution points, rebuilt after every draw.
+            solution_slopes (List[Tuple[Tuple[int, int], Tuple[float, float]]]): The indices of the two functions
+                                                                                 meeting at each solution point and
+                                                                                 their slopes there.
+            lines (List[matplotlib.lines.Line2D]): The plotted curves, in the order of `plotted_functions`.
+            plotted_functions (Tuple[str, ...]): The function strings of the curves currently drawn.
+            plotted_numbers (Tuple[int, ...]): The input number of each of `plotted_functions`.
+            overlay (Optional[matplotlib.text.Text]): The stage timings shown in the corner of the plot when
+                                                      instrumentation runs in overlay mode (see `Instrumentation`).
+            plot_finished (Signal): Emitted on the GUI thread once a requested plot has been drawn.
     """
+    plot_finished = Signal()  # Emitted after a plot has been drawn
+    COLORS = ('#007bff', '#dc3545', '#28a745', '#fd7e14', '#6f42c1',
+              '#17a2b8', '#e83e8c', '#343a40', '#ffc107', '#20c997')  # Curve colors, in function order
+    ZOOM_FACTOR = 1.2  # Scale change per mouse wheel step
+    RESAMPLE_DELAY = 30  # Milliseconds of quiet after a pan/zoom step before the curves are resampled
+    POINT_SIZE = 50  # Marker area of the solution points, in points^2
+    PICK_RADIUS = 5  # Pixels around a solution marker that still count as hovering it
+    OVERLAY_SPANS = ('plot.solve', 'plot.sample', 'plot.evaluate', 'plot.compute', 'plot.artists', 'canvas.draw',
+                     'plot.resample')  # Stages shown in the debug overlay, in pipeline order
+
     def __init__(self):
         """
             Initializes the PlotterWidget. This sets up the user interface and initializes the Matplotlib figure and canvas.
         """
         super().__init__()
+        self._figure = None
+        self._canvas = None
+        self._ax = None
         self.setup_ui()
         self.points = None
         self.annotation = None
+        self.overlay = None
+        self.point_index = PointIndex(np.empty((0, 2)))
+        self.solution_slopes = []
+        self.hovered = None  # Index of the solution point the annotation shows, None while hidden
+        self.background = None  # The figure without the annotation, captured after every full draw
+        self.indexed_view = None  # The view `point_index` and `background` were captured for, see `view_key`
+        self.lines = []
+        self.plotted_functions = ()
+        self.plotted_numbers = ()  # The input number of each of `plotted_functions`
+        self.plotted_range = None  # The x-range the curves in `lines` were decimated for
+        self.solved = {}  # The solutions of every pair of `plotted_functions`, reused by the next plot
+        self.pan_start = None
+        self.resample_timer = QTimer(self)
+        self.resample_timer.setSingleShot(True)
+        self.resample_timer.setInterval(self.RESAMPLE_DELAY)
+        self.resample_timer.timeout.connect(self.resample_view)
+        self.generation = 0  # Incremented by every plot request; results of older requests are dropped
+        self.jobs: Dict[int, PlotJob] = {}  # Jobs still running, by generation
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)  # Superseded work is cancelled, never queued behind new work
+        self.export_pool = QThreadPool(self)
+        self.export_pool.setMaxThreadCount(1)
+        self.exports = set()  # Export jobs still running, kept alive until they finish
 
     def setup_ui(self) -> None:
         """
-            Sets up the user interface for the PlotterWidget. This includes creating a Matplotlib figure and canvas,
-            and configuring the layout.
+            Sets up the user interface for the PlotterWidget. This configures the layout the Matplotlib canvas
+            goes into once it is built (see `ensure_canvas`).
         """
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
 
-        self.figure = Figure(facecolor='#f8f9fa')
-        self.canvas = FigureCanvas(self.figure)
-        layout.addWidget(self.canvas)
+    def ensure_canvas(self) -> None:
+        """
+            Builds the Matplotlib figure, canvas and axis, importing Matplotlib, unless they already exist.
+        """
+        if self._canvas is not None:
+            return
+        with Instrumentation.span('plot.create_canvas'):
+            from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+            from matplotlib.figure import Figure
+
+            self._figure = Figure(facecolor='#f8f9fa')
+            self._canvas = FigureCanvas(self._figure)
+            self.layout().addWidget(self._canvas)
+
+            self.create_axis()
+            self._canvas.mpl_connect('draw_event', self.on_draw)
+            self._canvas.mpl_connect('motion_notify_event', self.hover)
+            self._canvas.mpl_connect('scroll_event', self.zoom)
+            self._canvas.mpl_connect('button_press_event', self.start_pan)
+            self._canvas.mpl_connect('motion_notify_event', self.pan)
+            self._canvas.mpl_connect('button_release_event', self.end_pan)
+            self._canvas.mpl_connect('resize_event', self.on_resize)
+            self.create_annotation()
+
+    @property
+    def figure(self) -> 'Figure':
+        """The Matplotlib figure, built on first access (see `ensure_canvas`)."""
+        self.ensure_canvas()
+        return self._figure
+
+    @property
+    def canvas(self) -> 'FigureCanvas':
+        """The Matplotlib canvas widget, built on first access (see `ensure_canvas`)."""
+        self.ensure_canvas()
+        return self._canvas
+
+    @property
+    def ax(self) -> 'Axes':
+        """The Matplotlib axis, built on first access (see `ensure_canvas`) and kept across plots."""
+        self.ensure_canvas()
+        return self._ax
 
-        self.create_axis()
-        self.canvas.mpl_connect('motion_notify_event', self.hover)
-        self.create_annotation()
+    @ax.setter
+    def ax(self, ax: 'Axes') -> None:
+        self._ax = ax
 
     def create_axis(self) -> None:
         """
@@ -55,6 +155,7 @@ class PlotterWidget(QFrame):
         self.ax.set_ylabel('y')
         self.ax.spines['top'].set_visible(False)
         self.ax.spines['right'].set_visible(False)
+        self.ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
 
     def create_annotation(self) -> None:
         """
@@ -70,117 +171,401 @@ class PlotterWidget(QFrame):
             xytext=(20, 20),
             textcoords='offset points',
             bbox=dict(boxstyle='round', fc='white', ec='black', alpha=0.8),
-            arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0.5', color='black')
+            arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0.5', color='black'),
+            animated=True
         )
         self.annotation.set_visible(False)
+        self.hovered = None
         self.canvas.draw_idle()
 
     def plot_functions(self,
-                       f1_text: str,
-                       f2_text: str
+                       *function_texts: str,
+                       numbers: Optional[Sequence[int]] = None
                        ) -> None:
         """
-            Plots two mathematical functions on the same graph and highlights their intersection points.
+            Plots mathematical functions on the same graph and highlights the intersection points of every pair.
+            Solving and sampling run on a background thread (see `PlotJob`); a newer request supersedes
+            and cancels any request still in progress, and only the newest result is drawn.
 
-            :param f1_text: A string representing the first mathematical function (e.g., "x^2 + 3*x + 2").
-            :param f2_text: A string representing the second mathematical function (e.g., "2*x + 1").
+            :param function_texts: Strings representing the mathematical functions
+                                   (e.g., "x^2 + 3*x + 2", "2*x + 1", "log(x)").
+            :param numbers: The input number of each function, used to name it in the legend, the hover annotation
+                            and exports; defaults to their 1-based positions.
         """
-        self.figure.clear()
-        self.create_axis()
-        self.create_annotation()
+        self.generation += 1
+        for generation, job in list(self.jobs.items()):
+            if self.thread_pool.tryTake(job):
+                del self.jobs[generation]  # Superseded before it started: it will never run
+            else:
+                job.cancel()  # Already running: stop it at its next stage boundary
 
-        try:
-            solutions = Solver.solve(f1_text, f2_text)
-            f1_text = f1_text.replace("^", "**")
-            f2_text = f2_text.replace("^", "**")
+        pixel_size = (self.ax.bbox.width, self.ax.bbox.height)
+        job = PlotJob(self.generation, function_texts, pixel_size, self.solved, numbers)
+        job.signals.finished.connect(self.on_plot_finished)
+        job.signals.failed.connect(self.on_plot_failed)
+        self.jobs[self.generation] = job
+        self.thread_pool.start(job)
 
-            center = MathUtils.find_solution_center(solutions)
-            min_x, max_x = MathUtils.get_plot_range(center, solutions)
-            x = np.linspace(min_x, max_x, 1000)
-            # set y limits
+    def on_plot_finished(self,
+                         generation: int,
+                         data: Optional[PlotData]
+                         ) -> None:
+        """
+            Receives the result of a `PlotJob` on the GUI thread and draws it unless it has been superseded.
+
+            :param generation: The generation of the plot request the job served.
+            :param data: The computed plot data, or None if the job was cancelled or failed.
+        """
+        self.jobs.pop(generation, None)
+        if data is None or generation != self.generation:
+            return
+        self.draw_plot(data)
+
+    def on_plot_failed(self,
+                       generation: int,
+                       message: str
+                       ) -> None:
+        print(f"Error plotting functions: {message}")
+
+    def draw_plot(self,
+                  data: PlotData
+                  ) -> None:
+        """
+            Draws computed plot data: the curves, their intersection points and the legend.
+
+            The scene is retained between plots: the axis, the annotation and the curves of the previous plot are
+            updated in place rather than rebuilt. A curve whose function and x-range did not change is left as is,
+            the other curves get their new samples through `set_data`, curves are only created or removed when the
+            number of functions changes, and the legend is only rebuilt when its labels change.
+
+            :param data: The plot data computed by a `PlotJob`.
+        """
+        with Instrumentation.span('plot.artists'):
+            self.create_overlay()
+            if self.annotation is not None:
+                self.hide_annot()
+            self.pan_start = None
+
+            min_x, max_x = data.x_range
+            # set axis limits
             self.ax.set_xlim(min_x, max_x)
             # Plot functions
-            y1 = eval(MathUtils.prepare_expression(f1_text))
-            self.ax.plot(x, y1, '-', color='#007bff', label=f'f1(x) = {f1_text}', zorder=1)
+            count = len(data.functions)
+            for i, (text, curve) in enumerate(zip(data.functions, data.curves)):
+                label = f'f{data.numbers[i]}(x) = {text}'
+                zorder = 1 + i / count  # Later curves are drawn on top, all of them below the intersection points
+                if i < len(self.lines):
+                    line = self.lines[i]
+                    if self.plotted_functions[i] != text or self.plotted_range != data.x_range:
+                        curve = ColumnDecimator.decimate(curve, (min_x, max_x), self.ax.bbox.width)
+                        line.set_data(curve.x, curve.y)
+                    line.set_label(label)
+                    line.set_zorder(zorder)
+                    continue
+                curve = ColumnDecimator.decimate(curve, (min_x, max_x), self.ax.bbox.width)
+                line, = self.ax.plot(curve.x, curve.y, '-', color=self.COLORS[i % len(self.COLORS)],
+                                     label=label, zorder=zorder)
+                self.lines.append(line)
+            for line in self.lines[count:]:
+                line.remove()
+            del self.lines[count:]
+            self.plotted_functions = data.functions
+            self.plotted_numbers = data.numbers
+            self.plotted_range = data.x_range
+            self.solved = data.solved
 
-            y2 = eval(MathUtils.prepare_expression(f2_text))
-            self.ax.plot(x, y2, '-', color='#dc3545', label=f'f2(x) = {f2_text}', zorder=2)
+            if data.y_range is not None:
+                self.ax.set_ylim(*data.y_range)
+            else:
+                self.ax.relim()
+                self.ax.set_autoscaley_on(True)
+                self.ax.autoscale_view(scalex=False)
+            self.resample_timer.stop()  # Setting the limits scheduled a resample, but the curves are fresh
 
             # Plot solutions
-            numeric_solutions = [complex(sol).real for sol in solutions if complex(sol).imag == 0]
-            self.annotate_solutions(numeric_solutions, f1_text)
+            self.annotate_solutions(data.solutions, data.solution_values)
+            self.solution_slopes = list(zip(data.solution_pairs, data.solution_slopes))
 
-            self.ax.legend(loc="upper right")
+            labels = [line.get_label() for line in self.lines]
+            legend = self.ax.get_legend()
+            if legend is None or [text.get_text() for text in legend.get_texts()] != labels:
+                self.ax.legend(loc="upper right")
+        with Instrumentation.span('canvas.draw'):
             self.canvas.draw()
+        self.update_overlay()
+        self.plot_finished.emit()
+
+    def export_view(self,
+                    path: str,
+                    samples: int
+                    ) -> Optional[ExportJob]:
+        """
+            Exports the plotted functions over the visible x-range to a file on a background thread, with their
+            intersections in a sidecar file (see `CurveExporter`).
+
+            :param path: The file to write; its extension selects the format (".csv", ".npy", or raw float64).
+            :param samples: The number of evenly spaced points to sample.
+            :return: The started `ExportJob`, whose signals report its progress and result, or None if nothing
+                     is plotted.
+        """
+        if not self.plotted_functions:
+            return None
+        job = ExportJob(self.plotted_functions, tuple(self.ax.get_xlim()), samples, path, self.plotted_numbers)
+        self.exports.add(job)
+        job.signals.finished.connect(lambda result: self.exports.discard(job))
+        job.signals.failed.connect(lambda message: self.exports.discard(job))
+        job.signals.cancelled.connect(lambda: self.exports.discard(job))
+        self.export_pool.start(job)
+        return job
+
+    def cancel_exports(self) -> None:
+        """
+            Cancels every export still queued or running and waits for the running one to stop after its current
+            chunk, e.g. before the window closes, so the thread pool is never left writing a large file.
+        """
+        for job in list(self.exports):
+            job.cancel()
+        self.export_pool.clear()
+        self.export_pool.waitForDone()
+
+    def on_xlim_changed(self, ax) -> None:
+        """
+            Schedules a resample of the curves once the visible x-range has stopped changing.
+
+            :param ax: The axis whose limits changed.
+        """
+        self.resample_timer.start()
+
+    def on_resize(self, event) -> None:
+        """
+            Schedules a resample of the curves for the new canvas width, once resizing has stopped.
+
+            :param event: The Matplotlib resize event.
+        """
+        self.resample_timer.start()
+
+    def resample_view(self) -> None:
+        """
+            Resamples the plotted curves over the visible x-range at the density of the current zoom level, and
+            decimates them for the current canvas width. Tiles sampled before (e.g., when panning back) come from
+            the `TiledSampler` cache.
+        """
+        if not self.lines:
+            return
+        interval = self.ax.get_xlim()
+        with Instrumentation.span('plot.resample'):
+            for line, text in zip(self.lines, self.plotted_functions):
+                curve = TiledSampler.shared().sample(text, interval, self.ax.bbox.width)
+                curve = ColumnDecimator.decimate(curve, interval, self.ax.bbox.width)
+                line.set_data(curve.x, curve.y)
+        self.plotted_range = interval
+        self.canvas.draw_idle()
+
+    def zoom(self,
+             event: 'MouseEvent'
+             ) -> None:
+        """
+            Zooms the plot in or out around the mouse position when the mouse wheel is turned.
+
+            :param event: The Matplotlib scroll event.
+        """
+        if event.inaxes != self.ax or not self.lines:
+            return
+        scale = self.ZOOM_FACTOR ** -event.step
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        self.ax.set_xlim(event.xdata - (event.xdata - x0) * scale, event.xdata + (x1 - event.xdata) * scale)
+        self.ax.set_ylim(event.ydata - (event.ydata - y0) * scale, event.ydata + (y1 - event.ydata) * scale)
+        self.canvas.draw_idle()
+
+    def start_pan(self,
+                  event: 'MouseEvent'
+                  ) -> None:
+        """
+            Starts panning when the left mouse button is pressed inside the plot.
+
+            :param event: The Matplotlib button press event.
+        """
+        if event.button != 1 or event.inaxes != self.ax or not self.lines:
+            return
+        self.pan_start = (event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim(),
+                          self.ax.transData.inverted().frozen())
+
+    def pan(self,
+            event: 'MouseEvent'
+            ) -> None:
+        """
+            Moves the visible range with the mouse while panning.
 
-        except Exception as e:
-            print(f"Error plotting functions: {e}")
+            :param event: The Matplotlib motion event.
+        """
+        if self.pan_start is None or event.x is None:
+            return
+        x, y, (x0, x1), (y0, y1), inverse = self.pan_start
+        (start_x, start_y), (end_x, end_y) = inverse.transform([(x, y), (event.x, event.y)])
+        dx, dy = end_x - start_x, end_y - start_y
+        self.ax.set_xlim(x0 - dx, x1 - dx)
+        self.ax.set_ylim(y0 - dy, y1 - dy)
+        self.canvas.draw_idle()
+
+    def end_pan(self,
+                event: 'MouseEvent'
+                ) -> None:
+        self.pan_start = None
 
     def annotate_solutions(self,
                            solutions: List,
-                           function: str
-                           ) -> Union[PathCollection, None]:
+                           y_values: List
+                           ) -> Union['PathCollection', None]:
         """
             Annotates the intersection points (solutions) on the plot.
 
             :param solutions: A list of x-values representing the intersection points.
-            :param function: The function to evaluate at the intersection points to get the y-values.
+            :param y_values: The y-values of the functions at the intersection points.
             :return: The scatter plot points representing the solutions.
         """
         if not solutions:
+            if self.points is not None:
+                self.points.remove()
+                self.points = None
             return None
 
-        y_vals = []
-        for sol in solutions:
-            try:
-                y_val = Solver.evaluate(function, sol)
-                y_vals.append(y_val)
-            except Exception as e:
-                print(f"Error evaluating function at {sol}: {e}")
-                return None
-
-        self.points = self.ax.scatter(solutions, y_vals,
+        if self.points is not None:
+            self.points.set_offsets(np.column_stack([solutions, y_values]))
+            return self.points
+        self.points = self.ax.scatter(solutions, y_values,
                                       color='black',
-                                      s=50,
+                                      s=self.POINT_SIZE,
                                       zorder=5,
-                                      picker=5)
+                                      picker=self.PICK_RADIUS)
         return self.points
 
+    def on_draw(self, event) -> None:
+        """
+            Runs after every full redraw: captures the background for blitting, re-indexes the solution points at
+            their new screen positions and draws the (animated) annotation and overlay on top.
+
+            :param event: The Matplotlib draw event.
+        """
+        if self.canvas.supports_blit:
+            self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.index_points()
+        if self.overlay is not None:
+            self.overlay.set_text(self.overlay_text())
+        self.draw_animated()
+
+    def draw_animated(self) -> None:
+        """Draws the animated artists, which full redraws skip: the annotation when shown, and the overlay."""
+        if self.annotation is not None and self.annotation.get_visible():
+            self.ax.draw_artist(self.annotation)
+        if self.overlay is not None:
+            self.figure.draw_artist(self.overlay)
+
+    def create_overlay(self) -> None:
+        """
+            Creates the debug overlay listing the duration of each plot stage, if instrumentation runs in overlay
+            mode and it does not exist yet, or removes it if overlay mode was turned off. Like the annotation it is
+            animated, so refreshing it never costs a full redraw.
+        """
+        if not (Instrumentation.enabled and Instrumentation.overlay):
+            if self.overlay is not None:
+                self.overlay.remove()
+                self.overlay = None
+        elif self.overlay is None:
+            self.overlay = self.figure.text(0.01, 0.99, '', ha='left', va='top', family='monospace', fontsize=7,
+                                            color='#6c757d', animated=True)
+
+    def overlay_text(self) -> str:
+        """Formats the most recent duration of each stage in `OVERLAY_SPANS`."""
+        lines = []
+        for name in self.OVERLAY_SPANS:
+            duration = Instrumentation.last(name)
+            if duration is not None:
+                lines.append(f"{name:<14}{duration * 1e3:8.1f} ms")
+        return '\n'.join(lines)
+
+    def update_overlay(self) -> None:
+        """Refreshes the overlay with the latest stage timings, e.g. once the canvas draw has been timed."""
+        if self.overlay is None:
+            return
+        self.overlay.set_text(self.overlay_text())
+        self.blit_annotation()
+
+    def view_key(self) -> tuple:
+        """Returns the pixel bounds and data limits of the axis, which fix where every point is on screen."""
+        return tuple(self.ax.bbox.bounds) + tuple(self.ax.viewLim.bounds)
+
+    def index_points(self) -> None:
+        """Rebuilds `point_index` from the current screen positions of the solution points."""
+        if self.points is not None:
+            self.point_index = PointIndex(self.ax.transData.transform(self.points.get_offsets()))
+        else:
+            self.point_index = PointIndex(np.empty((0, 2)))
+        self.indexed_view = self.view_key()
+
+    def blit_annotation(self) -> None:
+        """
+            Redraws only the animated artists over the cached background, falling back to a full redraw before the
+            first draw or on backends without blitting.
+        """
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_animated()
+        self.canvas.blit(self.figure.bbox)
+
     def update_annot(self,
-                     ind: Dict[str, any]
+                     index: int
                      ) -> None:
         """
-            Updates the annotation text and position when hovering over a solution point.
+            Updates the annotation text and position when hovering over a solution point: its coordinates and the
+            slopes of the two curves meeting there.
 
-            :param ind: The index of the point being hovered over.
+            :param index: The index of the point being hovered over.
         """
-        pos = self.points.get_offsets()[ind["ind"][0]]
+        pos = self.points.get_offsets()[index]
         self.annotation.xy = pos
         text = f'({pos[0]:.4f}, {pos[1]:.4f})'
+        if index < len(self.solution_slopes):
+            (i, j), (slope_i, slope_j) = self.solution_slopes[index]
+            number_i, number_j = self.plotted_numbers[i], self.plotted_numbers[j]
+            text += f"\nf{number_i}'(x) = {slope_i:.4f}, f{number_j}'(x) = {slope_j:.4f}"
         self.annotation.set_text(text)
         self.annotation.set_visible(True)
+        self.hovered = index
+
+    def hide_annot(self) -> None:
+        """Hides the annotation."""
+        self.annotation.set_visible(False)
+        self.hovered = None
 
     def hover(self,
-              event: MouseEvent
+              event: 'MouseEvent'
               ) -> None:
         """
             Handles the hover event for the solution points. Displays an annotation when hovering over a point.
+            The hovered point is looked up in `point_index`, and the figure is only touched when the annotation
+            changes, by blitting the annotation alone.
 
             :param event: The Matplotlib event containing information about the mouse movement.
         """
         if not self.points or not self.annotation:
             return
 
-        if event.inaxes != self.ax:
-            if self.annotation.get_visible():
-                self.annotation.set_visible(False)
-                self.canvas.draw_idle()
-            return
+        if self.indexed_view != self.view_key():
+            # Resized or zoomed since the last draw, which has not happened yet: the background is stale too
+            self.index_points()
+            self.background = None
 
-        cont, ind = self.points.contains(event)
-        if cont:
-            self.update_annot(ind)
-            self.canvas.draw_idle()
-        elif self.annotation.get_visible():
-            self.annotation.set_visible(False)
-            self.canvas.draw_idle()
\ No newline at end of file
+        index = None
+        if event.inaxes == self.ax:
+            radius = np.sqrt(self.POINT_SIZE) / 2 * self.figure.dpi / 72 + self.PICK_RADIUS
+            index = self.point_index.nearest(event.x, event.y, radius)
+
+        if index == self.hovered:
+            return
+        if index is None:
+            self.hide_annot()
+        else:
+            self.update_annot(index)
+        self.blit_annotation()
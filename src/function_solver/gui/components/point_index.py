@@ -0,0 +1,48 @@
+from typing import Optional
+
+import numpy as np
+
+
+class PointIndex:
+    """
+        A nearest-point index over screen positions, used for hit-testing the intersection points on hover.
+        The points are kept sorted by their x-coordinate, so a lookup only measures the distance to the points
+        inside a vertical strip around the cursor, found by binary search, instead of testing every point.
+    """
+
+    def __init__(self, positions: np.ndarray):
+        """
+            Builds the index.
+
+            :param positions: An `(n, 2)` array of screen positions in pixels.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.order = np.argsort(positions[:, 0], kind='stable')
+        self.positions = positions[self.order]
+
+    def nearest(self,
+                x: float,
+                y: float,
+                radius: float
+                ) -> Optional[int]:
+        """
+            Finds the point closest to a screen position, within a radius.
+
+            :param x: The x screen coordinate in pixels.
+            :param y: The y screen coordinate in pixels.
+            :param radius: The largest distance in pixels at which a point still counts as hit.
+            :return: The index of the closest point in the original positions, or None if no point is close enough.
+        """
+        lower = np.searchsorted(self.positions[:, 0], x - radius, 'left')
+        upper = np.searchsorted(self.positions[:, 0], x + radius, 'right')
+        if lower == upper:
+            return None
+        candidates = self.positions[lower:upper]
+        distances = np.hypot(candidates[:, 0] - x, candidates[:, 1] - y)
+        closest = int(np.argmin(distances))
+        if distances[closest] > radius:
+            return None
+        return int(self.order[lower + closest])
+
+    def __len__(self):
+        return len(self.positions)
@@ -1,13 +1,16 @@
 import sys
 from PySide2.QtWidgets import QApplication
 from src.function_solver.gui.app import FunctionSolverWindow
+from src.function_solver.utils.instrumentation import Instrumentation
 
 
 def main():
     app = QApplication(sys.argv)
     window = FunctionSolverWindow()
     window.show()
-    sys.exit(app.exec_())
+    status = app.exec_()
+    Instrumentation.report()
+    sys.exit(status)
 
 
 if __name__ == '__main__':
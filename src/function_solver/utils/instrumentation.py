@@ -0,0 +1,244 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, TextIO
+
+ENV_VAR = 'FUNCTION_SOLVER_PROFILE'  # "1" records spans and counters, "overlay" also shows them on the plot
+LOG_ENV_VAR = 'FUNCTION_SOLVER_PROFILE_LOG'  # File `report` writes the span events to, as JSON lines
+
+
+class _NullSpan:
+    """The span handed out while instrumentation is disabled: entering and leaving it does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class Span:
+    """
+        A timed section of code, recorded when the `with` block exits (also when it raises).
+
+        Attributes:
+            name (str): The stage name, e.g. "solver.symbolic".
+            parent (Optional[str]): The name of the span it is nested in on the same thread, if any.
+    """
+    __slots__ = ('name', 'parent', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.parent = None
+        self.start = 0.0
+
+    def __enter__(self):
+        stack = Instrumentation.stack()
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self.start
+        stack = Instrumentation.stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        Instrumentation.record(self, duration, failed=exc_info[0] is not None)
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Instrumentation:
+    """
+        Named spans and counters for the stages of the plot pipeline (validation, solving, sampling, drawing).
+
+        Disabled by default, in which case `span` hands out a shared no-op context manager and `count` returns at
+        once, so instrumented code pays one attribute check per call. Enable it with the `FUNCTION_SOLVER_PROFILE`
+        environment variable ("1", or "overlay" to also show the timings on the plot) or with `enable()`.
+        Spans are aggregated per name, and the most recent ones are kept as events for `export_jsonl`.
+        Work done inside `SolverPool` worker processes is only seen as the span around the call.
+    """
+    enabled = False
+    overlay = False
+    MAX_EVENTS = 10_000  # Most recent spans kept for export
+
+    _lock = threading.Lock()
+    _local = threading.local()
+    _spans: Dict[str, Dict[str, float]] = {}
+    _counters: Dict[str, int] = {}
+    _last: Dict[str, float] = {}
+    _events: Deque[Dict[str, Any]] = deque(maxlen=MAX_EVENTS)
+    _epoch = time.perf_counter()
+
+    @staticmethod
+    def enable(overlay: bool = False) -> None:
+        """
+            Starts recording spans and counters.
+
+            :param overlay: Whether the plotter should show the stage timings over the plot.
+        """
+        Instrumentation.enabled = True
+        Instrumentation.overlay = overlay
+
+    @staticmethod
+    def disable() -> None:
+        """Stops recording. What was recorded so far is kept until `reset`."""
+        Instrumentation.enabled = False
+        Instrumentation.overlay = False
+
+    @staticmethod
+    def configure_from_env(value: Optional[str] = None) -> None:
+        """
+            Enables instrumentation according to the `FUNCTION_SOLVER_PROFILE` environment variable.
+
+            :param value: The setting to apply instead of the environment variable's value.
+        """
+        value = (os.environ.get(ENV_VAR, '') if value is None else value).strip().lower()
+        if value in ('', '0', 'false', 'off', 'no'):
+            Instrumentation.disable()
+        else:
+            Instrumentation.enable(overlay=value == 'overlay')
+
+    @staticmethod
+    def span(name: str):
+        """
+            Times a section of code: `with Instrumentation.span("plot.sample"): ...`.
+
+            :param name: The stage name, dotted by component (e.g., "solver.numeric").
+            :return: A context manager recording the span, or a shared no-op one while disabled.
+        """
+        if not Instrumentation.enabled:
+            return _NULL_SPAN
+        return Span(name)
+
+    @staticmethod
+    def count(name: str, amount: int = 1) -> None:
+        """
+            Adds to a named counter, e.g. cache hits.
+
+            :param name: The counter name.
+            :param amount: The amount to add.
+        """
+        if not Instrumentation.enabled:
+            return
+        with Instrumentation._lock:
+            Instrumentation._counters[name] = Instrumentation._counters.get(name, 0) + amount
+
+    @staticmethod
+    def stack() -> List[Span]:
+        """Returns the spans currently open on this thread, innermost last."""
+        stack = getattr(Instrumentation._local, 'stack', None)
+        if stack is None:
+            stack = Instrumentation._local.stack = []
+        return stack
+
+    @staticmethod
+    def record(span: Span, duration: float, failed: bool = False) -> None:
+        """Adds a finished span to the aggregates and the event log."""
+        event = {
+            'span': span.name,
+            'parent': span.parent,
+            'start': round(span.start - Instrumentation._epoch, 6),
+            'duration': duration,
+            'thread': threading.current_thread().name,
+        }
+        if failed:
+            event['failed'] = True
+        with Instrumentation._lock:
+            stats = Instrumentation._spans.get(span.name)
+            if stats is None:
+                stats = Instrumentation._spans[span.name] = {'count': 0, 'total': 0.0, 'min': duration, 'max': 0.0}
+            stats['count'] += 1
+            stats['total'] += duration
+            stats['min'] = min(stats['min'], duration)
+            stats['max'] = max(stats['max'], duration)
+            Instrumentation._last[span.name] = duration
+            Instrumentation._events.append(event)
+
+    @staticmethod
+    def reset() -> None:
+        """Drops every recorded span, counter and event."""
+        with Instrumentation._lock:
+            Instrumentation._spans.clear()
+            Instrumentation._counters.clear()
+            Instrumentation._last.clear()
+            Instrumentation._events.clear()
+
+    @staticmethod
+    def snapshot() -> Dict[str, Any]:
+        """
+            Returns what was recorded so far.
+
+            :return: A dictionary with `spans` (per name: `count`, `total`, `min`, `max` and `mean` in seconds),
+                     `counters`, and `last`, the duration of the most recent span of each name.
+        """
+        with Instrumentation._lock:
+            spans = {name: dict(stats, mean=stats['total'] / stats['count'])
+                     for name, stats in Instrumentation._spans.items()}
+            return {'spans': spans, 'counters': dict(Instrumentation._counters), 'last': dict(Instrumentation._last)}
+
+    @staticmethod
+    def last(name: str) -> Optional[float]:
+        """Returns the duration in seconds of the most recent span of a name, or None if there was none."""
+        return Instrumentation._last.get(name)
+
+    @staticmethod
+    def summary_table() -> str:
+        """
+            Formats the recorded spans and counters as a plain-text table, slowest total first.
+
+            :return: The table, or an empty string if nothing was recorded.
+        """
+        snapshot = Instrumentation.snapshot()
+        lines = []
+        if snapshot['spans']:
+            lines.append(f"{'span':<28} {'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}")
+            for name, stats in sorted(snapshot['spans'].items(), key=lambda item: -item[1]['total']):
+                lines.append(f"{name:<28} {stats['count']:>7} {stats['total'] * 1e3:>10.2f} "
+                             f"{stats['mean'] * 1e3:>9.3f} {stats['max'] * 1e3:>9.3f}")
+        if snapshot['counters']:
+            lines.append(f"{'counter':<28} {'value':>7}")
+            for name, value in sorted(snapshot['counters'].items()):
+                lines.append(f"{name:<28} {value:>7}")
+        return '\n'.join(lines)
+
+    @staticmethod
+    def export_jsonl(stream: TextIO) -> None:
+        """
+            Writes the recorded span events as JSON lines, followed by one `summary` line with the aggregates.
+
+            :param stream: The text stream to write to.
+        """
+        with Instrumentation._lock:
+            events = list(Instrumentation._events)
+        for event in events:
+            stream.write(json.dumps(event) + '\n')
+        stream.write(json.dumps({'summary': Instrumentation.snapshot()}) + '\n')
+
+    @staticmethod
+    def report(stream: Optional[TextIO] = None) -> None:
+        """
+            Prints the summary table, and writes the events to the file named by `FUNCTION_SOLVER_PROFILE_LOG` if
+            it is set. Does nothing while disabled.
+
+            :param stream: Where the table is printed, defaults to stderr.
+        """
+        if not Instrumentation.enabled:
+            return
+        table = Instrumentation.summary_table()
+        if table:
+            print(table, file=stream or sys.stderr)
+        path = os.environ.get(LOG_ENV_VAR)
+        if path:
+            with open(path, 'w') as file:
+                Instrumentation.export_jsonl(file)
+
+
+Instrumentation.configure_from_env()
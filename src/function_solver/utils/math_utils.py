@@ -1,5 +1,6 @@
-from typing import Tuple, List
+from typing import Tuple, List, Optional, Sequence
 
+from src.function_solver.core.domain_analysis import Domain, DomainAnalyzer
 from src.function_solver.core.solver import Solver
 
 
@@ -45,6 +46,7 @@ class MathUtils:
     @staticmethod
     def get_plot_range(center: float,
                        solutions: List,
+                       domains: Optional[Sequence[Domain]] = None
                        ) -> Tuple[float, float]:
         """
             Determines the appropriate x-axis range for plotting based on the solutions of a function.
@@ -52,9 +54,48 @@ class MathUtils:
 
             :param center: The center of the solutions, typically calculated using `find_solution_center`.
             :param solutions: A list of solutions, which may include complex numbers.
+            :param domains: The domains of the plotted functions (see `DomainAnalyzer`), if known. The range is
+                            then fitted to where at least one function is defined (see `fit_to_domain`).
             :return: A tuple containing the minimum and maximum x-axis values for the plot.
                      If no valid solutions are found, returns a default range around the center.
         """
+        x_range = MathUtils._solution_range(center, solutions)
+        if domains is None:
+            return x_range
+        return MathUtils.fit_to_domain(x_range, DomainAnalyzer.union(domains))
+
+    @staticmethod
+    def fit_to_domain(x_range: Tuple[float, float],
+                      domain: Domain,
+                      margin: float = 0.05
+                      ) -> Tuple[float, float]:
+        """
+            Fits an x-axis range to a domain, so the plot does not show a stretch where nothing is drawn.
+            A range that misses the domain is moved next to the nearest piece of it (keeping its width), and a range
+            that overhangs the domain is trimmed to it, with a small margin so its edges stay visible.
+
+            :param x_range: The `(min_x, max_x)` range to fit.
+            :param domain: The sorted, disjoint intervals where at least one plotted function is defined.
+            :param margin: The margin kept beyond the edges of the domain, as a fraction of the range width.
+            :return: The fitted range, or `x_range` itself if the domain is empty.
+        """
+        if not domain:
+            return x_range
+        min_x, max_x = x_range
+        width = max_x - min_x
+        visible = DomainAnalyzer.clip(domain, x_range)
+        if not visible:
+            starts = [low for low, _ in domain if low >= max_x]
+            ends = [high for _, high in domain if high <= min_x]
+            if starts and (not ends or starts[0] - max_x <= min_x - ends[-1]):
+                return starts[0] - margin * width, starts[0] + (1 - margin) * width
+            return ends[-1] - (1 - margin) * width, ends[-1] + margin * width
+        low, high = visible[0][0], visible[-1][1]
+        padding = margin * (high - low)
+        return max(min_x, low - padding), min(max_x, high + padding)
+
+    @staticmethod
+    def _solution_range(center: float, solutions: List) -> Tuple[float, float]:
         if not solutions:
             return center - 5, center + 5
 
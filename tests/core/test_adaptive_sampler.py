@@ -0,0 +1,77 @@
+import numpy as np
+from src.function_solver.core.adaptive_sampler import AdaptiveSampler
+from src.function_solver.core.expression_cache import ExpressionCache
+
+def kernel(expression):
+    return ExpressionCache.shared().get(expression).kernel
+
+def test_sample_straight_line_is_cheap():
+    # Test that a straight line needs far fewer evaluations than a fixed 1000-point grid
+    curve = AdaptiveSampler.sample(kernel("2*x + 1"), (-10, 10))
+    assert curve.evaluations < 200
+    assert np.all(np.diff(curve.x) > 0)
+    assert np.allclose(curve.y, 2 * curve.x + 1)
+
+def test_sample_meets_pixel_tolerance():
+    # Test that linear interpolation between samples stays within the pixel tolerance
+    pixel_size = (800, 600)
+    curve = AdaptiveSampler.sample(kernel("sin(3*x)"), (-5, 5), pixel_size, tolerance=0.25)
+    x = np.linspace(-5, 5, 100001)
+    error = np.abs(np.interp(x, curve.x, curve.y) - np.sin(3 * x))
+    assert np.max(error) * pixel_size[1] / 2 < 1
+
+def test_sample_breaks_at_pole():
+    # Test that the line is broken at a pole instead of bridging the asymptote
+    curve = AdaptiveSampler.sample(kernel("1/(x - 0.3)"), (-5, 5))
+    assert len(curve.poles) == 1
+    assert abs(curve.poles[0] - 0.3) < 1e-3
+    left, right = curve.x < curve.poles[0], curve.x > curve.poles[0]
+    assert np.all(curve.y[left] < 0) and np.all(curve.y[right] > 0)
+    assert np.isnan(curve.y[~left & ~right]).all()
+
+def test_sample_breaks_at_pole_on_grid_point():
+    # Test that a pole falling exactly on a sample (0 is on the coarse grid) is found and not drawn
+    curve = AdaptiveSampler.sample(kernel("1/x"), (-5, 5))
+    assert curve.poles == [0.0]
+    assert not np.isinf(curve.y).any()
+    assert np.all(curve.y[curve.x < 0] < 0) and np.all(curve.y[curve.x > 0] > 0)
+
+def test_sample_breaks_at_even_pole():
+    # Test that poles without a sign change are found, both on a sample and between samples
+    for expression, pole in (("1/x^2", 0.0), ("1/(x - 0.3)^2", 0.3)):
+        curve = AdaptiveSampler.sample(kernel(expression), (-5, 5))
+        assert len(curve.poles) == 1 and abs(curve.poles[0] - pole) < 1e-3
+        assert np.isnan(curve.y[np.abs(curve.x - pole) < 1e-3]).any()
+        assert np.all(curve.y[np.isfinite(curve.y)] > 0)
+
+def test_sample_keeps_continuous_curve_unbroken():
+    # Test that steep but continuous curves are not broken
+    for expression in ("x^5", "1/(x^2 + 0.01)"):
+        curve = AdaptiveSampler.sample(kernel(expression), (-10, 10))
+        assert curve.poles == []
+        assert np.all(np.isfinite(curve.y))
+
+def test_sample_refines_domain_edge():
+    # Test that the curve is extended up to the edge of its domain and undefined points are NaN
+    curve = AdaptiveSampler.sample(kernel("sqrt(4 - x^2)"), (-5, 5.3), (1000, 600))
+    defined = curve.x[np.isfinite(curve.y)]
+    assert defined.min() < -1.99 and defined.max() > 1.99
+    assert np.isnan(curve.y[np.abs(curve.x) > 2]).all()
+
+def test_sample_scales_with_canvas():
+    # Test that a larger canvas gets a denser sample
+    small = AdaptiveSampler.sample(kernel("sin(x)"), (-10, 10), (200, 150))
+    large = AdaptiveSampler.sample(kernel("sin(x)"), (-10, 10), (2000, 1500))
+    assert large.evaluations > small.evaluations
+
+def test_sample_only_inside_domain():
+    # Test that only the domain is sampled and the curve is broken between its pieces
+    domain = [(-float('inf'), -2), (2, float('inf'))]
+    full = AdaptiveSampler.sample(kernel("sqrt(x^2 - 4)"), (-5, 5))
+    curve = AdaptiveSampler.sample(kernel("sqrt(x^2 - 4)"), (-5, 5), domain=domain)
+    assert curve.evaluations < full.evaluations
+    assert curve.x[0] == -5 and curve.x[-1] == 5
+    assert np.isnan(curve.y[np.abs(curve.x) < 2]).all()
+    assert np.isfinite(curve.y[np.abs(curve.x) > 2]).all()
+    empty = AdaptiveSampler.sample(kernel("sqrt(x^2 - 4)"), (-1, 1), domain=domain)
+    assert empty.evaluations == 0 and np.isnan(empty.y).all()
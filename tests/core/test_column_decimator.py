@@ -0,0 +1,33 @@
+import numpy as np
+from src.function_solver.core.adaptive_sampler import SampledCurve
+from src.function_solver.core.column_decimator import ColumnDecimator
+
+def columns(x, interval, width):
+    return np.clip(np.floor((x - interval[0]) * (width / (interval[1] - interval[0]))), -1, width)
+
+def test_keeps_extremes_of_every_column():
+    # Test that each pixel column keeps its first, last, lowest and highest sample, and nothing else
+    x = np.linspace(-10, 10, 200_001)
+    curve = SampledCurve(x, np.sin(40 * x), [], 100)
+    decimated = ColumnDecimator.decimate(curve, (-10, 10), 500)
+    assert decimated.x.size <= ColumnDecimator.POINTS_PER_COLUMN * 502
+    assert np.all(np.diff(decimated.x) > 0) and np.allclose(decimated.y, np.sin(40 * decimated.x))
+    assert decimated.evaluations == 100
+    full, kept = columns(x, (-10, 10), 500), columns(decimated.x, (-10, 10), 500)
+    for column in range(500):
+        y, z = curve.y[full == column], decimated.y[kept == column]
+        assert (z[0], z[-1], z.min(), z.max()) == (y[0], y[-1], y.min(), y.max())
+
+def test_keeps_breaks():
+    # Test that NaN breaks survive and the runs on each side of one are decimated separately
+    x = np.linspace(0, 1, 100_001)
+    y = np.where(np.abs(x - 0.5) < 1e-9, np.nan, x)
+    decimated = ColumnDecimator.decimate(SampledCurve(x, y, [0.5], 0), (0, 1), 100)
+    index = np.flatnonzero(np.isnan(decimated.y))
+    assert decimated.x[index].tolist() == [0.5] and decimated.poles == [0.5]
+    assert decimated.x[index - 1] == x[49_999] and decimated.x[index + 1] == x[50_001]
+
+def test_sparse_curve_is_unchanged():
+    # Test that a curve with few samples per column is returned as is
+    curve = SampledCurve(np.linspace(0, 1, 50), np.zeros(50), [], 50)
+    assert ColumnDecimator.decimate(curve, (0, 1), 800) is curve
@@ -0,0 +1,73 @@
+import csv
+import threading
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pytest
+from src.function_solver.core.curve_exporter import CurveExporter
+from src.function_solver.core.parallel_sampler import ParallelSampler
+
+def test_chunks_cover_grid():
+    # Test that the chunks together form the uniform grid, ends included, with each function evaluated on it
+    rows = np.concatenate(list(CurveExporter.chunks(["x^2", "log(x)"], (-1, 2), 1001, chunk_size=64)))
+    assert rows.shape == (1001, 3)
+    assert np.allclose(rows[:, 0], np.linspace(-1, 2, 1001)) and rows[0, 0] == -1 and rows[-1, 0] == 2
+    assert np.allclose(rows[:, 1], rows[:, 0] ** 2)
+    assert np.isnan(rows[rows[:, 0] < 0, 2]).all()
+
+def test_formats_hold_the_same_data(tmp_path):
+    # Test that the CSV, .npy and raw memory-mapped exports contain the same samples
+    expected = np.concatenate(list(CurveExporter.chunks(["sin(x)"], (0, 5), 999)))
+    for name in ('curves.csv', 'curves.npy', 'curves.dat'):
+        result = CurveExporter.export(["sin(x)"], (0, 5), 999, tmp_path / name, chunk_size=100)
+        assert result.samples == 999 and result.intersections_path is None
+    with open(tmp_path / 'curves.csv') as handle:
+        assert next(csv.reader(handle)) == ['x', 'sin(x)']
+    assert np.array_equal(np.loadtxt(tmp_path / 'curves.csv', delimiter=',', skiprows=1), expected)
+    assert np.array_equal(np.load(tmp_path / 'curves.npy', mmap_mode='r'), expected)
+    assert np.array_equal(np.memmap(tmp_path / 'curves.dat', dtype='<f8').reshape(-1, 2), expected)
+
+def test_parallel_export_matches_single_process(tmp_path):
+    # Test that chunks split across worker processes are written exactly as when sampled in this process
+    samples = 2 * ParallelSampler.MIN_CHUNK + 5
+    CurveExporter.export(["sqrt(x) - x^2", "log(x + 1)"], (-1, 3), samples, tmp_path / 'single.npy', processes=1)
+    CurveExporter.export(["sqrt(x) - x^2", "log(x + 1)"], (-1, 3), samples, tmp_path / 'parallel.npy', processes=2)
+    assert (tmp_path / 'single.npy').read_bytes() == (tmp_path / 'parallel.npy').read_bytes()
+
+def test_intersections_sidecar(tmp_path):
+    # Test that the intersections inside the range are written next to the export
+    result = CurveExporter.export(["x^2", "2*x", "3"], (-1, 2.5), 100, tmp_path / 'curves.npy')
+    assert result.intersections_path == tmp_path / 'curves.intersections.csv'
+    with open(result.intersections_path) as handle:
+        rows = list(csv.reader(handle))
+    assert rows[0] == ['function1', 'function2', 'x', 'y']
+    points = np.array(rows[1:], dtype=float)
+    assert np.allclose(points, [(1, 2, 0, 0), (1, 2, 2, 4), (1, 3, np.sqrt(3), 3), (2, 3, 1.5, 3)])
+    assert result.intersections == 4
+
+def test_intersections_sidecar_numbers(tmp_path):
+    # Test that the sidecar names the functions by the numbers given
+    CurveExporter.export(["x", "-x"], (-1, 1), 10, tmp_path / 'curves.csv', numbers=[2, 5])
+    with open(CurveExporter.sidecar_path(tmp_path / 'curves.csv')) as handle:
+        assert list(csv.reader(handle))[1][:2] == ['2', '5']
+
+def test_export_can_be_cancelled(tmp_path):
+    # Test that a cancelled export stops between chunks
+    cancel = threading.Event()
+    progress = []
+
+    def report(written, total):
+        progress.append(written)
+        cancel.set()
+
+    with pytest.raises(CancelledError):
+        CurveExporter.export(["x"], (0, 1), 1000, tmp_path / 'curves.csv', chunk_size=100, cancel=cancel,
+                             progress=report)
+    assert progress == [100]
+
+def test_too_few_samples_writes_nothing(tmp_path):
+    # Test that an invalid number of samples is rejected before any file is created
+    for name in ('curves.csv', 'curves.npy', 'curves.dat'):
+        with pytest.raises(ValueError):
+            CurveExporter.export(["x"], (0, 1), 1, tmp_path / name)
+    assert list(tmp_path.iterdir()) == []
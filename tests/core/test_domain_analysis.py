@@ -0,0 +1,58 @@
+import math
+import pytest
+from src.function_solver.core.domain_analysis import REAL_LINE, DomainAnalyzer
+from src.function_solver.core.expression_parser import ExpressionParser
+
+def parse(expression):
+    return ExpressionParser.shared().validate(expression)['ast']
+
+def assert_domain(expression, expected):
+    domain = DomainAnalyzer.domain(parse(expression))
+    assert len(domain) == len(expected)
+    for (low, high), (expected_low, expected_high) in zip(domain, expected):
+        assert low == pytest.approx(expected_low, abs=1e-6) and high == pytest.approx(expected_high, abs=1e-6)
+        # The domain may only be widened, never narrowed
+        assert low <= expected_low and high >= expected_high
+
+def test_polynomials_and_poles_are_defined_everywhere():
+    # Test that expressions without log, sqrt or fractional powers skip the analysis
+    assert DomainAnalyzer.domain(parse("x^3 - 2*x + 1")) == REAL_LINE
+    assert DomainAnalyzer.domain(parse("1/(x - 1)")) == REAL_LINE
+
+def test_log_and_sqrt_domains():
+    # Test the domains of log and sqrt of linear arguments
+    assert_domain("log(x)", [(0, math.inf)])
+    assert_domain("sqrt(x - 3)", [(3, math.inf)])
+    assert_domain("log(x - 3) + sqrt(5 - x)", [(3, 5)])
+
+def test_domain_with_several_pieces():
+    # Test that splitting separates disjoint pieces of the domain
+    assert_domain("sqrt(x^2 - 4)", [(-math.inf, -2), (2, math.inf)])
+    assert_domain("sqrt((x - 1)*(x - 2)*(x - 3))", [(1, 2), (3, math.inf)])
+
+def test_fractional_powers_and_nested_functions():
+    # Test fractional powers of negative bases and functions of functions
+    assert_domain("x^0.5", [(0, math.inf)])
+    assert_domain("x^(1/3)", [(0, math.inf)])
+    assert_domain("log(log(x))", [(1, math.inf)])
+    assert DomainAnalyzer.domain(parse("log(x^2)")) == REAL_LINE
+
+def test_empty_domain():
+    # Test expressions that are defined nowhere
+    assert DomainAnalyzer.domain(parse("sqrt(-1 - x^2)")) == []
+    assert DomainAnalyzer.domain(parse("log(-1) + x")) == []
+
+def test_value_range():
+    # Test that the value bounds enclose the function over its domain
+    low, high = DomainAnalyzer.value_range(parse("sqrt(x - 1)"), (-10, 10))
+    assert low == 0 and high == pytest.approx(3)
+    low, high = DomainAnalyzer.value_range(parse("x^2 - 1"), (-2, 3))
+    assert low <= -1 and 8 <= high < 9
+    assert DomainAnalyzer.value_range(parse("sqrt(x - 20)"), (-10, 10)) is None
+
+def test_intersect_and_union():
+    # Test combining the domains of several functions
+    first, second = [(-math.inf, -2), (2, math.inf)], [(0, 5)]
+    assert DomainAnalyzer.intersect(first, second) == [(2, 5)]
+    assert DomainAnalyzer.union([first, second]) == [(-math.inf, -2), (0, math.inf)]
+    assert DomainAnalyzer.clip(first, (-3, 3)) == [(-3, -2), (2, 3)]
@@ -0,0 +1,53 @@
+import numpy as np
+import sympy
+from src.function_solver.core.expression_cache import ExpressionCache
+
+def test_cache_hits_on_normalized_text():
+    # Test that expressions differing only in whitespace share one entry
+    cache = ExpressionCache()
+    entry = cache.get("x ^ 2 + 1")
+    assert cache.get("x^2+1") is entry
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': 512}
+
+def test_cache_evicts_least_recently_used():
+    # Test that the least recently used entry is evicted once the cache is full
+    cache = ExpressionCache(maxsize=2)
+    cache.get("x")
+    cache.get("x + 1")
+    cache.get("x")  # x is now the most recently used
+    cache.get("x + 2")
+    assert "x" in cache and "x + 2" in cache
+    assert "x + 1" not in cache
+    assert cache.evictions == 1
+
+def test_shrinking_maxsize_evicts():
+    # Test that lowering the size limit evicts down to the new limit
+    cache = ExpressionCache()
+    for i in range(5):
+        cache.get(f"x + {i}")
+    cache.maxsize = 2
+    assert len(cache) == 2
+    assert cache.evictions == 3
+
+def test_entry_holds_ast_sympy_and_kernel():
+    # Test that an entry provides the tree, the SymPy form and the kernel, built once
+    entry = ExpressionCache().get("x^2 - 1")
+    assert entry.ast is not None
+    assert entry.sympy_expr == sympy.sympify("x**2 - 1")
+    assert entry.kernel is entry.kernel
+    assert np.array_equal(entry.kernel(np.array([0.0, 2.0])), [-1.0, 3.0])
+
+def test_entry_falls_back_to_sympy_syntax():
+    # Test that text outside the grammar (SymPy syntax) is still usable
+    entry = ExpressionCache().get("x**2")
+    assert entry.ast is None
+    assert entry.sympy_expr == sympy.sympify("x**2")
+    assert np.array_equal(entry.kernel(np.array([3.0])), [9.0])
+
+def test_entry_dual_kernel():
+    # Test that the derivative kernel is built once, from the tree or through SymPy outside the grammar
+    entry = ExpressionCache().get("x^2 - 1")
+    assert entry.dual_kernel is entry.dual_kernel
+    assert np.array_equal(entry.dual_kernel(np.array([3.0])).derivative, [6.0])
+    value, derivative = ExpressionCache().get("log(x)**2").dual_kernel(np.array([-1.0, np.e]))
+    assert np.isnan(derivative[0]) and np.allclose([value[1], derivative[1]], [1.0, 2 / np.e])
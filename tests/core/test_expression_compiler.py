@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+import sympy
+from src.function_solver.core.expression_ast import BinaryOp, FunctionCall, Number, Variable
+from src.function_solver.core.expression_compiler import ExpressionCompiler
+from src.function_solver.core.expression_parser import ExpressionParser
+
+@pytest.fixture
+def parser():
+    return ExpressionParser()
+
+def test_compile_matches_numpy(parser):
+    # Test that a compiled kernel matches the equivalent NumPy expression
+    x = np.linspace(0.1, 5, 50)
+    kernel = ExpressionCompiler.compile(parser.validate("-x^2 + 3*log(x) / sqrt(x + 1)")['ast'])
+    assert np.allclose(kernel(x), -x ** 2 + 3 * np.log(x) / np.sqrt(x + 1))
+
+def test_fold_constants():
+    # Test that sub-expressions without x are folded into numbers
+    tree = BinaryOp('*', BinaryOp('+', Number(2.0), FunctionCall('sqrt', Number(16.0))), Variable('x'))
+    assert ExpressionCompiler.fold_constants(tree) == BinaryOp('*', Number(6.0), Variable('x'))
+
+def test_constant_expression_broadcasts(parser):
+    # Test that a constant expression still yields one value per x
+    kernel = ExpressionCompiler.compile(parser.validate("2^3 - 1")['ast'])
+    assert np.array_equal(kernel(np.zeros(4)), np.full(4, 7.0))
+
+def test_out_of_domain_is_nan(parser):
+    # Test that points outside the domain produce NaN instead of raising
+    result = ExpressionCompiler.compile(parser.validate("log(x)")['ast'])(np.array([-1.0, 1.0]))
+    assert np.isnan(result[0])
+    assert result[1] == 0.0
+
+def test_to_sympy(parser):
+    # Test that the syntax tree converts to the same SymPy expression as sympify
+    ast = parser.validate("-x^2 + log(x) / sqrt(2*x) - 0.5")['ast']
+    assert ExpressionCompiler.to_sympy(ast) == sympy.sympify("-x**2 + log(x) / sqrt(2*x) - 0.5")
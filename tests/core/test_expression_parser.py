@@ -1,4 +1,11 @@
+import importlib.util
+import threading
+
 import pytest
+from ply import yacc
+from ply.yacc import ParserReflect
+from src.function_solver.core import lextab, parsetab
+from src.function_solver.core.expression_ast import BinaryOp, FunctionCall, Number, UnaryOp, Variable
 from src.function_solver.core.expression_parser import ExpressionParser
 
 @pytest.fixture
@@ -24,4 +31,74 @@ def test_log_function(parser):
     expression = "log(x + 1)"
     validation = parser.validate(expression)
     assert validation['is_valid'] == True
-    assert validation['errors'] == []
\ No newline at end of file
+    assert validation['errors'] == []
+
+def test_validate_returns_ast(parser):
+    # Test that a valid expression comes back with its syntax tree
+    validation = parser.validate("log(x^2 + 2) * 3")
+    assert validation['ast'] == BinaryOp('*',
+                                         FunctionCall('log', BinaryOp('+', BinaryOp('^', Variable('x'), Number(2.0)),
+                                                                      Number(2.0))),
+                                         Number(3.0))
+
+def test_unary_minus_binds_looser_than_power(parser):
+    # Test that -x^2 is parsed as -(x^2) and 2^-x as 2^(-x)
+    assert parser.validate("-x^2")['ast'] == UnaryOp('-', BinaryOp('^', Variable('x'), Number(2.0)))
+    assert parser.validate("2^-x")['ast'] == BinaryOp('^', Number(2.0), UnaryOp('-', Variable('x')))
+
+def test_invalid_expression_has_no_ast(parser):
+    # Test that invalid expressions do not produce a syntax tree
+    assert parser.validate("x^")['ast'] is None
+    assert parser.validate("x + @")['ast'] is None
+
+def test_ast_round_trips_through_text(parser):
+    # Test that the canonical text of a tree parses back to the same tree
+    for expression in ["-x^2 + 2", "(-x)^2", "x - (x - 1)", "sqrt(x - 3) / (2 * x)", "2^3^x", "0.001 * x"]:
+        ast = parser.validate(expression)['ast']
+        assert parser.validate(str(ast))['ast'] == ast
+
+
+def test_prebuilt_tables_are_current():
+    # Test that the packaged tables match the grammar and token rules (regenerate with
+    # `python -m src.function_solver.core.expression_parser` if this fails)
+    parser = ExpressionParser(prebuilt=False)
+    reflect = ParserReflect({name: getattr(parser, name) for name in dir(parser)})
+    reflect.get_all()
+    assert reflect.signature() == parsetab._lr_signature
+    assert parser.lexer_obj.lexer.lexstateretext['INITIAL'] == [regex for regex, _ in lextab._lexstatere['INITIAL']]
+
+def test_prebuilt_and_runtime_parsers_agree(parser, monkeypatch):
+    # Test that the prebuilt tables parse exactly like freshly generated ones, and that they really are generated
+    generated = []
+    generate = yacc.LRGeneratedTable.__init__
+
+    def record(table, *args, **kwargs):
+        generated.append(table)
+        generate(table, *args, **kwargs)
+
+    monkeypatch.setattr(yacc.LRGeneratedTable, '__init__', record)
+    runtime_parser = ExpressionParser(prebuilt=False)
+    assert len(generated) == 1
+    for expression in ["-x^2 + 2", "log(x^2 + 2) / sqrt(x)", "x^", "2*/x", "x @ 2"]:
+        assert parser.validate(expression) == runtime_parser.validate(expression)
+
+def test_generate_tables(tmp_path):
+    # Test that regenerating the tables writes both modules, matching the packaged ones
+    ExpressionParser.generate_tables(str(tmp_path))
+    modules = {}
+    for name in ('parsetab', 'lextab'):
+        spec = importlib.util.spec_from_file_location(name, tmp_path / f'{name}.py')
+        modules[name] = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modules[name])
+    assert modules['parsetab']._lr_signature == parsetab._lr_signature
+    assert modules['parsetab']._lr_action == parsetab._lr_action
+    assert modules['lextab']._lexstatere == lextab._lexstatere
+
+def test_shared_parser_is_per_thread():
+    # Test that the shared parser is reused within a thread and separate across threads
+    assert ExpressionParser.shared() is ExpressionParser.shared()
+    other = []
+    thread = threading.Thread(target=lambda: other.append(ExpressionParser.shared()))
+    thread.start()
+    thread.join()
+    assert other[0] is not ExpressionParser.shared()
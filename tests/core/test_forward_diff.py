@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+import sympy
+from src.function_solver.core.expression_ast import BinaryOp, Number, Variable
+from src.function_solver.core.expression_compiler import ExpressionCompiler
+from src.function_solver.core.expression_parser import ExpressionParser
+from src.function_solver.core.forward_diff import Dual, ForwardDiff
+
+@pytest.fixture
+def parser():
+    return ExpressionParser()
+
+@pytest.mark.parametrize("expression", [
+    "x^2 + 3*x + 2",
+    "-x^3 + 2*x",
+    "log(x) / sqrt(x + 1)",
+    "sqrt(x^2 + 1) * log(x + 3)",
+    "x^x",
+    "2^x - x^(1/2)",
+    "1 / (x - 4)",
+    "-(x * log(x))",
+])
+def test_derivative_matches_sympy(parser, expression):
+    # Test that the derivative matches the SymPy derivative on the domain
+    x = np.linspace(0.1, 5, 60)
+    tree = parser.validate(expression)['ast']
+    value, derivative = ForwardDiff.compile(tree)(x)
+    expected = sympy.lambdify(sympy.Symbol('x'), sympy.diff(ExpressionCompiler.to_sympy(tree)), 'numpy')(x)
+    assert np.allclose(value, ExpressionCompiler.compile(tree)(x))
+    assert np.allclose(derivative, expected)
+
+def test_returns_dual_of_input_shape(parser):
+    # Test that the kernel returns a Dual of float64 arrays shaped like the input
+    result = ForwardDiff.compile(parser.validate("x^2")['ast'])(np.arange(6.0).reshape(2, 3))
+    assert isinstance(result, Dual)
+    assert result.value.shape == result.derivative.shape == (2, 3)
+    assert result.derivative.dtype == np.float64
+
+def test_variable_and_constant(parser):
+    # Test that x has slope 1 and a constant expression has slope 0, without aliasing the input
+    x = np.array([-1.0, 0.0, 2.0])
+    value, derivative = ForwardDiff.compile(Variable('x'))(x)
+    assert value is not x and np.array_equal(value, x)
+    assert np.array_equal(derivative, np.ones(3))
+    value, derivative = ForwardDiff.compile(parser.validate("2^3 - 1")['ast'])(x)
+    assert np.array_equal(value, np.full(3, 7.0))
+    assert np.array_equal(derivative, np.zeros(3))
+
+def test_out_of_domain_is_nan(parser):
+    # Test that the slope is NaN wherever the function is undefined
+    x = np.array([-2.0, -1.0])
+    for expression in ("log(x)", "sqrt(x)", "x^(1/2)", "log(x) * 0 + x"):
+        assert np.isnan(ForwardDiff.compile(parser.validate(expression)['ast'])(x).derivative).all()
+
+def test_vertical_tangent_is_infinite(parser):
+    # Test that the slope at the edge of the domain of a root is +inf
+    for expression in ("sqrt(x)", "x^0.5", "sqrt(x) + 1"):
+        value, derivative = ForwardDiff.compile(parser.validate(expression)['ast'])(np.array([0.0]))
+        assert np.isfinite(value[0])
+        assert derivative[0] == np.inf
+
+def test_log_at_zero(parser):
+    # Test that log(x) at 0 diverges with an infinite slope
+    value, derivative = ForwardDiff.compile(parser.validate("log(x)")['ast'])(np.array([0.0]))
+    assert value[0] == -np.inf
+    assert derivative[0] == np.inf
+
+def test_negative_base_integer_power(parser):
+    # Test that integer powers of negative bases are differentiated by the power rule
+    x = np.array([-2.0, -0.5])
+    assert np.allclose(ForwardDiff.compile(parser.validate("x^3")['ast'])(x).derivative, 3 * x ** 2)
+    assert np.allclose(ForwardDiff.compile(parser.validate("-x^-2")['ast'])(x).derivative, 2 * x ** -3)
+
+def test_constant_exponents_zero_and_one():
+    # Test that x^0 is flat even at 0 and x^1 keeps the slope of its base
+    x = np.array([0.0, 2.0])
+    value, derivative = ForwardDiff.compile(BinaryOp('^', Variable('x'), Number(0.0)))(x)
+    assert np.array_equal(value, np.ones(2)) and np.array_equal(derivative, np.zeros(2))
+    value, derivative = ForwardDiff.compile(BinaryOp('^', Variable('x'), Number(1.0)))(x)
+    assert np.array_equal(value, x) and np.array_equal(derivative, np.ones(2))
+
+def test_no_warnings(parser):
+    # Test that evaluating across poles and domain edges raises no floating point warnings
+    with np.errstate(all='raise'):
+        ForwardDiff.compile(parser.validate("log(x) / x + sqrt(x) + x^x")['ast'])(np.array([-1.0, 0.0, 1.0]))
@@ -0,0 +1,49 @@
+import random
+
+from src.function_solver.core.expression_parser import ExpressionParser
+from src.function_solver.core.incremental_validator import IncrementalValidator
+
+def assert_same(result, expected):
+    assert (result['is_valid'], result['errors'], result['ast']) == \
+           (expected['is_valid'], expected['errors'], expected['ast'])
+
+def test_matches_full_validation_while_typing():
+    # Test that validating keystroke by keystroke gives the same results as validating from scratch
+    validator, parser = IncrementalValidator(), ExpressionParser()
+    text = ""
+    for char in "sqrt(x^2 + 3.25*x) - log(2*x)/-x^2":
+        text += char
+        assert_same(validator.validate(text, key='f1'), parser.validate(text))
+
+def test_matches_full_validation_on_random_edits():
+    # Test random insertions and deletions anywhere in the text, including lexer and syntax errors
+    validator, parser = IncrementalValidator(maxsize=4), ExpressionParser()
+    pieces = list("x12.+-*/^() ") + ["log(", "sqrt(", "y", "$", "lo", "g"]
+    rng = random.Random(0)
+    for trial in range(300):
+        text = ""
+        for _ in range(25):
+            if text and rng.random() < 0.4:
+                position = rng.randrange(len(text))
+                text = text[:position] + text[position + 1:]
+            else:
+                position = rng.randint(0, len(text))
+                text = text[:position] + rng.choice(pieces) + text[position:]
+            assert_same(validator.validate(text, key=trial % 2), parser.validate(text))
+
+def test_relexes_only_changed_suffix():
+    # Test that appending to a long expression re-lexes only the end of it
+    validator = IncrementalValidator()
+    text = "x^2 + " * 200 + "x"
+    validator.validate(text, key=0)
+    before = validator.relexed
+    assert validator.validate(text + "+1", key=0)['is_valid']
+    assert validator.relexed - before < 10
+
+def test_caches_results():
+    # Test that validating the same text again is answered from the cache
+    validator = IncrementalValidator()
+    first = validator.validate("x^2", key=0)
+    validator.validate("x^", key=0)
+    assert validator.validate("x^2", key=0) is first
+    assert validator.hits == 1 and validator.misses == 2
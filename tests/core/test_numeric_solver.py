@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from src.function_solver.core.numeric_solver import NumericSolver
+
+def test_find_roots_sign_changes():
+    # Test that roots where the function crosses zero are found and refined
+    roots = NumericSolver.find_roots(lambda x: x ** 3 - 2 * x, (-5, 5))
+    assert roots == pytest.approx([-np.sqrt(2), 0.0, np.sqrt(2)], abs=1e-12)
+
+def test_find_roots_touching_zero():
+    # Test that a root where the function only touches zero is found from the minimum of |f|
+    roots = NumericSolver.find_roots(lambda x: (x - 0.1234) ** 2, (-5, 5))
+    assert roots == pytest.approx([0.1234], abs=1e-6)
+
+def test_find_roots_ignores_poles():
+    # Test that a sign change across a pole is not reported as a root
+    with np.errstate(divide='ignore'):
+        roots = NumericSolver.find_roots(lambda x: 1 / (x - 0.3333), (-5, 5))
+    assert roots == []
+
+def test_find_roots_skips_undefined_region():
+    # Test that NaN values outside the domain are skipped
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roots = NumericSolver.find_roots(lambda x: np.log(x) - 1, (-5, 5))
+    assert roots == pytest.approx([np.e], abs=1e-12)
+
+def test_brent_converges_to_tolerance():
+    # Test that Brent's method refines a bracket to the requested tolerance
+    root = NumericSolver.brent(lambda x: np.cos(x) - x, 0.0, 1.0, 1.0, np.cos(1.0) - 1.0, tolerance=1e-14)
+    assert abs(np.cos(root) - root) < 1e-13
+
+def test_find_roots_within_domain():
+    # Test that restricting the grid to the domain keeps the roots, including one on its edge
+    with np.errstate(invalid='ignore'):
+        roots = NumericSolver.find_roots(lambda x: np.sqrt(x - 3) * (x - 4), (-10, 10), domain=[(3, np.inf)])
+    assert roots == pytest.approx([3.0, 4.0], abs=1e-12)
+    grid = NumericSolver.restrict_grid(np.linspace(-10, 10, 2001), [(3, np.inf)])
+    assert grid.min() >= 2.99 and grid.max() == 10 and grid.size > 1000
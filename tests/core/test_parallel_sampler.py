@@ -0,0 +1,33 @@
+import numpy as np
+from src.function_solver.core.parallel_sampler import ParallelSampler
+from src.function_solver.core.solver_pool import SolverPool
+
+def test_grid_slices_match_whole_grid():
+    # Test that slices of the grid are bit for bit the same points as the whole grid, ends included
+    whole = ParallelSampler.grid((-1, 3), 1001)
+    assert whole[0] == -1 and whole[-1] == 3
+    assert np.array_equal(np.concatenate([ParallelSampler.grid((-1, 3), 1001, 0, 400),
+                                          ParallelSampler.grid((-1, 3), 1001, 400, 1001)]), whole)
+
+def test_parallel_matches_single_process():
+    # Test that sampling across workers gives exactly the samples of a single process
+    expression = "log(sqrt(x^2 + 1) + 1) / sqrt(x + 1) - x^3"
+    samples = 3 * ParallelSampler.MIN_CHUNK + 7
+    single = ParallelSampler.sample(expression, (-4, 4), samples, processes=1)
+    pool = SolverPool(3)
+    try:
+        parallel = ParallelSampler.sample(expression, (-4, 4), samples, processes=3, pool=pool)
+    finally:
+        pool.shutdown()
+    assert parallel.x.tobytes() == single.x.tobytes()
+    assert parallel.y.tobytes() == single.y.tobytes()
+    assert np.isnan(parallel.y).any() and parallel.evaluations == samples
+
+def test_small_or_unparsed_grids_stay_local():
+    # Test that small grids and expressions outside the grammar are sampled in this process
+    pool = SolverPool(2)
+    pool.shutdown()  # Any task sent to it would fail
+    curve = ParallelSampler.sample("x^2", (0, 1), 100, pool=pool)
+    assert np.allclose(curve.y, curve.x ** 2)
+    curve = ParallelSampler.sample("log(x)^2", (1, 2), 4 * ParallelSampler.MIN_CHUNK, pool=pool)
+    assert np.allclose(curve.y, np.log(curve.x) ** 2)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from src.function_solver.core.expression_parser import ExpressionParser
+from src.function_solver.core.polynomial_solver import PolynomialSolver
+
+def coefficients(expression):
+    return PolynomialSolver.coefficients(ExpressionParser.shared().validate(expression)['ast'])
+
+def test_coefficients_of_polynomials():
+    # Test reading coefficients off sums, products, powers and divisions by constants
+    assert coefficients("(x - 1)*(x + 2)/2").tolist() == [0.5, 0.5, -1.0]
+    assert coefficients("-(x^2)^2 + 3").tolist() == [-1.0, 0.0, 0.0, 0.0, 3.0]
+    assert coefficients("5").tolist() == [5.0]
+
+def test_coefficients_of_non_polynomials():
+    # Test that expressions that are not polynomials in x are rejected
+    for expression in ("log(x)", "1/x", "x^0.5", "x^x", "x^-1", "2^x", "x^300"):
+        assert coefficients(expression) is None, expression
+
+def test_real_roots():
+    # Test that only the real roots are returned, sorted and exact where the eigenvalues are
+    assert PolynomialSolver.real_roots(np.array([1.0, 0.0, -4.0])) == [-2.0, 2.0]
+    assert PolynomialSolver.real_roots(np.array([1.0, 0.0, 1.0])) == []
+    assert PolynomialSolver.real_roots(np.array([1.0, 0.0, -2.0, 0.0])) == pytest.approx([-2 ** 0.5, 0.0, 2 ** 0.5])
+    assert PolynomialSolver.real_roots(np.array([1.0, 0.0, 0.0])) == [0.0]
+    assert PolynomialSolver.real_roots(np.array([0.0, 3.0])) == []
+
+def test_real_roots_of_degree_50():
+    # Test a degree-50 polynomial against the real eigenvalues of its companion matrix
+    coefficients = np.random.default_rng(0).normal(size=51)
+    eigenvalues = np.roots(coefficients)
+    expected = np.sort(eigenvalues[np.abs(eigenvalues.imag) < 1e-9].real)
+    assert PolynomialSolver.real_roots(coefficients) == pytest.approx(expected.tolist(), abs=1e-10)
+
+def test_ambiguous_roots_are_left_to_other_solvers():
+    # Test that multiple and badly conditioned roots make the fast path give up
+    assert PolynomialSolver.real_roots(np.poly([1.0, 1.0])) is None
+    assert PolynomialSolver.real_roots(np.poly(np.arange(1.0, 21.0))) is None
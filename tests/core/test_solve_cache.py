@@ -0,0 +1,69 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import sympy
+from src.function_solver.core.solve_cache import ENV_VAR, SolveCache
+from src.function_solver.core.solver import Solver, SolveResult
+
+def test_key_uses_canonical_expressions():
+    # Test that equivalent spellings of a pair share a key, and the mode and interval are part of it
+    key = SolveCache.key("x^2+1", "2*x", Solver.AUTO, (-10, 10), 1e-12)
+    assert SolveCache.key("(x ^ 2) + 1", "2 * x", Solver.AUTO, (-10.0, 10.0), 1e-12) == key
+    assert SolveCache.key("x^2+1", "2*x", Solver.NUMERIC, (-10, 10), 1e-12) != key
+    assert SolveCache.key("x^2+1", "2*x", Solver.AUTO, (0, 10), 1e-12) != key
+
+def test_round_trip(tmp_path):
+    # Test that floats and SymPy solutions come back from another cache on the same file
+    cache = SolveCache(str(tmp_path / 'solves.db'))
+    cache.put('numeric', SolveResult([-2.0, 2.0], SolveResult.SOLVED, Solver.NUMERIC))
+    cache.put('symbolic', SolveResult([-sympy.sqrt(2), sympy.I], SolveResult.SOLVED, Solver.SYMBOLIC))
+    other = SolveCache(cache.path)
+    assert other.get('numeric') == ([-2.0, 2.0], SolveResult.SOLVED, Solver.NUMERIC)
+    assert other.get('symbolic') == ([-sympy.sqrt(2), sympy.I], SolveResult.SOLVED, Solver.SYMBOLIC)
+    assert other.get('missing') is None
+
+def test_version_change_invalidates(tmp_path, monkeypatch):
+    # Test that entries written by another solver version are dropped
+    cache = SolveCache(str(tmp_path / 'solves.db'))
+    cache.put('key', SolveResult([1.0], SolveResult.SOLVED, Solver.NUMERIC))
+    monkeypatch.setattr(SolveCache, 'VERSION', SolveCache.VERSION + 1)
+    cache = SolveCache(cache.path)
+    assert len(cache) == 0 and cache.get('key') is None
+
+def test_evicts_least_recently_used(tmp_path):
+    # Test that the least recently used entries are evicted beyond the size cap
+    cache = SolveCache(str(tmp_path / 'solves.db'), max_entries=2)
+    for key in ('a', 'b'):
+        cache.put(key, SolveResult([], SolveResult.SOLVED, Solver.NUMERIC))
+    cache.get('a')  # b is now the least recently used
+    cache.put('c', SolveResult([], SolveResult.SOLVED, Solver.NUMERIC))
+    assert len(cache) == 2
+    assert cache.get('b') is None and cache.get('a') is not None and cache.get('c') is not None
+
+def test_concurrent_processes(tmp_path):
+    # Test that several processes can write to the same file at once without losing entries
+    path = str(tmp_path / 'solves.db')
+    code = ("import sys\n"
+            "from src.function_solver.core.solve_cache import SolveCache\n"
+            "cache = SolveCache(sys.argv[1])\n"
+            "for i in range(50):\n"
+            "    cache.put(f'{sys.argv[2]}-{i}', ([float(i)], 'solved', 'numeric'))\n")
+    root = Path(__file__).resolve().parents[2]
+    processes = [subprocess.Popen([sys.executable, '-c', code, path, str(n)], cwd=root) for n in range(4)]
+    assert all(process.wait(timeout=60) == 0 for process in processes)
+    cache = SolveCache(path)
+    assert len(cache) == 200
+    assert cache.get('3-49') == ([49.0], 'solved', 'numeric')
+
+def test_solver_uses_cache(tmp_path, monkeypatch):
+    # Test that the solver stores results in the cache named by the environment, and answers from it
+    monkeypatch.setenv(ENV_VAR, str(tmp_path / 'solves.db'))
+    assert Solver.solve("x ^ 2", "4", mode=Solver.NUMERIC) == pytest.approx([-2.0, 2.0])
+    cache = SolveCache.shared()
+    assert len(cache) == 1
+    key = SolveCache.key("x^2", "4", Solver.NUMERIC, Solver.DEFAULT_INTERVAL, 1e-12)
+    cache.put(key, SolveResult([7.0], SolveResult.SOLVED, Solver.NUMERIC))
+    assert Solver.solve_detailed("x^2", "4", mode=Solver.NUMERIC) == SolveResult([7.0], SolveResult.SOLVED,
+                                                                               Solver.NUMERIC)
@@ -1,5 +1,11 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
 import pytest
-from src.function_solver.core.solver import Solver
+from src.function_solver.core.solver import Solver, SolveResult
 
 def test_solve_linear_equation():
     # Test solving a linear equation
@@ -29,4 +35,108 @@ def test_evaluate_function():
     function = "x^2 + 3*x + 2"
     value = 2
     result = Solver.evaluate(function, value)
-    assert result == pytest.approx(12.0)
\ No newline at end of file
+    assert result == pytest.approx(12.0)
+
+def test_evaluate_many():
+    # Test evaluating a function at many points at once
+    result = Solver.evaluate_many("x^2 + 3*x + 2", [0, 1, 2])
+    assert result.dtype == np.float64
+    assert result.tolist() == [2.0, 6.0, 12.0]
+
+def test_evaluate_many_outside_domain():
+    # Test that points outside the domain are NaN and divergent points are infinite
+    result = Solver.evaluate_many("log(x)", [-1, 0, 1])
+    assert np.isnan(result[0]) and result[1] == -np.inf and result[2] == 0.0
+    result = Solver.evaluate_many("1/x + sqrt(x)", [-4, 0, 4])
+    assert np.isnan(result[0]) and result[1] == np.inf and result[2] == pytest.approx(2.25)
+
+def test_evaluate_many_keeps_shape():
+    # Test that the result has the shape of the input, including scalars and constants
+    assert Solver.evaluate_many("5", np.zeros((2, 3))).shape == (2, 3)
+    assert Solver.evaluate_many("x^2", 3.0) == 9.0
+
+def test_solve_numeric_mode():
+    # Test solving a quadratic equation numerically
+    solutions = Solver.solve("x ^ 2 - 4", "0", mode=Solver.NUMERIC)
+    assert solutions == pytest.approx([-2.0, 2.0])
+
+def test_solve_falls_back_to_numeric():
+    # Test that equations SymPy cannot solve are solved numerically in auto mode
+    assert Solver.solve("log(x)", "sqrt(x) - x^3", mode=Solver.SYMBOLIC) == []
+    assert Solver.solve("log(x)", "sqrt(x) - x^3", mode=Solver.AUTO) == pytest.approx([1.0])
+
+def test_solve_numeric_interval():
+    # Test that the numeric solver only reports roots inside the interval
+    solutions = Solver.solve("x ^ 2 - 4", "0", mode=Solver.NUMERIC, interval=(0, 10))
+    assert solutions == pytest.approx([2.0])
+
+def test_solve_unknown_mode():
+    # Test that an unknown solve mode is rejected
+    with pytest.raises(ValueError):
+        Solver.solve("x", "1", mode="guess")
+
+def test_solve_timeout_returns_numeric_result():
+    # Test that a symbolic solve past its time budget is abandoned for the numeric result
+    start = time.monotonic()
+    result = Solver.solve_detailed("(x^2+1)^(1/3) + (x-1)^(1/5)", "2", mode=Solver.AUTO, timeout=2)
+    assert time.monotonic() - start < 10
+    assert result.status == SolveResult.TIMED_OUT
+    assert result.method == Solver.NUMERIC
+    assert result.solutions == pytest.approx([1.1437341203377])
+
+def test_solve_detailed_reports_unsolved():
+    # Test that symbolic mode reports equations SymPy cannot solve
+    result = Solver.solve_detailed("log(x)", "sqrt(x) - x^3", mode=Solver.SYMBOLIC)
+    assert result == SolveResult([], SolveResult.UNSOLVED, Solver.SYMBOLIC)
+
+def test_solve_pairs():
+    # Test solving every pair of several functions
+    solutions = Solver.solve_pairs(["x", "-x", "1"], timeout=30)
+    assert set(solutions) == {(0, 1), (0, 2), (1, 2)}
+    assert [float(sol) for sol in solutions[(0, 1)]] == [0.0]
+    assert [float(sol) for sol in solutions[(0, 2)]] == [1.0]
+    assert [float(sol) for sol in solutions[(1, 2)]] == [-1.0]
+
+def test_solve_pairs_needs_two_functions():
+    # Test that a single function has no pairs to solve
+    assert Solver.solve_pairs(["x^2"]) == {}
+
+def test_sympy_is_imported_lazily():
+    # Test that importing the solver does not import SymPy, and the numeric path never needs it
+    code = ("import sys\n"
+            "from src.function_solver.core.solver import Solver\n"
+            "assert 'sympy' not in sys.modules\n"
+            "assert Solver.solve('x^2', '4', mode=Solver.NUMERIC) == [-2.0, 2.0]\n"
+            "assert 'sympy' not in sys.modules\n"
+            "Solver.warm_up(pool=False)\n"
+            "assert 'sympy' in sys.modules\n")
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=Path(__file__).resolve().parents[2])
+
+def test_polynomial_fast_path():
+    # Test that polynomial equations skip SymPy in auto and numeric mode, but not in symbolic mode
+    result = Solver.solve_detailed("x^3", "2*x", mode=Solver.AUTO)
+    assert result.method == Solver.POLYNOMIAL
+    assert result.solutions == pytest.approx([-np.sqrt(2), 0.0, np.sqrt(2)])
+    result = Solver.solve_detailed("x^3", "2*x", mode=Solver.NUMERIC, interval=(-1, 10))
+    assert result.method == Solver.POLYNOMIAL and result.solutions == pytest.approx([0.0, np.sqrt(2)])
+    assert Solver.solve_detailed("x^3", "2*x", mode=Solver.SYMBOLIC).method == Solver.SYMBOLIC
+    assert Solver.solve_detailed("(x - 1)^2", "0", mode=Solver.AUTO).method == Solver.SYMBOLIC
+    assert Solver.solve_detailed("log(x)", "x - 2").method != Solver.POLYNOMIAL
+
+def test_solve_selected_pairs():
+    # Test that only the requested pairs are solved
+    solutions = Solver.solve_pairs(["x", "-x", "1"], pairs=[(1, 2)])
+    assert list(solutions) == [(1, 2)] and [float(sol) for sol in solutions[(1, 2)]] == [-1.0]
+
+def test_evaluate_with_slope():
+    # Test that values and slopes come back together, NaN outside the domain
+    values, slopes = Solver.evaluate_with_slope("x^3 - log(x)", [-1.0, 1.0, 2.0])
+    assert np.isnan(values[0]) and np.isnan(slopes[0])
+    assert np.allclose(values[1:], [1.0, 8 - np.log(2)])
+    assert np.allclose(slopes[1:], [2.0, 11.5])
+
+def test_solve_writes_nothing_to_stdout(capsys):
+    # Test that unsolved and timed out symbolic solves are counted, not printed
+    assert Solver.solve_detailed("sqrt(x) + log(x)", "x^3 - 2", mode=Solver.SYMBOLIC).status == 'unsolved'
+    assert Solver.solve_detailed("x^3 - 2*x + log(x)", "sqrt(x)", timeout=1e-3).status == 'timed_out'
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,71 @@
+import math
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+from src.function_solver.core.solver_pool import SolverPool
+
+@pytest.fixture(scope='module')
+def pool():
+    pool = SolverPool(processes=1)
+    yield pool
+    pool.shutdown()
+
+def test_run_returns_result(pool):
+    # Test that a task runs in a worker and its result comes back
+    assert pool.run(math.factorial, 10, timeout=30) == 3628800
+
+def test_run_reraises_worker_exception(pool):
+    # Test that an exception raised in the worker is re-raised in the caller
+    with pytest.raises(ValueError):
+        pool.run(math.sqrt, -1, timeout=30)
+
+def test_run_times_out_and_replaces_worker(pool):
+    # Test that a task past its deadline is killed and the pool keeps working
+    pool.run(math.factorial, 1, timeout=30)  # make sure the worker is already started
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        pool.run(time.sleep, 30, timeout=0.5)
+    assert time.monotonic() - start < 5
+    assert pool.run(math.factorial, 5, timeout=30) == 120
+
+def test_run_can_be_cancelled(pool):
+    # Test that setting the cancel event abandons a running task and kills its worker
+    pool.run(math.factorial, 1, timeout=30)
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()
+    start = time.monotonic()
+    with pytest.raises(CancelledError):
+        pool.run(time.sleep, 30, cancel=cancel)
+    assert time.monotonic() - start < 5
+    assert pool.run(math.factorial, 4, timeout=30) == 24
+
+def test_run_cancelled_before_start_starts_no_worker():
+    # Test that a task whose cancel event is already set is abandoned without starting a worker
+    pool = SolverPool(processes=2)
+    cancel = threading.Event()
+    cancel.set()
+    try:
+        with pytest.raises(CancelledError):
+            pool.run(math.factorial, 5, cancel=cancel)
+        assert pool._started == 0
+    finally:
+        pool.shutdown()
+
+def test_waiting_task_replaces_killed_worker():
+    # Test that a task waiting for a busy worker gets a new one once the busy worker is killed
+    pool = SolverPool(processes=1)
+    try:
+        pool.run(math.factorial, 1, timeout=30)
+        busy = threading.Thread(target=lambda: pytest.raises(TimeoutError, pool.run, time.sleep, 30, timeout=1))
+        busy.start()
+        time.sleep(0.3)  # Let the busy task take the only worker
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(pool.run(math.factorial, 5)))
+        waiter.start()
+        waiter.join(30)
+        busy.join(30)
+        assert results == [120]
+    finally:
+        pool.shutdown()
@@ -0,0 +1,45 @@
+import numpy as np
+from src.function_solver.core.tiled_sampler import TiledSampler
+
+def test_sample_covers_interval():
+    # Test that the stitched curve covers the requested range and matches the function
+    sampler = TiledSampler()
+    curve = sampler.sample("x^2", (-3.3, 7.1), 800)
+    assert curve.x[0] <= -3.3 and curve.x[-1] >= 7.1
+    assert np.all(np.diff(curve.x) > 0)
+    assert np.allclose(curve.y, curve.x ** 2)
+
+def test_panning_back_reuses_tiles():
+    # Test that returning to an earlier range is answered from the cache without evaluations
+    sampler = TiledSampler()
+    first = sampler.sample("sin(x)", (-10, 10), 800)
+    sampler.sample("sin(x)", (5, 25), 800)
+    again = sampler.sample("sin(x)", (-10, 10), 800)
+    assert first.evaluations > 0
+    assert again.evaluations == 0
+    assert np.array_equal(first.x, again.x)
+    assert sampler.stats()['hits'] > 0
+
+def test_zoom_changes_level():
+    # Test that zooming in samples a finer level and that the level follows the visible range
+    sampler = TiledSampler()
+    assert TiledSampler.zoom_level((0, 1024), 1024) == 0
+    assert TiledSampler.zoom_level((0, 1), 1024) == -10
+    wide = sampler.sample("sin(x)", (-100, 100), 800)
+    narrow = sampler.sample("sin(x)", (-1, 1), 800)
+    assert narrow.evaluations > 0
+    assert np.median(np.diff(narrow.x)) < np.median(np.diff(wide.x))
+
+def test_tile_cache_is_bounded():
+    # Test that the least recently used tiles are evicted beyond maxsize
+    sampler = TiledSampler(maxsize=4)
+    for offset in range(0, 6 * 256, 256):
+        sampler.sample("x", (offset, offset + 100), 100)
+    assert len(sampler) == 4
+    assert sampler.stats()['evictions'] > 0
+
+def test_sample_keeps_poles_in_range():
+    # Test that poles found inside tiles are reported when they are visible
+    sampler = TiledSampler()
+    curve = sampler.sample("1/(x - 0.3)", (-5, 5), 800)
+    assert len(curve.poles) == 1 and abs(curve.poles[0] - 0.3) < 1e-2
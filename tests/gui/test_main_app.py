@@ -1,12 +1,16 @@
 import pytest
+import subprocess
+import sys
 import threading
+from pathlib import Path
 from PySide2.QtCore import Qt
 from PySide2.QtTest import QTest
-from PySide2.QtWidgets import QLineEdit, QApplication, QMessageBox
+from PySide2.QtWidgets import QLineEdit, QLabel, QApplication, QMessageBox
 from PySide2 import QtCore
 from matplotlib.backend_bases import MouseEvent
 import numpy as np
 from src.function_solver.gui.app import FunctionSolverWindow
+from src.function_solver.utils.instrumentation import Instrumentation
 
 
 @pytest.fixture
@@ -57,8 +61,9 @@ def test_plot_functions(app, qtbot):
     app.input_widget.func1_frame.findChild(QLineEdit).setText("x^2")
     app.input_widget.func2_frame.findChild(QLineEdit).setText("2*x")
 
-    # Click plot button
-    qtbot.mouseClick(app.input_widget.plot_button, Qt.LeftButton)
+    # Click plot button and wait for the background plot to be drawn
+    with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+        qtbot.mouseClick(app.input_widget.plot_button, Qt.LeftButton)
 
     # Verify that the plot is created
     assert app.plot_widget.ax is not None
@@ -77,6 +82,123 @@ def test_plot_invalid_functions(app, qtbot):
     assert len(app.plot_widget.ax.lines) == 0
 
 
+def test_superseded_plot_requests_are_dropped(app, qtbot):
+    # Request several plots in a row; only the last one should be drawn
+    drawn = []
+    app.plot_widget.plot_finished.connect(lambda: drawn.append(app.plot_widget.ax.get_legend_handles_labels()[1]))
+
+    with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+        app.plot_widget.plot_functions("x^2", "2*x")
+        app.plot_widget.plot_functions("x^3", "2*x")
+        app.plot_widget.plot_functions("x^4", "2*x")
+    qtbot.waitUntil(lambda: not app.plot_widget.jobs, timeout=10000)
+
+    assert drawn == [['f1(x) = x^4', 'f2(x) = 2*x']]
+
+
+def test_y_range_fits_around_poles(app, qtbot):
+    # A pole on a sample or without a sign change should not stretch the y-axis to the spike
+    for functions in (("1/x", "x"), ("1/x^2", "x")):
+        with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+            app.plot_widget.plot_functions(*functions)
+        low, high = app.plot_widget.ax.get_ylim()
+        assert high - low < 1000
+
+
+def test_zoom_resamples_visible_range(app, qtbot):
+    # Zooming into the plot should resample the curves over the new range instead of stretching old samples
+    with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+        app.plot_widget.plot_functions("sin(x)", "x")
+    line = app.plot_widget.lines[0]
+    step = np.median(np.diff(line.get_xdata()))
+
+    app.plot_widget.ax.set_xlim(0.5, 0.6)
+    qtbot.waitUntil(lambda: line.get_xdata()[0] > 0, timeout=5000)
+
+    x = line.get_xdata()
+    assert x[0] <= 0.5 and x[-1] >= 0.6
+    assert np.median(np.diff(x)) < step / 10
+    assert np.allclose(line.get_ydata(), np.sin(x))
+
+
+def test_resize_decimates_for_new_width(app, qtbot):
+    # Resizing the canvas should resample and decimate the curves for its new width
+    app.show()
+    qtbot.waitExposed(app)
+    with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+        app.plot_widget.plot_functions("sin(100*x)", "x")
+    old_width = app.plot_widget.ax.bbox.width
+    assert all(line.get_xdata().size <= 4 * (old_width + 2) for line in app.plot_widget.lines)
+
+    Instrumentation.reset()
+    Instrumentation.enable()
+    try:
+        app.resize(1600, 700)  # Wider than the minimum size, so the canvas does grow
+        qtbot.waitUntil(lambda: Instrumentation.last('plot.resample') is not None, timeout=5000)
+    finally:
+        Instrumentation.disable()
+        Instrumentation.reset()
+
+    width = app.plot_widget.ax.bbox.width
+    assert width > old_width
+    sizes = [line.get_xdata().size for line in app.plot_widget.lines]
+    assert all(size <= 4 * (width + 2) for size in sizes)
+    assert sizes[0] > 4 * (old_width + 2)  # The dense curve now keeps more vertices than the old width allowed
+
+
+def test_export_view(app, qtbot, tmp_path):
+    # Exporting writes the plotted functions over the visible range, and their intersections, in the background
+    with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+        app.plot_widget.plot_functions("x^2", "2*x")
+    job = app.plot_widget.export_view(str(tmp_path / 'curves.npy'), 1000)
+    with qtbot.waitSignal(job.signals.finished, timeout=10000) as blocker:
+        pass
+    result = blocker.args[0]
+    data = np.load(result.path)
+    assert data.shape == (1000, 3)
+    assert (data[0, 0], data[-1, 0]) == app.plot_widget.ax.get_xlim()
+    assert np.allclose(data[:, 1], data[:, 0] ** 2)
+    assert result.intersections == 2
+
+
+def test_cancel_exports(app, qtbot, tmp_path):
+    # Cancelling stops a large export after its current chunk instead of writing every sample
+    with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+        app.plot_widget.plot_functions("x^2", "2*x")
+    job = app.plot_widget.export_view(str(tmp_path / 'curves.csv'), 10 ** 9)
+    with qtbot.waitSignal(job.signals.progress, timeout=10000):
+        pass
+    with qtbot.waitSignal(job.signals.cancelled, timeout=10000):
+        app.plot_widget.cancel_exports()
+    assert job.is_cancelled()
+    assert app.plot_widget.export_pool.activeThreadCount() == 0
+
+
+def test_replot_reuses_artists(app, qtbot):
+    # Replotting updates the existing axis, curves and points in place, and leaves unchanged curves untouched
+    widget = app.plot_widget
+    with qtbot.waitSignal(widget.plot_finished, timeout=10000):
+        widget.plot_functions("x^2", "2*x", "1")
+    ax, lines, points = widget.ax, list(widget.lines), widget.points
+    data = [line.get_xydata() for line in lines]
+
+    with qtbot.waitSignal(widget.plot_finished, timeout=10000):
+        widget.plot_functions("x^2", "2*x", "1")
+    assert all(line.get_xydata() is xy for line, xy in zip(lines, data))
+
+    with qtbot.waitSignal(widget.plot_finished, timeout=10000):
+        widget.plot_functions("x^2", "2*x", "4")
+    assert widget.ax is ax and widget.lines == lines and widget.points is points
+    assert ax.get_legend_handles_labels()[1] == ['f1(x) = x^2', 'f2(x) = 2*x', 'f3(x) = 4']
+    assert sorted(map(tuple, points.get_offsets().tolist())) == [(-2.0, 4.0), (0.0, 0.0), (2.0, 4.0), (2.0, 4.0),
+                                                                 (2.0, 4.0)]
+
+    with qtbot.waitSignal(widget.plot_finished, timeout=10000):
+        widget.plot_functions("x^2", "x^2 + 1")
+    assert widget.lines == lines[:2] and len(ax.lines) == 2
+    assert widget.points is None
+
+
 def move_mouse_to_data_point(canvas, ax, x, y):
     """
     Move mouse to a specific data point on a matplotlib canvas
@@ -122,8 +244,9 @@ def test_solving_and_plotting_and_showing_annotation(app, qtbot):
     qtbot.keyClicks(app.input_widget.func1_frame.findChild(QLineEdit), "x^2")
     qtbot.keyClicks(app.input_widget.func2_frame.findChild(QLineEdit), "2*x")
 
-    # Click plot button
-    qtbot.mouseClick(app.input_widget.plot_button, Qt.LeftButton)
+    # Click plot button and wait for the background plot to be drawn
+    with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+        qtbot.mouseClick(app.input_widget.plot_button, Qt.LeftButton)
 
     # Verify that the plot is created
     assert app.plot_widget.ax is not None
@@ -142,7 +265,7 @@ def test_solving_and_plotting_and_showing_annotation(app, qtbot):
                        y=app.plot_widget.canvas.height() - pos.y())
     app.plot_widget.canvas.callbacks.process('motion_notify_event', event)
     assert app.plot_widget.annotation is not None
-    assert app.plot_widget.annotation.get_text() == "(0.0000, 0.0000)"
+    assert app.plot_widget.annotation.get_text() == "(0.0000, 0.0000)\nf1'(x) = 0.0000, f2'(x) = 2.0000"
     assert app.plot_widget.annotation.get_visible()
     assert np.array_equal(app.plot_widget.annotation.xy, [0, 0])
     # hover over the point (2, 4) in FigureCanvas
@@ -156,7 +279,129 @@ def test_solving_and_plotting_and_showing_annotation(app, qtbot):
                        y=app.plot_widget.canvas.height() - pos.y())
     app.plot_widget.canvas.callbacks.process('motion_notify_event', event)
     assert app.plot_widget.annotation is not None
-    assert app.plot_widget.annotation.get_text() == "(2.0000, 4.0000)"
+    assert app.plot_widget.annotation.get_text() == "(2.0000, 4.0000)\nf1'(x) = 4.0000, f2'(x) = 2.0000"
     assert app.plot_widget.annotation.get_visible()
     assert np.array_equal(app.plot_widget.annotation.xy, [2, 4])
 
+
+
+def test_hover_blits_without_full_redraw(app, qtbot):
+    # Hovering over solution points should only blit the annotation, never redraw the whole figure
+    app.show()
+    with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+        app.plot_widget.plot_functions("x^2", "2*x")
+    qtbot.waitExposed(app.plot_widget.canvas)
+    qtbot.wait(100)
+
+    canvas, ax = app.plot_widget.canvas, app.plot_widget.ax
+    draws = []
+    canvas.mpl_connect('draw_event', lambda event: draws.append(event))
+
+    for x, y, visible in [(0, 0, True), (1, 1, False), (2, 4, True), (2, 4, True), (1, 1, False)]:
+        x_px, y_px = ax.transData.transform([x, y]).ravel()
+        event = MouseEvent(name='motion_notify_event', canvas=canvas, x=x_px, y=y_px)
+        canvas.callbacks.process('motion_notify_event', event)
+        assert app.plot_widget.annotation.get_visible() == visible
+    qtbot.wait(100)
+
+    assert draws == []
+
+
+def test_plot_several_functions(app, qtbot):
+    # Add a third function and check that every curve and every pairwise intersection is plotted
+    app.input_widget.add_function_input()
+    assert len(app.input_widget.function_frames) == 3
+    for frame, text in zip(app.input_widget.function_frames, ["x", "-x", "1"]):
+        frame.findChild(QLineEdit).setText(text)
+
+    with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+        qtbot.mouseClick(app.input_widget.plot_button, Qt.LeftButton)
+
+    assert len(app.plot_widget.ax.lines) == 3
+    points = sorted(map(tuple, app.plot_widget.points.get_offsets().tolist()))
+    assert points == [(-1.0, 1.0), (0.0, 0.0), (1.0, 1.0)]
+
+
+def test_skipped_inputs_keep_their_numbers(app, qtbot):
+    # With the second input left empty, the third function is still named f3 in the legend and on hover
+    app.input_widget.add_function_input()
+    for frame, text in zip(app.input_widget.function_frames, ["x^2", "", "2*x"]):
+        frame.findChild(QLineEdit).setText(text)
+
+    with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+        qtbot.mouseClick(app.input_widget.plot_button, Qt.LeftButton)
+
+    assert app.plot_widget.ax.get_legend_handles_labels()[1] == ['f1(x) = x^2', 'f3(x) = 2*x']
+    index = [tuple(point) for point in app.plot_widget.points.get_offsets().tolist()].index((2.0, 4.0))
+    app.plot_widget.update_annot(index)
+    assert app.plot_widget.annotation.get_text() == "(2.0000, 4.0000)\nf1'(x) = 4.0000, f3'(x) = 2.0000"
+
+
+def test_remove_function_input(app, qtbot):
+    # Added inputs can be removed again and the remaining ones are renumbered
+    third = app.input_widget.add_function_input()
+    fourth = app.input_widget.add_function_input()
+    app.input_widget.remove_function_input(third)
+    app.input_widget.remove_function_input(app.input_widget.func1_frame)  # the first two are permanent
+
+    assert app.input_widget.function_frames == [app.input_widget.func1_frame, app.input_widget.func2_frame, fourth]
+    assert fourth.findChild(QLabel).text() == "Function 3:"
+
+
+def test_live_validation_shows_inline_errors(app, qtbot):
+    # Typing an invalid function shows its error below the input once typing pauses, and fixing it hides the error
+    app.show()
+    field = app.input_widget.func1_frame.findChild(QLineEdit)
+    error_label = app.input_widget.func1_frame.findChild(QLabel, "error_label")
+
+    qtbot.keyClicks(field, "x^")
+    assert not error_label.isVisible()  # debounced: nothing is validated while typing
+    qtbot.waitUntil(error_label.isVisible, timeout=2000)
+    assert error_label.text() == "Expression is incomplete"
+
+    qtbot.keyClicks(field, "2")
+    qtbot.waitUntil(lambda: not error_label.isVisible(), timeout=2000)
+
+
+def test_plot_shows_validation_errors_inline(app, qtbot):
+    # Clicking plot with invalid functions shows the errors inline instead of in a message box
+    app.show()
+    app.input_widget.func1_frame.findChild(QLineEdit).setText("x^")
+    app.input_widget.func2_frame.findChild(QLineEdit).setText("2*/x")
+    qtbot.mouseClick(app.input_widget.plot_button, Qt.LeftButton)
+
+    assert QApplication.activeModalWidget() is None
+    assert app.input_widget.func1_frame.findChild(QLabel, "error_label").isVisible()
+    assert app.input_widget.func2_frame.findChild(QLabel, "error_label").text() == \
+        "Expression has a syntax error near '/'"
+    assert len(app.plot_widget.ax.lines) == 0
+
+
+def test_instrumentation_overlay(app, qtbot):
+    # In overlay mode the plot shows the duration of each pipeline stage
+    Instrumentation.reset()
+    Instrumentation.enable(overlay=True)
+    try:
+        with qtbot.waitSignal(app.plot_widget.plot_finished, timeout=10000):
+            app.plot_widget.plot_functions("x^2", "2*x")
+        text = app.plot_widget.overlay.get_text()
+    finally:
+        Instrumentation.disable()
+        Instrumentation.reset()
+
+    for stage in ('plot.solve', 'plot.sample', 'plot.compute', 'canvas.draw'):
+        assert stage in text
+
+
+def test_window_starts_without_matplotlib_and_sympy(qtbot):
+    # Importing the GUI loads neither Matplotlib nor SymPy; the canvas is built once the window is shown
+    code = ("import sys\n"
+            "import src.function_solver.gui.app\n"
+            "assert 'matplotlib' not in sys.modules and 'sympy' not in sys.modules\n")
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=Path(__file__).resolve().parents[2])
+
+    window = FunctionSolverWindow(warm_up=False)
+    qtbot.addWidget(window)
+    assert window.plot_widget._canvas is None
+    window.show()
+    qtbot.waitUntil(lambda: window.plot_widget._canvas is not None, timeout=5000)
@@ -0,0 +1,34 @@
+import numpy as np
+from src.function_solver.gui.components.point_index import PointIndex
+
+
+def test_nearest_returns_original_index():
+    # test that the closest point is returned by its position in the unsorted input
+    index = PointIndex(np.array([[300, 10], [100, 10], [200, 10]]))
+    assert index.nearest(198, 12, 5) == 2
+    assert index.nearest(101, 9, 5) == 1
+
+
+def test_nearest_respects_radius():
+    # test that points outside the radius are not hit, even inside the x-strip
+    index = PointIndex(np.array([[100, 10], [100, 50]]))
+    assert index.nearest(100, 30, 5) is None
+    assert index.nearest(103, 48, 5) == 1
+
+
+def test_nearest_on_many_points():
+    # test the index against a brute-force search
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(0, 1000, size=(5000, 2))
+    index = PointIndex(positions)
+    for x, y in rng.uniform(0, 1000, size=(200, 2)):
+        distances = np.hypot(positions[:, 0] - x, positions[:, 1] - y)
+        expected = int(np.argmin(distances)) if distances.min() <= 8 else None
+        assert index.nearest(x, y, 8) == expected
+
+
+def test_empty_index():
+    # test that an empty index never hits
+    index = PointIndex(np.empty((0, 2)))
+    assert len(index) == 0
+    assert index.nearest(0, 0, 5) is None
@@ -0,0 +1,34 @@
+from benchmarks.bench_suite import compare, run_suite
+from benchmarks.corpus import CORPUS
+from src.function_solver.core.expression_parser import ExpressionParser
+
+def test_corpus_is_valid():
+    # Test that every corpus expression and partner passes validation
+    for case in CORPUS:
+        assert ExpressionParser.shared().validate(case.expression)['is_valid'], case.name
+        assert ExpressionParser.shared().validate(case.partner)['is_valid'], case.name
+
+def test_run_selected_benchmarks():
+    # Test a quick run of the selected benchmarks only
+    results = run_suite(select=r'^(lexer|parser)\..*/linear$', quick=True, plots=False, echo=False)
+    assert set(results['results']) == {'lexer.tokenize/linear', 'parser.validate/linear'}
+    for result in results['results'].values():
+        assert 0 < result['min_s'] <= result['median_s'] and result['repeats'] >= 1
+
+def test_compare_flags_regressions():
+    # Test that only slowdowns beyond the threshold, above the noise floor, count as regressions
+    baseline = {'results': {'a': {'median_s': 1e-3}, 'b': {'median_s': 1e-3}, 'c': {'median_s': 1e-7},
+                            'gone': {'median_s': 1.0}}}
+    current = {'results': {'a': {'median_s': 1.2e-3}, 'b': {'median_s': 1.5e-3}, 'c': {'median_s': 1e-6},
+                           'new': {'median_s': 1.0}}}
+    rows = {row['name']: row for row in compare(current, baseline, threshold=0.25)}
+    assert set(rows) == {'a', 'b', 'c'}
+    assert not rows['a']['regression'] and rows['b']['regression'] and not rows['c']['regression']
+    assert rows['b']['ratio'] == 1.5
+
+def test_parallel_sampling_speedup():
+    # Test that the parallel sampling benchmarks report their speedup over a single process
+    results = run_suite(select=r'^sampler\.parallel\[[12]\]/nested_64$', quick=True, plots=False, echo=False)
+    assert set(results['results']) == {'sampler.parallel[1]/nested_64', 'sampler.parallel[2]/nested_64'}
+    assert results['results']['sampler.parallel[1]/nested_64']['speedup'] == 1.0
+    assert results['results']['sampler.parallel[2]/nested_64']['speedup'] > 0
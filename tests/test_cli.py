@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+from src.function_solver.cli import BatchSolver, Pair, main, read_pairs
+from src.function_solver.core.solver_pool import SolverPool
+
+def test_read_pairs_jsonl():
+    # Test reading JSONL pairs, including ids, alternative keys and unreadable records
+    stream = io.StringIO('{"f1": "x^2", "f2": "2*x", "id": 7}\n\n{"function1": "x", "function2": "1"}\nnope\n')
+    pairs = list(read_pairs(stream))
+    assert pairs[0] == Pair(0, "x^2", "2*x", "7")
+    assert pairs[1] == Pair(1, "x", "1")
+    assert pairs[2].index == 2 and pairs[2].error.startswith("Invalid input record")
+
+def test_read_pairs_csv():
+    # Test reading CSV pairs with and without a header row
+    with_header = list(read_pairs(io.StringIO("id,f1,f2\na,x^2,4\n"), 'csv'))
+    without_header = list(read_pairs(io.StringIO("x^2,4\nsqrt(x),2,b\nx\n"), 'csv'))
+    assert with_header == [Pair(0, "x^2", "4", "a")]
+    assert without_header[:2] == [Pair(0, "x^2", "4"), Pair(1, "sqrt(x)", "2", "b")]
+    assert without_header[2].error is not None
+
+def test_run_ordered_results():
+    # Test that every pair gets a result, in input order, with validation errors and stats
+    pairs = [Pair(0, "x^2", "2*x"), Pair(1, "x^", "2"), Pair(2, "1/x", "x"), Pair(3, "", "", error="bad")]
+    output = io.StringIO()
+    stats = BatchSolver(workers=2, timeout=30).run(pairs, output)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert [result['index'] for result in results] == [0, 1, 2, 3]
+    assert results[0]['status'] == 'solved' and results[0]['solutions'] == [0.0, 2.0]
+    assert results[1]['status'] == 'invalid' and results[1]['errors']
+    assert results[2]['solutions'] == [-1.0, 1.0]
+    assert results[3]['status'] == 'error'
+    assert stats['pairs'] == 4 and stats['solved'] == 2
+
+def test_run_unordered_results():
+    # Test that unordered output still contains every pair exactly once, with a small window
+    pairs = [Pair(i, f"x + {i}", "2*x") for i in range(6)]
+    output = io.StringIO()
+    BatchSolver(workers=2, window=2, timeout=30, ordered=False).run(pairs, output)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert sorted(result['index'] for result in results) == list(range(6))
+    assert all(result['solutions'] == [float(result['index'])] for result in results)
+
+def test_solve_reports_timeout():
+    # Test that a pair running past the per-item timeout is reported as timed out
+    pool = SolverPool(processes=1)
+    try:
+        batch = BatchSolver(workers=1, timeout=1e-3)
+        result = batch._solve(pool, Pair(0, "x^3 - 2*x + log(x)", "sqrt(x)"))
+    finally:
+        pool.shutdown()
+    assert result['status'] == 'timed_out'
+
+def test_fallback_error_is_reported():
+    # Test that an error in the numeric fallback after a timeout is reported, not hidden as a timeout
+    class FailingPool:
+        def __init__(self):
+            self.errors = [TimeoutError("symbolic"), RuntimeError("worker died")]
+
+        def run(self, *args, **kwargs):
+            raise self.errors.pop(0)
+
+    result = BatchSolver(workers=1, timeout=1.0)._solve(FailingPool(), Pair(0, "x", "1"))
+    assert result['status'] == 'error'
+    assert result['errors'] == ["RuntimeError: worker died"]
+
+def test_main_writes_results_file(tmp_path):
+    # Test the command line end to end, from a CSV file to a JSONL file
+    source, target = tmp_path / "pairs.csv", tmp_path / "results.jsonl"
+    source.write_text("f1,f2\nx^2,4\n")
+    assert main([str(source), '-o', str(target), '--workers', '1', '--quiet']) == 0
+    result = json.loads(target.read_text())
+    assert result['solutions'] == pytest.approx([-2.0, 2.0])
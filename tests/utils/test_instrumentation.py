@@ -0,0 +1,63 @@
+import io
+import json
+
+import pytest
+from src.function_solver.core.expression_parser import ExpressionParser
+from src.function_solver.utils.instrumentation import Instrumentation
+
+@pytest.fixture
+def instrumentation():
+    Instrumentation.reset()
+    Instrumentation.enable()
+    yield Instrumentation
+    Instrumentation.disable()
+    Instrumentation.reset()
+
+def test_disabled_records_nothing():
+    # Test that spans and counters are no-ops while instrumentation is disabled
+    Instrumentation.reset()
+    Instrumentation.disable()
+    first, second = Instrumentation.span('a'), Instrumentation.span('b')
+    assert first is second
+    with first:
+        Instrumentation.count('c')
+    assert Instrumentation.snapshot() == {'spans': {}, 'counters': {}, 'last': {}}
+
+def test_spans_and_counters(instrumentation):
+    # Test that nested spans are aggregated per name with their parent, and counters add up
+    for _ in range(3):
+        with instrumentation.span('outer'):
+            with instrumentation.span('inner'):
+                instrumentation.count('items', 2)
+    with pytest.raises(ValueError):
+        with instrumentation.span('outer'):
+            raise ValueError()
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot['spans']['outer']['count'] == 4 and snapshot['spans']['inner']['count'] == 3
+    assert snapshot['spans']['outer']['total'] >= snapshot['spans']['inner']['total']
+    assert snapshot['counters'] == {'items': 6}
+    assert instrumentation.last('inner') is not None and instrumentation.last('missing') is None
+
+def test_export_and_summary(instrumentation):
+    # Test the JSON lines export and the summary table of instrumented core stages
+    ExpressionParser.shared().validate("x^2 + log(x)")
+    stream = io.StringIO()
+    instrumentation.export_jsonl(stream)
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    assert lines[0]['span'] == 'parser.validate' and lines[0]['duration'] > 0
+    assert 'parser.validate' in lines[-1]['summary']['spans']
+    assert 'parser.validate' in instrumentation.summary_table()
+
+def test_configure_from_env():
+    # Test the values of the FUNCTION_SOLVER_PROFILE setting
+    try:
+        Instrumentation.configure_from_env('overlay')
+        assert Instrumentation.enabled and Instrumentation.overlay
+        Instrumentation.configure_from_env('1')
+        assert Instrumentation.enabled and not Instrumentation.overlay
+        Instrumentation.configure_from_env('0')
+        assert not Instrumentation.enabled
+    finally:
+        Instrumentation.disable()
@@ -0,0 +1,9 @@
+import math
+from src.function_solver.utils.math_utils import MathUtils
+
+def test_plot_range_is_fitted_to_domain():
+    # Test that the plot range is trimmed to the domain, or moved to it when it misses it entirely
+    assert MathUtils.get_plot_range(0, [], [[(0, math.inf)]]) == (-0.25, 5)
+    assert MathUtils.get_plot_range(0, [], [[(10, math.inf)], [(20, math.inf)]]) == (9.5, 19.5)
+    assert MathUtils.get_plot_range(0, [], [[(-math.inf, -30)]]) == (-39.5, -29.5)
+    assert MathUtils.get_plot_range(0, [1.0], [[(-math.inf, math.inf)]]) == (0.0, 2.0)